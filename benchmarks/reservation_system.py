@@ -0,0 +1,309 @@
+from config.io_manager import load_checked, read_pool_model
+from config.io_manager import write_pool_model
+from model.day_grid import is_day_grid_available
+from model.pool_model import PoolModel
+from model.reservations_model import Reservation, SchoolReservation
+from model.value_types import HoursRange, Services, WeekDay
+from exceptions.reservation_exceptions import ReservationTimeTakenError
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+import argparse
+import gc
+import json
+import platform
+import sys
+import time as timer
+
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+POOL_PATH = "example_files/valid_pool.json"
+START_DAY = date(2022, 1, 3)
+QUERY_CALLS = 1000
+CALENDAR_CALLS = 100
+SCAN_CALLS = 10
+READ_CALLS = 3
+CALENDAR_DAYS = 28
+PAGE_SIZE = 100
+UPDATE_CALLS = 100
+
+
+def create_pool_model(size: int) -> PoolModel:
+    """
+    Creates and returns a PoolModel object with the given amount of
+    synthetic reservations. Every open day gets hourly reservations for
+    individuals and a school reservation on the first lane, all within
+    the reservation rules.
+    """
+
+    with open(POOL_PATH) as handle:
+        pool_model = PoolModel(json.load(handle), START_DAY)
+
+    res_sys_model = pool_model.reservation_system_model
+    price_list_model = pool_model.price_list_model
+    current_day = START_DAY
+
+    while len(res_sys_model) < size:
+        week_day = WeekDay(current_day.weekday())
+        working_hours = pool_model.working_hours.get(week_day)
+
+        if working_hours is not None:
+            for hours_range, lane in _day_ranges(working_hours):
+                if len(res_sys_model) == size:
+                    break
+
+                service = Services.INDIVIDUAL
+
+                if lane is not None:
+                    service = Services.SWIMMING_SCHOOL
+
+                price = price_list_model.calculate_price(
+                    service, week_day, hours_range)
+
+                if lane is None:
+                    reservation = Reservation(current_day, hours_range, price)
+                else:
+                    reservation = SchoolReservation(
+                        lane, current_day, hours_range, price)
+
+                res_sys_model.insert_reservation(reservation)
+
+        current_day += timedelta(days=1)
+
+    return pool_model
+
+
+def run_benchmarks(size: int) -> list[dict]:
+    """
+    Times the public methods of the ReservationSystemModel and saving and
+    loading the pool through io_manager for a pool with the given amount of
+    reservations. Returns the list of results.
+    """
+
+    results = []
+
+    def record(operation: str, seconds: float, calls: int = 1) -> None:
+        results.append({
+            "size": size,
+            "operation": operation,
+            "calls": calls,
+            "total_seconds": seconds,
+            "seconds_per_call": seconds / calls
+        })
+
+    begin = timer.perf_counter()
+    pool_model = create_pool_model(size)
+    record("create_pool_model", timer.perf_counter() - begin)
+    gc.collect()
+
+    res_sys_model = pool_model.reservation_system_model
+    last_day = res_sys_model.reservations[-1].date
+    query_datetime = datetime.combine(last_day, time(12, 15))
+    week_begin = max(START_DAY, last_day - timedelta(days=6))
+    calendar_begin = max(
+        START_DAY, last_day - timedelta(days=CALENDAR_DAYS - 1))
+
+    queries = {
+        "available_lanes": lambda: res_sys_model.available_lanes(
+            query_datetime),
+        "available_tickets": lambda: res_sys_model.available_tickets(
+            query_datetime),
+        "is_lane_taken": lambda: res_sys_model.is_lane_taken(
+            0, query_datetime),
+        "reservations_amount": lambda: res_sys_model.reservations_amount(
+            Services.INDIVIDUAL, query_datetime),
+        "calculate_total_income": res_sys_model.calculate_total_income,
+        "snapshot": res_sys_model.snapshot,
+        "day_availability": lambda: res_sys_model.day_availability(last_day),
+        "iter_reservations": lambda: list(res_sys_model.iter_reservations(
+            begin_date=week_begin, end_date=last_day, limit=PAGE_SIZE))
+    }
+
+    for operation, query in queries.items():
+        record(operation, _time_calls(query, QUERY_CALLS), QUERY_CALLS)
+
+    record("availability_calendar", _time_calls(
+        lambda: res_sys_model.availability_calendar(calendar_begin, last_day),
+        CALENDAR_CALLS), CALENDAR_CALLS)
+
+    # Listing all reservations and skipping to the middle of them take time
+    # proportional to the pool size, so they're called fewer times
+
+    scans = {
+        "get_reservations": lambda: res_sys_model.get_reservations(
+            Services.SWIMMING_SCHOOL),
+        "iter_reservations_offset": lambda: list(
+            res_sys_model.iter_reservations(
+                offset=len(res_sys_model) // 2, limit=PAGE_SIZE))
+    }
+
+    for operation, scan in scans.items():
+        record(operation, _time_calls(scan, SCAN_CALLS), SCAN_CALLS)
+
+    # Adding to empty days and to a taken time, which makes the model
+    # search for the closest possible time. Only one lane can be taken by
+    # schools at once, so a school reservation at the same time as the
+    # synthetic one on the first lane is always refused
+
+    free_days = []
+    free_day = last_day
+
+    while len(free_days) < UPDATE_CALLS:
+        free_day += timedelta(days=1)
+
+        if WeekDay(free_day.weekday()) in pool_model.working_hours:
+            free_days.append(free_day)
+
+    added_ids = []
+
+    def add_reservation() -> None:
+        reservation = res_sys_model.add_reservation(
+            Services.INDIVIDUAL, free_days[len(added_ids)],
+            HoursRange(time(12, 0), time(13, 0)))
+        added_ids.append(reservation.id)
+
+    record("add_reservation", _time_calls(
+        add_reservation, UPDATE_CALLS), UPDATE_CALLS)
+
+    working_hours = pool_model.working_hours[WeekDay(START_DAY.weekday())]
+    taken_range = HoursRange.from_minutes(
+        working_hours.begin_minutes, working_hours.begin_minutes + 120)
+
+    def add_taken_reservation() -> None:
+        try:
+            res_sys_model.add_reservation(
+                Services.SWIMMING_SCHOOL, START_DAY, taken_range, 1)
+        except ReservationTimeTakenError as error:
+            if error.proposed_date is None:
+                raise
+        else:
+            raise AssertionError("The reservation time wasn't taken.")
+
+    record("add_reservation_with_proposal", _time_calls(
+        add_taken_reservation, QUERY_CALLS), QUERY_CALLS)
+
+    # Removing the newest reservations and the oldest ones
+
+    first_ids = [
+        reservation.id
+        for reservation in res_sys_model.reservations[:UPDATE_CALLS]]
+
+    def remove_reservations(ids: list[int]) -> float:
+        remaining_ids = iter(ids)
+        return _time_calls(
+            lambda: res_sys_model.remove_reservation(next(remaining_ids)),
+            len(ids))
+
+    record("remove_reservation_last", remove_reservations(
+        added_ids[::-1]), UPDATE_CALLS)
+    record("remove_reservation_first", remove_reservations(
+        first_ids), len(first_ids))
+
+    def write_pool() -> StringIO:
+        handle = StringIO()
+        write_pool_model(handle, pool_model)
+        return handle
+
+    record("write_pool_model", _time_calls(
+        write_pool, READ_CALLS), READ_CALLS)
+    handle = write_pool()
+
+    def read_pool(content: str) -> None:
+        read_pool_model(StringIO(content), START_DAY)
+
+    # Files without the checksum are fully validated while loading.
+    # The first read warms up the allocator, so it's left out.
+
+    content = handle.getvalue()
+    unchecked_json = json.loads(content)
+    unchecked_json.pop("checksum")
+    unchecked_content = json.dumps(unchecked_json)
+    read_pool(content)
+
+    record("check_checksum", _time_calls(
+        lambda: load_checked(content), READ_CALLS), READ_CALLS)
+    record("read_pool_model", _time_calls(
+        lambda: read_pool(content), READ_CALLS), READ_CALLS)
+    record("read_pool_model_validated", _time_calls(
+        lambda: read_pool(unchecked_content), READ_CALLS), READ_CALLS)
+
+    return results
+
+
+def main(args: list[str]) -> None:
+    """
+    Runs the benchmarks for the given pool sizes and writes the results
+    in the JSON format to the standard output or the given file.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the reservation system on synthetic pools.")
+    parser.add_argument(
+        "-s", "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="amounts of reservations of the benchmarked pools")
+    parser.add_argument(
+        "-o", "--output", help="file to write the JSON results to")
+
+    parsed_args = parser.parse_args(args[1:])
+    results = []
+
+    for size in parsed_args.sizes:
+        print(f"Benchmarking {size} reservations...", file=sys.stderr)
+        results.extend(run_benchmarks(size))
+
+    report = {
+        "python": platform.python_version(),
+        "day_grid": is_day_grid_available(),
+        "results": results
+    }
+
+    if parsed_args.output is None:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+    else:
+        with open(parsed_args.output, "w") as handle:
+            json.dump(report, handle, indent=4)
+
+
+def _day_ranges(working_hours: HoursRange):
+    """
+    Yields the hours ranges and lanes (None for individuals) of the
+    synthetic reservations of a single day.
+    """
+
+    begin = working_hours.begin_minutes
+    end = working_hours.end_minutes
+
+    # One-hour reservations for individuals, one after another,
+    # and a two-hour school reservation on the first lane
+
+    for minutes in range(begin, end - 59, 60):
+        yield HoursRange.from_minutes(minutes, minutes + 60), None
+
+    if end - begin >= 120:
+        yield HoursRange.from_minutes(begin, begin + 120), 0
+
+
+def _time_calls(function, calls: int) -> float:
+    """
+    Calls the given function the given amount of times and returns
+    the total time in seconds. Garbage collection is disabled meanwhile,
+    so it doesn't distort the measurements.
+    """
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        begin = timer.perf_counter()
+
+        for _ in range(calls):
+            function()
+
+        return timer.perf_counter() - begin
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,212 @@
+from collections import namedtuple
+from datetime import date
+from model.occupancy_index import SLOT_MINUTES, range_to_slots
+from model.reservations_model import Reservation, SchoolReservation
+from model.value_types import HoursRange, Price, Services
+import mmap
+import struct
+
+
+SNAPSHOT_MAGIC = b"PTRS"
+SNAPSHOT_VERSION = 2
+
+_HEADER = struct.Struct("<4sHHI")
+_RECORD = struct.Struct("<IBBBBII")
+_NO_LANE = 255
+_NO_ID = 0xFFFFFFFF
+
+ReservationRecord = namedtuple(
+    "ReservationRecord",
+    ["date_ordinal", "begin_slot", "end_slot", "lane", "service", "price_gr",
+     "reservation_id"])
+
+
+def write_reservations_snapshot(
+        handle, reservations: list, next_id: int = None) -> None:
+    """
+    Writes the given reservations to the binary file as fixed-width records
+    (date ordinal, begin and end slot, lane, service, price in gr and ID),
+    sorted by date and begin time. The header keeps the ID given to the next
+    added reservation, which by default follows the greatest saved ID.
+    """
+
+    if next_id is None:
+        next_id = max((
+            reservation.id for reservation in reservations
+            if reservation.id is not None), default=-1) + 1
+
+    handle.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, next_id))
+
+    records = sorted(
+        reservation_to_record(reservation) for reservation in reservations)
+
+    for record in records:
+        handle.write(_RECORD.pack(*record))
+
+
+def reservation_to_record(reservation: Reservation) -> ReservationRecord:
+    """
+    Converts a Reservation object to the ReservationRecord and returns it.
+    """
+
+    slots = range_to_slots(reservation.hours_range)
+    lane = getattr(reservation, "lane", None)
+
+    return ReservationRecord(
+        reservation.date.toordinal(), slots.start, slots.stop,
+        _NO_LANE if lane is None else lane,
+        reservation.get_service().value, reservation.price.get_total_gr(),
+        _NO_ID if reservation.id is None else reservation.id)
+
+
+def record_to_reservation(record: ReservationRecord) -> Reservation:
+    """
+    Converts a ReservationRecord to the Reservation or SchoolReservation
+    object and returns it.
+    """
+
+    reservation_date = date.fromordinal(record.date_ordinal)
+    hours_range = HoursRange.from_minutes(
+        record.begin_slot * SLOT_MINUTES, record.end_slot * SLOT_MINUTES)
+    price = Price.from_total_gr(record.price_gr)
+    reservation_id = record.reservation_id
+
+    if reservation_id == _NO_ID:
+        reservation_id = None
+
+    if record.service == Services.INDIVIDUAL.value:
+        return Reservation(
+            reservation_date, hours_range, price, reservation_id)
+
+    return SchoolReservation(
+        record.lane, reservation_date, hours_range, price, reservation_id)
+
+
+class ReservationsSnapshot:
+    """
+    Read-only view of the binary reservations snapshot file. The file is
+    memory-mapped, so the records are read directly from it without parsing
+    or copying the whole file. Records are sorted by date, which lets
+    finding the reservations of a single day with a binary search.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, self._next_id = _HEADER.unpack_from(
+            self._mmap, 0)
+
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise ValueError("Given file isn't a valid reservations snapshot.")
+
+        records_size = len(self._mmap) - _HEADER.size
+
+        if records_size % _RECORD.size != 0:
+            self._mmap.close()
+            raise ValueError("Reservations snapshot file is truncated.")
+
+        self._length = records_size // _RECORD.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def next_id(self) -> int:
+        """
+        Returns the ID, which will be given to the next added reservation.
+        """
+        return self._next_id
+
+    def __getitem__(self, index: int) -> ReservationRecord:
+        if index < 0:
+            index += self._length
+
+        if index not in range(self._length):
+            raise IndexError("Record index is out of range.")
+
+        return ReservationRecord._make(_RECORD.unpack_from(
+            self._mmap, _HEADER.size + index * _RECORD.size))
+
+    def __iter__(self):
+        # Records are unpacked one by one straight from the mapped memory, so
+        # no buffer stays exported and the file can be closed at any time.
+
+        for offset in range(
+                _HEADER.size, len(self._mmap), _RECORD.size):
+            yield ReservationRecord._make(
+                _RECORD.unpack_from(self._mmap, offset))
+
+    def close(self) -> None:
+        """
+        Closes the memory-mapped file.
+        """
+
+        self._mmap.close()
+
+    def day_records(self, day: date) -> list[ReservationRecord]:
+        """
+        Returns the list of records of the reservations made for
+        the given day.
+        """
+
+        ordinal = day.toordinal()
+        index = self._first_index(ordinal)
+        records = []
+
+        while index < self._length:
+            record = self[index]
+
+            if record.date_ordinal != ordinal:
+                break
+
+            records.append(record)
+            index += 1
+
+        return records
+
+    def reservations(self):
+        """
+        Yields all reservations as Reservation or SchoolReservation objects.
+        """
+
+        for record in self:
+            yield record_to_reservation(record)
+
+    def calculate_total_income(self, day: date) -> Price:
+        """
+        Returns a Price object representing total income from the reservations
+        of the given day.
+        """
+
+        return Price.from_total_gr(
+            sum(record.price_gr for record in self.day_records(day)))
+
+    def _first_index(self, ordinal: int) -> int:
+        """
+        Returns the index of the first record with the date ordinal greater
+        or equal the given one.
+        """
+
+        low = 0
+        high = self._length
+
+        while low < high:
+            middle = (low + high) // 2
+            middle_ordinal = struct.unpack_from(
+                "<I", self._mmap, _HEADER.size + middle * _RECORD.size)[0]
+
+            if middle_ordinal < ordinal:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
@@ -1,26 +1,168 @@
 from datetime import date
 from model.pool_model import PoolModel
+from model.reservations_model import Reservation, ReservationSystemModel
 from config.admin import Admin
+import hashlib
 import json
 import os
 
 
+STREAM_CHUNK_SIZE = 64 * 1024
+SCHEMA_VERSION = 2
+_CHECKSUM_PREFIX = '{"checksum": "'
+_CHECKSUM_LENGTH = 64
+_CHECKSUM_SEPARATOR = '", '
+_SCHEMA_SUFFIX = f'"schema_version": {SCHEMA_VERSION}}}'
+_POOL_METADATA_KEYS = ("name", "working_hours", "lanes_amount", "price_list")
+
+
 def write_pool_model(handle, pool_model: PoolModel) -> None:
     """
-    Writes PoolModel object to the given JSON file.
+    Writes PoolModel object to the given JSON file, along with the schema
+    version and the checksum of its content.
     """
 
-    json_dict = PoolModel.to_json(pool_model)
-    json.dump(json_dict, handle)
+    handle.write(dump_checked(PoolModel.to_json(pool_model)))
 
 
-def read_pool_model(handle, current_day: date) -> PoolModel:
+def read_pool_model(
+        handle, current_day: date, lazy: bool = False) -> PoolModel:
     """
-    Reads PoolModel object from the given JSON file and returns it.
+    Reads PoolModel object from the given JSON file and returns it. If lazy
+    is True, past reservations are decoded only when they're requested.
+    Validation of the price list and reservations is skipped for the files
+    written by PoolTool, which content matches the saved checksum.
     """
 
-    json_dict = json.load(handle)
-    return PoolModel(json_dict, current_day)
+    json_dict, trusted = load_checked(handle.read())
+    return PoolModel(json_dict, current_day, lazy, trusted)
+
+
+def dump_checked(json_dict: dict) -> str:
+    """
+    Returns the given JSON-formatted pool dictionary as the JSON text, along
+    with the schema version and the checksum. The checksum goes first and
+    covers the raw text written after it, so it's checked without encoding
+    the content again.
+    """
+
+    content = {
+        key: value for key, value in json_dict.items()
+        if key not in ("checksum", "schema_version")}
+    content["schema_version"] = SCHEMA_VERSION
+
+    body = json.dumps(content)[1:]
+    checksum = hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    return _CHECKSUM_PREFIX + checksum + _CHECKSUM_SEPARATOR + body
+
+
+def load_checked(text: str) -> tuple[dict, bool]:
+    """
+    Parses the given JSON text of a pool and returns the JSON-formatted
+    dictionary and True, if it has the current schema version and its
+    content matches the saved checksum (so it wasn't edited since PoolTool
+    wrote it).
+    """
+
+    json_dict = json.loads(text)
+    trusted = (json_dict.get("schema_version") == SCHEMA_VERSION
+               and has_valid_checksum(text))
+
+    return json_dict, trusted
+
+
+def has_valid_checksum(text: str) -> bool:
+    """
+    Returns True, if the given JSON text of a pool ends with the current
+    schema version and its content matches the saved checksum. The text
+    isn't parsed, so it's checked before deciding, if it needs validation.
+    """
+
+    begin = len(_CHECKSUM_PREFIX)
+    end = begin + _CHECKSUM_LENGTH
+
+    if not (text.startswith(_CHECKSUM_PREFIX)
+            and text.startswith(_CHECKSUM_SEPARATOR, end)
+            and text.endswith(_SCHEMA_SUFFIX)):
+        return False
+
+    body = text[end + len(_CHECKSUM_SEPARATOR):]
+    checksum = hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    return checksum == text[begin:end]
+
+
+def read_pool_model_streaming(
+        handle, current_day: date, since: date = None,
+        chunk_size: int = STREAM_CHUNK_SIZE) -> PoolModel:
+    """
+    Reads PoolModel object from the given JSON file and returns it. Parses
+    the reservations array incrementally and adds every reservation to the
+    model right after it's read, so the whole file is never held in memory.
+    If the since date is given, skips the reservations made for earlier days.
+    """
+
+    metadata = {}
+    pool_model = None
+    pending_reservations = []
+
+    for key, value in _iter_pool_json(handle, chunk_size):
+        if key != "reservations":
+            metadata[key] = value
+            continue
+
+        if since is not None and Reservation.from_json_date(
+                value["date"]) < since:
+            continue
+
+        reservation = ReservationSystemModel.reservation_from_json(value)
+
+        # Reservations are added to the model as soon as it can be created,
+        # otherwise (if they precede pool's data) they're kept until then
+
+        if pool_model is None and all(
+                key in metadata for key in _POOL_METADATA_KEYS):
+            pool_model = PoolModel(metadata, current_day)
+
+        if pool_model is None:
+            pending_reservations.append(reservation)
+        else:
+            pool_model.reservation_system_model.insert_reservation(
+                reservation)
+
+    # The model may be created before the rest of pool's data is read,
+    # so the next reservation ID read afterwards is applied at the end
+
+    if pool_model is None:
+        pool_model = PoolModel(metadata, current_day)
+    else:
+        pool_model.reservation_system_model.set_next_id(
+            metadata.get("next_reservation_id", 0))
+
+    for reservation in pending_reservations:
+        pool_model.reservation_system_model.insert_reservation(reservation)
+
+    return pool_model
+
+
+def iter_reservations(
+        handle, since: date = None, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Yields Reservation objects read from the given pool JSON file one at
+    a time. If the since date is given, skips the reservations made for
+    earlier days.
+    """
+
+    for key, value in _iter_pool_json(handle, chunk_size):
+        if key != "reservations":
+            continue
+
+        if since is not None and Reservation.from_json_date(
+                value["date"]) < since:
+            continue
+
+        yield ReservationSystemModel.reservation_from_json(value)
 
 
 def write_config(handle, admin: Admin) -> None:
@@ -50,3 +192,130 @@ def does_config_exist(current_directory: str) -> bool:
             current_directory += "/"
 
     return os.path.isfile(current_directory + "config.json")
+
+
+class _JSONStreamReader:
+    """
+    Reads JSON values from a file handle chunk by chunk. Keeps in memory
+    only the part of the file which hasn't been parsed yet.
+    """
+
+    def __init__(self, handle, chunk_size: int) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._end_of_file = False
+
+    def next_char(self) -> str:
+        """
+        Skips whitespaces and returns the next character without
+        consuming it. Returns an empty string at the end of the file.
+        """
+
+        while True:
+            while (self._position < len(self._buffer)
+                    and self._buffer[self._position].isspace()):
+                self._position += 1
+
+            if self._position < len(self._buffer) or not self._fill():
+                return self._buffer[self._position:self._position + 1]
+
+    def consume(self, expected: str) -> None:
+        """
+        Consumes the next non-whitespace character, which must be equal
+        the expected one.
+        """
+
+        char = self.next_char()
+
+        if char != expected:
+            raise json.JSONDecodeError(
+                f"Expecting '{expected}'", self._buffer, self._position)
+
+        self._position += 1
+
+    def read_value(self):
+        """
+        Parses and returns the next JSON value.
+        """
+
+        self.next_char()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(
+                    self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A value ending with the buffer might be cut (e.g. a number),
+            # so it's parsed again with more data
+
+            if end == len(self._buffer) and self._fill():
+                continue
+
+            self._position = end
+            return value
+
+    def _fill(self) -> bool:
+        """
+        Drops the parsed part of the buffer and appends the next chunk of
+        the file to it. Returns False, if there's nothing more to read.
+        """
+
+        if self._end_of_file:
+            return False
+
+        chunk = self._handle.read(self._chunk_size)
+
+        if not chunk:
+            self._end_of_file = True
+            return False
+
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+
+def _iter_pool_json(handle, chunk_size: int):
+    """
+    Yields (key, value) pairs of the top-level JSON object read from the
+    given file. Instead of the whole reservations array, yields a separate
+    ("reservations", reservation) pair for every element of the array.
+    """
+
+    reader = _JSONStreamReader(handle, chunk_size)
+    reader.consume("{")
+
+    if reader.next_char() == "}":
+        return
+
+    while True:
+        key = reader.read_value()
+        reader.consume(":")
+
+        if key != "reservations":
+            yield key, reader.read_value()
+        else:
+            reader.consume("[")
+
+            if reader.next_char() == "]":
+                reader.consume("]")
+            else:
+                while True:
+                    yield key, reader.read_value()
+
+                    if reader.next_char() == "]":
+                        reader.consume("]")
+                        break
+
+                    reader.consume(",")
+
+        if reader.next_char() == "}":
+            return
+
+        reader.consume(",")
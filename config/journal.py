@@ -0,0 +1,516 @@
+from config.io_manager import dump_checked, load_checked
+from contextlib import contextmanager
+from datetime import date
+from model.pool_model import PoolModel
+from model.price_list_model import PriceListModel
+from model.reservations_model import Reservation, ReservationSystemModel
+from model.value_types import HoursRange, Services
+import json
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+COMPACTION_THRESHOLD = 100
+
+
+class PoolJournal:
+    """
+    Append-only journal of the events changing the pool saved in a JSON file
+    (adding and removing a reservation, changing the price list and
+    the current day). Every event is appended to the journal file next to
+    the pool file as a single JSON line, so saving a change doesn't depend
+    on the amount of reservations. The pool is loaded by reading the latest
+    snapshot (the pool file) and replaying only the events appended after it.
+    Once the journal reaches the compaction threshold, it's compacted into
+    the pool file and its events are moved to the archive, which along with
+    the first compacted snapshot lets any version be rebuilt. If lazy is
+    True, past reservations of the loaded pool are decoded only when
+    requested.
+
+    Every entry has the next sequence number, which is the version of the
+    pool. Several processes can share one pool: all changes are made with
+    the pool's lock file locked (where fcntl is available) and the entries
+    appended by other processes are applied first, so a reservation is
+    validated against the latest version of the pool.
+    """
+
+    def __init__(
+            self, pool_path: str,
+            compaction_threshold: int = COMPACTION_THRESHOLD,
+            lazy: bool = False) -> None:
+
+        self.pool_path = pool_path
+        self.journal_path = pool_path + ".journal"
+        self.lock_path = pool_path + ".lock"
+        self.archive_path = pool_path + ".journal.archive"
+        self.base_path = pool_path + ".base"
+        self._compaction_threshold = compaction_threshold
+        self._lazy = lazy
+        self._current_day = None
+        self._logged_day = None
+        self._sequence = 0
+        self._entries_amount = 0
+
+    @property
+    def entries_amount(self) -> int:
+        """
+        Returns the amount of entries not compacted into the pool file yet.
+        """
+        return self._entries_amount
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the sequence number of the latest change applied to
+        the loaded pool.
+        """
+        return self._sequence
+
+    def load(self, current_day: date) -> PoolModel:
+        """
+        Reads the PoolModel object from the pool file, replays the changes
+        saved in the journal and returns it.
+        """
+
+        with self._locked():
+            pool_model = self._load(current_day)
+            self._log_day(pool_model, current_day)
+
+        return pool_model
+
+    def restore(
+            self, json_dict: dict, current_day: date,
+            trusted: bool = False) -> PoolModel:
+        """
+        Creates the PoolModel object from the already read content of the pool
+        file, replays the changes saved in the journal and returns it. Changing
+        the day is saved the same way as by load(). If trusted is True,
+        the content isn't validated.
+        """
+
+        with self._locked():
+            pool_model = self._restore(json_dict, current_day, trusted)
+            self._log_day(pool_model, current_day)
+
+        return pool_model
+
+    def rebuild(self, sequence: int) -> PoolModel:
+        """
+        Returns the PoolModel object in the state right after the event with
+        the given sequence number. Events compacted into the pool file are
+        replayed from the archive on top of the first compacted snapshot.
+        Events older than that snapshot can't be rebuilt.
+        """
+
+        with self._locked():
+            json_dict, trusted = self._read_snapshot(self.pool_path)
+            entries = self._read_entries(self.journal_path)
+
+            if (sequence < json_dict.get("journal_sequence", 0)
+                    and os.path.isfile(self.base_path)):
+                json_dict, trusted = self._read_snapshot(self.base_path)
+                entries = self._read_entries(self.archive_path)
+
+        snapshot_sequence = json_dict.get("journal_sequence", 0)
+
+        if sequence < snapshot_sequence:
+            raise ValueError(
+                "Events before the oldest snapshot can't be rebuilt.")
+
+        current_day = self._read_snapshot_day(json_dict) or self._current_day
+        pool_model = PoolModel(json_dict, current_day, self._lazy, trusted)
+
+        # The archive may repeat the events of a compaction interrupted
+        # before the journal was cleared, so already applied ones are skipped
+
+        for entry in entries:
+            if (entry["operation"] == "compact"
+                    or entry["sequence"] <= snapshot_sequence):
+                continue
+
+            if entry["sequence"] > sequence:
+                break
+
+            self._apply_entry(pool_model, entry)
+            snapshot_sequence = entry["sequence"]
+
+        return pool_model
+
+    def iter_events(self):
+        """
+        Yields the events appended to the journal after the latest snapshot.
+        """
+
+        for entry in self._read_entries(self.journal_path):
+            if entry["operation"] != "compact":
+                yield entry
+
+    def add_reservation(
+            self, pool_model: PoolModel, service: Services, date: date,
+            hours_range: HoursRange, lane: int = None) -> Reservation:
+        """
+        Applies the changes made by other processes, adds new reservation
+        to the pool (validating it against the latest version of the pool),
+        appends it to the journal and returns it.
+        """
+
+        with self._locked():
+            self._catch_up(pool_model)
+            reservation = pool_model.reservation_system_model.add_reservation(
+                service, date, hours_range, lane)
+            self._append(
+                pool_model, self._reservation_event("add", reservation))
+
+        return reservation
+
+    def remove_reservation(
+            self, pool_model: PoolModel, reservation: Reservation) -> None:
+        """
+        Applies the changes made by other processes, removes the reservation
+        equal to the given one from the pool and appends the change to
+        the journal. Throws ValueError if the reservation was already removed.
+        """
+
+        reservation_json = ReservationSystemModel.reservation_to_json(
+            reservation)
+
+        with self._locked():
+            self._catch_up(pool_model)
+            pool_model.reservation_system_model.remove_matching_reservation(
+                reservation_json)
+            self._append(
+                pool_model, self._reservation_event("remove", reservation))
+
+    def change_price_list(
+            self, pool_model: PoolModel, pricing_json: list) -> None:
+        """
+        Applies the changes made by other processes, replaces the price list
+        of the pool with the JSON-formatted one and appends the change to
+        the journal.
+        """
+
+        with self._locked():
+            self._catch_up(pool_model)
+            pool_model.set_price_list(pricing_json)
+            self._append(pool_model, {
+                "operation": "price_list",
+                "price_list": PriceListModel.to_json(
+                    pool_model.price_list_model.get_pricing())
+            })
+
+    def compact(self, pool_model: PoolModel) -> None:
+        """
+        Writes the whole PoolModel object to the pool file and clears
+        the journal.
+        """
+
+        with self._locked():
+            self._catch_up(pool_model)
+            self._compact(pool_model)
+
+    def _load(self, current_day: date) -> PoolModel:
+        """
+        Reads the PoolModel object from the pool file, replays the changes
+        saved in the journal and returns it. Must be called with the pool
+        locked.
+        """
+
+        json_dict, trusted = self._read_snapshot(self.pool_path)
+        return self._restore(json_dict, current_day, trusted)
+
+    def _restore(
+            self, json_dict: dict, current_day: date,
+            trusted: bool) -> PoolModel:
+        """
+        Creates the PoolModel object from the given content of the pool file,
+        replays the changes saved in the journal and returns it. If the content
+        was read before another process compacted the journal, the pool file
+        is read again. Must be called with the pool locked.
+        """
+
+        pool_model = PoolModel(json_dict, current_day, self._lazy, trusted)
+        self._current_day = current_day
+        self._logged_day = self._read_snapshot_day(json_dict)
+        self._sequence = json_dict.get("journal_sequence", 0)
+        self._entries_amount = 0
+
+        if not self._apply_new_entries(pool_model):
+            return self._load(current_day)
+
+        pool_model.set_current_day(current_day)
+        return pool_model
+
+    def _log_day(self, pool_model: PoolModel, current_day: date) -> None:
+        """
+        Saves the change of the day as an event, if the pool was loaded with
+        a different day than the saved one. Must be called with the pool
+        locked.
+        """
+
+        # Changing the day in the admin mode is saved as an event of every
+        # pool, once the pool is loaded with the new day. If the pool has
+        # no day saved yet, the loaded day becomes its initial day
+
+        if self._logged_day is None:
+            self._logged_day = current_day
+        elif self._logged_day != current_day:
+            self._append(pool_model, self._day_event(current_day))
+
+    def _catch_up(self, pool_model: PoolModel) -> None:
+        """
+        Applies the changes appended to the journal by other processes since
+        the given pool model was loaded. If they were already compacted into
+        the pool file, the model is read from the pool file again.
+        """
+
+        if not self._apply_new_entries(pool_model):
+            loaded_model = self._load(self._current_day)
+            pool_model.__dict__.update(loaded_model.__dict__)
+
+    def _apply_new_entries(self, pool_model: PoolModel) -> bool:
+        """
+        Applies the journal entries newer than the current version to
+        the pool model. Returns False, if some of the newer changes were
+        compacted into the pool file and are missing in the journal.
+        """
+
+        for entry in self._read_entries(self.journal_path):
+            if entry["operation"] == "compact":
+                if entry["sequence"] > self._sequence:
+                    return False
+
+                self._entries_amount = 0
+                continue
+
+            if entry["sequence"] <= self._sequence:
+                continue
+
+            self._apply_entry(pool_model, entry)
+            self._sequence = entry["sequence"]
+            self._entries_amount += 1
+
+            if entry["operation"] == "current_day":
+                self._logged_day = pool_model.current_day
+
+        return True
+
+    def _compact(self, pool_model: PoolModel) -> None:
+        """
+        Writes the whole PoolModel object to the pool file, moves the events
+        of the journal to the archive and clears the journal. Must be called
+        with the pool locked.
+        """
+
+        json_dict = PoolModel.to_json(pool_model)
+        json_dict["journal_sequence"] = self._sequence
+        json_dict["current_day"] = pool_model.current_day.isoformat()
+        self._logged_day = pool_model.current_day
+
+        # The pool file is replaced at once, so it's never left half-written.
+        # Entries already included in the pool file are skipped while loading
+        # in case the journal isn't cleared afterwards. The cleared journal
+        # keeps the version of the compaction, so other processes know they
+        # need to read the pool file again.
+
+        self._archive()
+        temp_path = self.pool_path + ".tmp"
+
+        with open(temp_path, "w") as handle:
+            handle.write(dump_checked(json_dict))
+
+        os.replace(temp_path, self.pool_path)
+
+        with open(self.journal_path, "w") as handle:
+            entry = {"sequence": self._sequence, "operation": "compact"}
+            handle.write(json.dumps(entry) + "\n")
+
+        self._entries_amount = 0
+
+    def _archive(self) -> None:
+        """
+        Appends the events of the journal to the archive. The pool file is
+        kept as the base snapshot of the archive, if it's the first
+        compaction. Must be called with the pool locked.
+        """
+
+        if not os.path.isfile(self.base_path):
+            shutil.copyfile(self.pool_path, self.base_path)
+
+        lines = [
+            json.dumps(entry) + "\n"
+            for entry in self._read_entries(self.journal_path)
+            if entry["operation"] != "compact"]
+
+        self._truncate_partial_line(self.archive_path)
+
+        with open(self.archive_path, "a") as handle:
+            handle.write("".join(lines))
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _append(self, pool_model: PoolModel, event: dict) -> None:
+        """
+        Appends the given event as a single journal entry with the next
+        sequence number and compacts the journal, if it reached
+        the compaction threshold. Must be called with the pool locked.
+        """
+
+        self._sequence += 1
+        entry = {"sequence": self._sequence, **event}
+
+        if event["operation"] == "current_day":
+            self._logged_day = pool_model.current_day
+
+        self._truncate_partial_line(self.journal_path)
+
+        with open(self.journal_path, "a") as handle:
+            handle.write(json.dumps(entry) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        self._entries_amount += 1
+
+        if self._entries_amount >= self._compaction_threshold:
+            self._compact(pool_model)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Locks the pool's lock file for the time of the with block, so no
+        other process changes the pool meanwhile. Doesn't lock anything,
+        where fcntl isn't available.
+        """
+
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _reservation_event(operation: str, reservation: Reservation) -> dict:
+        """
+        Returns the event of adding or removing the given reservation.
+        """
+
+        return {
+            "operation": operation,
+            "reservation": ReservationSystemModel.reservation_to_json(
+                reservation)
+        }
+
+    @staticmethod
+    def _day_event(current_day: date) -> dict:
+        """
+        Returns the event of changing the current day.
+        """
+
+        return {
+            "operation": "current_day",
+            "current_day": current_day.isoformat()
+        }
+
+    @staticmethod
+    def _read_snapshot_day(json_dict: dict) -> date:
+        """
+        Returns the current day saved in the snapshot or None, if it's not
+        saved there.
+        """
+
+        if "current_day" not in json_dict:
+            return None
+
+        return date.fromisoformat(json_dict["current_day"])
+
+    @staticmethod
+    def _read_snapshot(path: str) -> tuple[dict, bool]:
+        """
+        Reads the content of the given pool file and returns it along with
+        the information, if its checksum matches.
+        """
+
+        with open(path) as handle:
+            return load_checked(handle.read())
+
+    @staticmethod
+    def _read_entries(path: str) -> list[dict]:
+        """
+        Returns the list of entries saved in the given journal or archive.
+        Reading stops at a line that was only partially written (e.g. because
+        of a crash), which is cut off before the next entry is appended.
+        """
+
+        if not os.path.isfile(path):
+            return []
+
+        entries = []
+
+        with open(path) as handle:
+            for line in handle:
+                if not line.endswith("\n"):
+                    break
+
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+
+        return entries
+
+    @staticmethod
+    def _truncate_partial_line(path: str) -> None:
+        """
+        Cuts off the partially written last line of the given journal or
+        archive, so the next entry starts on a new line. Must be called with
+        the pool locked.
+        """
+
+        if not os.path.isfile(path):
+            return
+
+        with open(path, "rb+") as handle:
+            size = handle.seek(0, os.SEEK_END)
+
+            if size == 0:
+                return
+
+            handle.seek(size - 1)
+
+            if handle.read(1) == b"\n":
+                return
+
+            handle.seek(0)
+            handle.truncate(handle.read().rfind(b"\n") + 1)
+
+    @staticmethod
+    def _apply_entry(pool_model: PoolModel, entry: dict) -> None:
+        """
+        Applies the change saved in the given journal entry to the PoolModel.
+        """
+
+        res_sys_model = pool_model.reservation_system_model
+
+        match entry["operation"]:
+            case "add":
+                res_sys_model.insert_reservation(
+                    ReservationSystemModel.reservation_from_json(
+                        entry["reservation"]))
+            case "remove":
+                res_sys_model.remove_matching_reservation(
+                    entry["reservation"])
+            case "price_list":
+                pool_model.set_price_list(entry["price_list"])
+            case "current_day":
+                pool_model.set_current_day(
+                    date.fromisoformat(entry["current_day"]))
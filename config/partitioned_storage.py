@@ -0,0 +1,176 @@
+from datetime import date
+from model.pool_model import PoolModel
+import json
+import os
+
+
+POOL_FILE_NAME = "pool.json"
+RESERVATIONS_DIRECTORY = "reservations"
+
+
+class PartitionedPoolStorage:
+    """
+    Stores a pool model in a directory, where the pool's data (name, working
+    hours, lanes amount and price list) is kept in a single file, while
+    the reservations are split into per-month partition files (e.g.
+    reservations/2022-01.json). Only the partitions of the months with
+    changed reservations are rewritten and only the partitions of the
+    requested months are read. Partitions of the months the last read pool
+    model didn't load are merged with its reservations instead of being
+    replaced.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.pool_path = os.path.join(directory, POOL_FILE_NAME)
+        self.reservations_directory = os.path.join(
+            directory, RESERVATIONS_DIRECTORY)
+        self._loaded_from = None
+
+    def write_pool_model(
+            self, pool_model: PoolModel, full: bool = False) -> None:
+        """
+        Writes PoolModel object to the storage. Rewrites only the partitions
+        of the months with changed reservations or, if full is True (or
+        the storage is empty), the partitions of all months the model has
+        reservations for.
+        """
+
+        res_sys_model = pool_model.reservation_system_model
+        full = full or not os.path.isdir(self.reservations_directory)
+
+        os.makedirs(self.reservations_directory, exist_ok=True)
+        self._replace_file(
+            self.pool_path, PoolModel.metadata_to_json(pool_model))
+
+        if full:
+            reservations_json = res_sys_model.reservations_to_json()
+            months = {
+                (reservation["date"]["year"], reservation["date"]["month"])
+                for reservation in reservations_json}
+            months |= res_sys_model.dirty_months
+        else:
+            months = res_sys_model.dirty_months
+            reservations_json = res_sys_model.reservations_to_json(months)
+
+        partitions = {month: [] for month in months}
+
+        for reservation in reservations_json:
+            month = (reservation["date"]["year"], reservation["date"]["month"])
+            partitions[month].append(reservation)
+
+        # Partitions of the months left without any reservations are deleted
+
+        for month, partition in partitions.items():
+            partition_path = self._partition_path(month)
+
+            if self._loaded_from is not None and month < self._loaded_from:
+                partition = self._merge_partition(partition_path, partition)
+
+            if partition:
+                self._replace_file(partition_path, partition)
+            elif os.path.isfile(partition_path):
+                os.remove(partition_path)
+
+        res_sys_model.clear_dirty_months()
+
+    def read_pool_model(
+            self, current_day: date, since: date = None,
+            lazy: bool = False) -> PoolModel:
+        """
+        Reads PoolModel object from the storage and returns it. Loads only
+        the partitions of the month of the since date and later ones
+        (by default of the current day's month), which can't be later than
+        the current day's month, as new reservations are validated only
+        against the loaded ones. If lazy is True, past reservations are
+        decoded only when they're requested.
+        """
+
+        if since is None:
+            since = current_day
+
+        if (since.year, since.month) > (current_day.year, current_day.month):
+            raise ValueError(
+                "Since date cannot be in later month than current day.")
+
+        with open(self.pool_path) as handle:
+            json_dict = json.load(handle)
+
+        reservations_json = []
+
+        for month in self.partition_months():
+            if month < (since.year, since.month):
+                continue
+
+            with open(self._partition_path(month)) as handle:
+                reservations_json.extend(json.load(handle))
+
+        json_dict["reservations"] = reservations_json
+        pool_model = PoolModel(json_dict, current_day, lazy)
+
+        self._loaded_from = (since.year, since.month)
+        return pool_model
+
+    def partition_months(self) -> list[tuple[int, int]]:
+        """
+        Returns the sorted list of (year, month) tuples of the saved
+        reservations partitions.
+        """
+
+        if not os.path.isdir(self.reservations_directory):
+            return []
+
+        months = []
+
+        for file_name in os.listdir(self.reservations_directory):
+            name, extension = os.path.splitext(file_name)
+            year, _, month = name.partition("-")
+
+            if extension == ".json" and year.isdigit() and month.isdigit():
+                months.append((int(year), int(month)))
+
+        return sorted(months)
+
+    def _partition_path(self, month: tuple[int, int]) -> str:
+        """
+        Returns the path of the partition file of the given month.
+        """
+
+        year, month_number = month
+        return os.path.join(
+            self.reservations_directory,
+            f"{year:04d}-{month_number:02d}.json")
+
+    @staticmethod
+    def _merge_partition(partition_path: str, partition: list) -> list:
+        """
+        Returns the reservations saved in the given partition file, which
+        aren't in the given partition, followed by the given partition.
+        """
+
+        if not os.path.isfile(partition_path):
+            return partition
+
+        with open(partition_path) as handle:
+            saved_partition = json.load(handle)
+
+        ids = {reservation.get("id") for reservation in partition}
+        ids.discard(None)
+
+        return [
+            reservation for reservation in saved_partition
+            if reservation.get("id") not in ids] + partition
+
+    @staticmethod
+    def _replace_file(path: str, json_object) -> None:
+        """
+        Writes the JSON object to a temporary file and replaces the given
+        file with it at once, so it's never left half-written.
+        """
+
+        temp_path = path + ".tmp"
+
+        with open(temp_path, "w") as handle:
+            json.dump(json_object, handle)
+
+        os.replace(temp_path, path)
@@ -0,0 +1,178 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from config.admin import Admin
+from config.io_manager import has_valid_checksum, read_config
+from config.journal import PoolJournal
+from datetime import date
+from model.pool_model import PoolModel
+import json
+import os
+
+
+CONFIG_FILE_NAME = "config.json"
+
+
+def _read_file(path: str) -> str:
+    """
+    Reads and returns the whole content of the given text file.
+    """
+
+    with open(path) as handle:
+        return handle.read()
+
+
+def _validate_pool(content: str, current_day: date) -> None:
+    """
+    Validates the content of a pool file by creating the PoolModel object
+    and throws proper exceptions in case of any incorrectness.
+    """
+
+    PoolModel(json.loads(content), current_day)
+
+
+class PoolRegistry:
+    """
+    Stores the PoolModel objects of several pools, available by the pool
+    names, along with their journals. All pools share a single Admin object.
+    Pool files are read concurrently by a pool of threads and the ones
+    without the matching checksum are validated by a pool of processes.
+    The pool models are built one after another by the loading process, as
+    sending a built model between processes costs more than building it. So
+    loading many pools takes about as long as loading them one by one from
+    the files with matching checksums.
+    """
+
+    def __init__(self, admin: Admin) -> None:
+        self.admin = admin
+        self._pools = {}
+        self._journals = {}
+
+    @staticmethod
+    def from_config(config_path: str = CONFIG_FILE_NAME):
+        """
+        Creates a PoolRegistry object with the Admin object read from
+        the given config file and returns it.
+        """
+
+        with open(config_path) as handle:
+            return PoolRegistry(read_config(handle))
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._pools
+
+    def names(self) -> list[str]:
+        """
+        Returns the sorted list of names of the loaded pools.
+        """
+
+        return sorted(self._pools)
+
+    def get_pool(self, name: str) -> PoolModel:
+        """
+        Returns the PoolModel object of the pool with the given name.
+        """
+
+        if name not in self._pools:
+            raise KeyError(f"There's no pool named {name}.")
+
+        return self._pools[name]
+
+    def get_journal(self, name: str) -> PoolJournal:
+        """
+        Returns the PoolJournal object of the pool with the given name.
+        """
+
+        if name not in self._journals:
+            raise KeyError(f"There's no pool named {name}.")
+
+        return self._journals[name]
+
+    def load_directory(
+            self, directory: str, max_workers: int = None,
+            use_processes: bool = True) -> dict[str, Exception]:
+        """
+        Loads all pool files (JSON files other than the config file) from
+        the given directory. Returns a dictionary, that to the path of every
+        file which couldn't be loaded assigns the raised exception.
+        """
+
+        paths = []
+
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith(".json") and file_name != CONFIG_FILE_NAME:
+                paths.append(os.path.join(directory, file_name))
+
+        return self.load_files(paths, max_workers, use_processes)
+
+    def load_files(
+            self, paths: list[str], max_workers: int = None,
+            use_processes: bool = True) -> dict[str, Exception]:
+        """
+        Loads the pools from the given files. Returns a dictionary, that to
+        the path of every file which couldn't be loaded assigns the raised
+        exception. If use_processes is False, pool files are validated by
+        threads instead of processes.
+        """
+
+        current_day = self.admin.current_day
+        errors = {}
+
+        if use_processes:
+            validate_executor = ProcessPoolExecutor(max_workers)
+        else:
+            validate_executor = ThreadPoolExecutor(max_workers)
+
+        # 1. Read the files and hand over every read content without
+        # the matching checksum to be validated as soon as it's available.
+        # Only the content is sent to the workers and nothing but the raised
+        # exception comes back
+
+        with ThreadPoolExecutor(max_workers) as read_executor, \
+                validate_executor:
+            read_futures = {
+                path: read_executor.submit(_read_file, path)
+                for path in paths}
+            contents = {}
+            validate_futures = {}
+
+            for path, read_future in read_futures.items():
+                try:
+                    content = read_future.result()
+                except Exception as e:
+                    errors[path] = e
+                    continue
+
+                contents[path] = content
+
+                if not has_valid_checksum(content):
+                    validate_futures[path] = validate_executor.submit(
+                        _validate_pool, content, current_day)
+
+            # 2. Create the already validated pool models and replay their
+            # journals, saving the change of the day like loading a single
+            # pool does
+
+            for path in list(contents):
+                try:
+                    if path in validate_futures:
+                        validate_futures[path].result()
+
+                    json_dict = json.loads(contents.pop(path))
+                    journal = PoolJournal(path)
+                    pool_model = journal.restore(
+                        json_dict, current_day, trusted=True)
+                except Exception as e:
+                    errors[path] = e
+                    continue
+
+                if pool_model.name in self._pools:
+                    errors[path] = ValueError(
+                        f"Pool named {pool_model.name} is already loaded.")
+                    continue
+
+                self._pools[pool_model.name] = pool_model
+                self._journals[pool_model.name] = journal
+
+        return errors
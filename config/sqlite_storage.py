@@ -0,0 +1,375 @@
+from datetime import date, datetime
+from model.pool_model import PoolModel
+from model.reservations_model import Reservation, SchoolReservation
+from model.value_types import HoursRange, Price, Services
+import sqlite3
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pool (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    name TEXT NOT NULL,
+    lanes_amount INTEGER NOT NULL,
+    next_reservation_id INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS working_hours (
+    day INTEGER PRIMARY KEY,
+    begin_minutes INTEGER NOT NULL,
+    end_minutes INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS price_list (
+    id INTEGER PRIMARY KEY,
+    service INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    begin_minutes INTEGER NOT NULL,
+    end_minutes INTEGER NOT NULL,
+    price_gr INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY,
+    date INTEGER NOT NULL,
+    begin_minutes INTEGER NOT NULL,
+    end_minutes INTEGER NOT NULL,
+    service INTEGER NOT NULL,
+    lane INTEGER,
+    price_gr INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS reservations_date_lane_service
+    ON reservations (date, lane, service);
+"""
+
+_RESERVATION_COLUMNS = (
+    "id, date, begin_minutes, end_minutes, service, lane, price_gr")
+
+
+class SQLitePoolStorage:
+    """
+    Stores a pool model (its metadata, working hours, price list and
+    reservations) in the tables of an SQLite database. Reservations are
+    indexed by date, lane and service, so the availability queries are
+    answered with indexed SQL and a single reservation is saved in
+    a single-row transaction. Remembers the IDs of the reservations of
+    the last read pool model, so writing it back deletes only the ones
+    removed from the model and never the ones which weren't loaded.
+    """
+
+    def __init__(self, database_path: str) -> None:
+        self._connection = sqlite3.connect(database_path)
+        self._loaded_ids = None
+
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+            # Databases created before the next reservation ID was saved
+            # get its column, following the greatest ID saved so far
+
+            columns = [
+                row[1] for row in self._connection.execute(
+                    "PRAGMA table_info(pool)")]
+
+            if "next_reservation_id" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE pool ADD COLUMN next_reservation_id "
+                    + "INTEGER NOT NULL DEFAULT 0")
+                self._connection.execute(
+                    "UPDATE pool SET next_reservation_id = "
+                    + "(SELECT COALESCE(MAX(id), -1) + 1 FROM reservations)")
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+
+        self._connection.close()
+
+    def write_pool_model(
+            self, pool_model: PoolModel, since: date = None) -> None:
+        """
+        Writes PoolModel object to the database. All reservations of the model
+        are saved. If the since date is given, the saved reservations of that
+        date or later missing in the model are deleted. Otherwise only
+        the reservations removed from the last read pool model are deleted
+        (or all saved ones missing in the model, if no pool model was read
+        from the database yet).
+        """
+
+        with self._connection as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO pool (id, name, lanes_amount, "
+                + "next_reservation_id) VALUES (0, ?, ?, ?)",
+                (pool_model.name, pool_model.lanes_amount,
+                 pool_model.reservation_system_model.next_id))
+
+            connection.execute("DELETE FROM working_hours")
+            connection.executemany(
+                "INSERT INTO working_hours VALUES (?, ?, ?)",
+                [(day.value, hours.begin_minutes, hours.end_minutes)
+                 for day, hours in pool_model.working_hours.items()])
+
+            connection.execute("DELETE FROM price_list")
+            connection.executemany(
+                "INSERT INTO price_list (service, day, begin_minutes, "
+                + "end_minutes, price_gr) VALUES (?, ?, ?, ?, ?)",
+                [(position.service.value, position.day.value,
+                  position.hours_range.begin_minutes,
+                  position.hours_range.end_minutes,
+                  position.price.get_total_gr())
+                 for position in pool_model.price_list_model.get_pricing()])
+
+            reservations = pool_model.reservation_system_model.reservations
+            ids = {reservation.id for reservation in reservations}
+
+            if since is not None:
+                connection.execute(
+                    "DELETE FROM reservations WHERE date >= ?",
+                    (since.toordinal(),))
+            elif self._loaded_ids is None:
+                connection.execute("DELETE FROM reservations")
+            else:
+                connection.executemany(
+                    "DELETE FROM reservations WHERE id = ?",
+                    [(removed_id,) for removed_id in self._loaded_ids - ids])
+
+            connection.executemany(
+                "INSERT OR REPLACE INTO reservations "
+                + f"({_RESERVATION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._reservation_to_row(r) for r in reservations])
+
+        self._loaded_ids = ids
+
+    def read_pool_model(
+            self, current_day: date, since: date = None) -> PoolModel:
+        """
+        Reads PoolModel object from the database and returns it. Only the
+        reservations of the since date or later are loaded (by default
+        the reservations of the current day or later). The since date can't
+        be later than the current day, as new reservations are validated
+        only against the loaded ones.
+        """
+
+        if since is None:
+            since = current_day
+
+        if since > current_day:
+            raise ValueError("Since date cannot be later than current day.")
+
+        pool_row = self._connection.execute(
+            "SELECT name, lanes_amount, next_reservation_id "
+            + "FROM pool").fetchone()
+
+        if pool_row is None:
+            raise ValueError("There's no pool saved in the database.")
+
+        working_hours_json = {}
+
+        for day, begin, end in self._connection.execute(
+                "SELECT day, begin_minutes, end_minutes FROM working_hours"):
+            working_hours_json[str(day)] = HoursRange.to_json(
+                HoursRange.from_minutes(begin, end))
+
+        price_list_json = []
+
+        for service, day, begin, end, price_gr in self._connection.execute(
+                "SELECT service, day, begin_minutes, end_minutes, price_gr "
+                + "FROM price_list ORDER BY id"):
+            price_list_json.append({
+                "service": service,
+                "day": day,
+                "hours_range": HoursRange.to_json(
+                    HoursRange.from_minutes(begin, end)),
+                "price": Price.to_json(Price.from_total_gr(price_gr))
+            })
+
+        pool_json = {
+            "name": pool_row[0],
+            "lanes_amount": pool_row[1],
+            "working_hours": working_hours_json,
+            "price_list": price_list_json,
+            "next_reservation_id": pool_row[2]
+        }
+
+        pool_model = PoolModel(pool_json, current_day)
+        res_sys_model = pool_model.reservation_system_model
+
+        for reservation in self.iter_reservations(begin_date=since):
+            res_sys_model.insert_reservation(reservation)
+
+        self._loaded_ids = {r.id for r in res_sys_model.reservations}
+        return pool_model
+
+    def insert_reservation(self, reservation: Reservation) -> None:
+        """
+        Saves a single reservation in the database, along with the next
+        reservation ID following its own.
+        """
+
+        with self._connection as connection:
+            cursor = connection.execute(
+                f"INSERT INTO reservations ({_RESERVATION_COLUMNS}) "
+                + "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._reservation_to_row(reservation))
+            connection.execute(
+                "UPDATE pool SET next_reservation_id = "
+                + "MAX(next_reservation_id, ?)", (cursor.lastrowid + 1,))
+
+    def delete_reservation(self, reservation: Reservation) -> None:
+        """
+        Deletes a single reservation equal to the given one from the database.
+        """
+
+        row = self._reservation_to_row(reservation)
+
+        with self._connection as connection:
+            if reservation.id is not None:
+                cursor = connection.execute(
+                    "DELETE FROM reservations WHERE id = ?", row[:1])
+            else:
+                cursor = connection.execute(
+                    "DELETE FROM reservations WHERE id = (SELECT id FROM "
+                    + "reservations WHERE date = ? AND begin_minutes = ? "
+                    + "AND end_minutes = ? AND service = ? AND lane IS ? "
+                    + "AND price_gr = ? LIMIT 1)", row[1:])
+
+        if cursor.rowcount == 0:
+            raise ValueError("There's no such reservation.")
+
+    def iter_reservations(
+            self, service: Services = None, begin_date: date = None,
+            end_date: date = None, lane: int = None):
+        """
+        Yields the saved reservations (optionally only of the given service,
+        date range and lane) one at a time.
+        """
+
+        conditions, parameters = self._filter_conditions(
+            service, begin_date, end_date, lane)
+
+        cursor = self._connection.execute(
+            f"SELECT {_RESERVATION_COLUMNS} FROM reservations "
+            + f"{conditions} ORDER BY id", parameters)
+
+        for row in cursor:
+            yield self._row_to_reservation(row)
+
+    def available_lanes(
+            self, date_time: datetime, lanes_amount: int) -> list[int]:
+        """
+        Returns a list of available lane numbers for the given datetime.
+        """
+
+        minutes = self._to_minutes(date_time)
+        taken_lanes = {
+            row[0] for row in self._connection.execute(
+                "SELECT DISTINCT lane FROM reservations WHERE date = ? "
+                + "AND service = ? AND begin_minutes < ? AND end_minutes > ?",
+                (date_time.toordinal(), Services.SWIMMING_SCHOOL.value,
+                 minutes, minutes))}
+
+        return [lane for lane in range(lanes_amount)
+                if lane not in taken_lanes]
+
+    def reservations_amount(
+            self, service: Services, date_time: datetime) -> int:
+        """
+        Returns the amount of reservations of the particular type
+        for the given datetime.
+        """
+
+        minutes = self._to_minutes(date_time)
+
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM reservations WHERE date = ? "
+            + "AND service = ? AND begin_minutes < ? AND end_minutes > ?",
+            (date_time.toordinal(), Services(service).value,
+             minutes, minutes)).fetchone()[0]
+
+    def calculate_total_income(self, day: date) -> Price:
+        """
+        Returns a Price object representing total income from the reservations
+        of the given day.
+        """
+
+        total_gr = self._connection.execute(
+            "SELECT COALESCE(SUM(price_gr), 0) FROM reservations "
+            + "WHERE date = ?", (day.toordinal(),)).fetchone()[0]
+
+        return Price.from_total_gr(total_gr)
+
+    @staticmethod
+    def _filter_conditions(
+            service: Services, begin_date: date, end_date: date,
+            lane: int) -> tuple[str, list]:
+        """
+        Returns the WHERE clause and its parameters for the given filters.
+        """
+
+        conditions = []
+        parameters = []
+
+        if begin_date is not None:
+            conditions.append("date >= ?")
+            parameters.append(begin_date.toordinal())
+
+        if end_date is not None:
+            conditions.append("date <= ?")
+            parameters.append(end_date.toordinal())
+
+        if lane is not None:
+            conditions.append("lane = ?")
+            parameters.append(lane)
+
+        if service is not None:
+            conditions.append("service = ?")
+            parameters.append(Services(service).value)
+
+        if not conditions:
+            return "", parameters
+
+        return "WHERE " + " AND ".join(conditions), parameters
+
+    @staticmethod
+    def _to_minutes(date_time: datetime) -> float:
+        """
+        Returns the amount of minutes between midnight and the given datetime.
+        """
+
+        return (date_time.hour * 60 + date_time.minute
+                + date_time.second / 60 + date_time.microsecond / 60000000)
+
+    @staticmethod
+    def _reservation_to_row(reservation: Reservation) -> tuple:
+        """
+        Converts a Reservation object to the reservations table row.
+        """
+
+        return (
+            reservation.id,
+            reservation.date.toordinal(),
+            reservation.hours_range.begin_minutes,
+            reservation.hours_range.end_minutes,
+            reservation.get_service().value,
+            getattr(reservation, "lane", None),
+            reservation.price.get_total_gr())
+
+    @staticmethod
+    def _row_to_reservation(row: tuple) -> Reservation:
+        """
+        Converts a reservations table row to the Reservation or
+        SchoolReservation object.
+        """
+
+        reservation_id, day, begin, end, service, lane, price_gr = row
+        reservation_date = date.fromordinal(day)
+        hours_range = HoursRange.from_minutes(begin, end)
+        price = Price.from_total_gr(price_gr)
+
+        if service == Services.INDIVIDUAL.value:
+            return Reservation(
+                reservation_date, hours_range, price, reservation_id)
+
+        return SchoolReservation(
+            lane, reservation_date, hours_range, price, reservation_id)
@@ -0,0 +1,170 @@
+from model.occupancy_index import SLOTS_PER_DAY, range_to_slots
+from datetime import date
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_day_grid_available() -> bool:
+    """
+    Returns True, if NumPy is installed and the DayGridEngine can be used.
+    """
+
+    return numpy is not None
+
+
+class DayGridEngine:
+    """
+    Optional, NumPy-based engine evaluating the reservation rules. Represents
+    every booked day as a dense array of lane occupancy (48 half-hour slots
+    by lanes amount) and a 48-slot vector of individual reservations amounts,
+    so the rules are checked with a few vector operations over the slots of
+    a reservation. Requires NumPy to be installed.
+    """
+
+    def __init__(
+            self, lanes_amount: int, tickets_per_lane: int,
+            school_lanes_limit: float, reservations: list = None) -> None:
+
+        if numpy is None:
+            raise ImportError("DayGridEngine requires NumPy to be installed.")
+
+        self._lanes_amount = lanes_amount
+        self._tickets_per_lane = tickets_per_lane
+        self._school_lanes_limit = school_lanes_limit
+        self._days = {}
+
+        if reservations is not None:
+            for reservation in reservations:
+                self.add(reservation)
+
+    def add(self, reservation) -> None:
+        """
+        Adds the given reservation to the grid of its day.
+        """
+
+        self._update(reservation, 1)
+
+    def remove(self, reservation) -> None:
+        """
+        Removes the given reservation from the grid of its day.
+        """
+
+        self._update(reservation, -1)
+
+    def get_day(self, day: date) -> tuple:
+        """
+        Returns a tuple of the lanes grid and the individual reservations
+        vector of the given day or None, if the day has no reservations.
+        """
+
+        return self._days.get(day)
+
+    def check_reservation_intersection(
+            self, hours_range, day: date, is_school: bool,
+            lane: int = None) -> bool:
+        """
+        Returns True if the given time for the reservation to be added
+        is not available.
+        """
+
+        slots = range_to_slots(hours_range)
+        return bool(
+            self.conflicting_slots(slots, day, is_school, lane).any())
+
+    def conflicting_slots(
+            self, slots: range, day: date, is_school: bool,
+            lane: int = None):
+        """
+        Returns a boolean array telling for every given slot, if it cannot
+        be taken by the reservation to be added.
+        """
+
+        grid = self._days.get(day)
+        span = slice(slots.start, slots.stop)
+
+        if grid is None:
+            lanes = numpy.zeros((len(slots), self._lanes_amount), numpy.int32)
+            individuals = numpy.zeros(len(slots), numpy.int32)
+        else:
+            lanes = grid[0][span]
+            individuals = grid[1][span]
+
+        available_lanes = self._lanes_amount - numpy.count_nonzero(
+            lanes, axis=1)
+
+        if not is_school:
+            tickets = self._tickets_per_lane * available_lanes - individuals
+            return tickets <= 0
+
+        lane_taken = lanes[:, lane] > 0
+
+        new_lanes_amount = available_lanes - 1
+        overflow = self._tickets_per_lane * new_lanes_amount < individuals
+
+        new_lanes_taken = self._lanes_amount - new_lanes_amount
+        lanes_limit = self._school_lanes_limit * self._lanes_amount
+        over_limit = new_lanes_taken > lanes_limit
+
+        return lane_taken | overflow | over_limit
+
+    def days_availability(self, days: list[date]) -> list[tuple]:
+        """
+        Returns a list of tuples (one for every given day) of the list of
+        available lanes and the list of available tickets amounts for every
+        slot of the day. The grids of all days are stacked, so tickets of
+        the whole range are counted with a few vector operations.
+        """
+
+        lanes = numpy.zeros(
+            (len(days), SLOTS_PER_DAY, self._lanes_amount), numpy.int32)
+        individuals = numpy.zeros((len(days), SLOTS_PER_DAY), numpy.int32)
+
+        for index, day in enumerate(days):
+            grid = self._days.get(day)
+
+            if grid is not None:
+                lanes[index] = grid[0]
+                individuals[index] = grid[1]
+
+        free_lanes = lanes == 0
+        tickets = self._tickets_per_lane * numpy.count_nonzero(
+            free_lanes, axis=2) - individuals
+
+        return [
+            ([numpy.flatnonzero(slot).tolist() for slot in day_lanes],
+             day_tickets)
+            for day_lanes, day_tickets in zip(free_lanes, tickets.tolist())]
+
+    def _update(self, reservation, change: int) -> None:
+        """
+        Adds or subtracts the given reservation to or from the slots of its
+        day, removing the day's grid once it's empty.
+        """
+
+        lane = getattr(reservation, "lane", None)
+
+        if lane is not None and lane >= self._lanes_amount:
+            return
+
+        grid = self._days.get(reservation.date)
+
+        if grid is None:
+            grid = (
+                numpy.zeros(
+                    (SLOTS_PER_DAY, self._lanes_amount), numpy.int32),
+                numpy.zeros(SLOTS_PER_DAY, numpy.int32))
+            self._days[reservation.date] = grid
+
+        slots = range_to_slots(reservation.hours_range)
+        span = slice(slots.start, slots.stop)
+
+        if lane is None:
+            grid[1][span] += change
+        else:
+            grid[0][span, lane] += change
+
+        if not (grid[0].any() or grid[1].any()):
+            del self._days[reservation.date]
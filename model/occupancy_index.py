@@ -0,0 +1,320 @@
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import date, datetime, time
+
+
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+SlotAvailability = namedtuple(
+    "SlotAvailability",
+    ["hours_range", "available_lanes", "available_tickets"])
+
+
+def time_to_slot(date_time: datetime) -> tuple[int, bool]:
+    """
+    Returns the index of the 30-minute slot containing the time of the given
+    datetime and True, if the time is exactly equal the slot's begin time.
+    """
+
+    minutes = date_time.hour * 60 + date_time.minute
+    on_boundary = (
+        minutes % SLOT_MINUTES == 0
+        and date_time.second == 0 and date_time.microsecond == 0)
+
+    return minutes // SLOT_MINUTES, on_boundary
+
+
+def range_to_slots(hours_range) -> range:
+    """
+    Returns the range of 30-minute slot indexes covered by the given
+    HoursRange object.
+    """
+
+    return range(
+        hours_range.begin_minutes // SLOT_MINUTES,
+        hours_range.end_minutes // SLOT_MINUTES)
+
+
+def slot_to_time(slot: int) -> time:
+    """
+    Returns the begin time of the 30-minute slot with the given index.
+    """
+
+    return time(*divmod(slot * SLOT_MINUTES, 60))
+
+
+class LaneIntervals:
+    """
+    Sorted list of slot intervals of the school reservations made for
+    a single lane on a single day. Along with the intervals, stores the
+    greatest end slot of every prefix of the list, so overlapping intervals
+    can be found with a binary search.
+    """
+
+    def __init__(self) -> None:
+        self._intervals = []
+        self._max_ends = []
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, slots: range) -> None:
+        """
+        Adds the given range of slots to the list.
+        """
+
+        interval = (slots.start, slots.stop)
+        insort(self._intervals, interval)
+        self._update_max_ends(self._intervals.index(interval))
+
+    def remove(self, slots: range) -> None:
+        """
+        Removes the given range of slots from the list.
+        """
+
+        index = self._intervals.index((slots.start, slots.stop))
+        del self._intervals[index]
+        del self._max_ends[index]
+        self._update_max_ends(index)
+
+    def overlaps(self, slots: range) -> bool:
+        """
+        Returns True, if any of the stored intervals overlaps with
+        the given range of slots.
+        """
+
+        # Only the intervals beginning before the end of the given range
+        # can overlap with it, so it's enough to check the greatest end
+        # among them
+
+        index = bisect_left(self._intervals, (slots.stop,))
+        return index > 0 and self._max_ends[index - 1] > slots.start
+
+    def _update_max_ends(self, begin_index: int) -> None:
+        """
+        Recalculates the greatest end slots starting with the given index.
+        """
+
+        del self._max_ends[begin_index:]
+        max_end = self._max_ends[-1] if self._max_ends else 0
+
+        for _, end in self._intervals[begin_index:]:
+            max_end = max(max_end, end)
+            self._max_ends.append(max_end)
+
+
+class DayOccupancy:
+    """
+    Represents the occupancy of a single day divided into 30-minute slots.
+    For every slot stores the lanes taken by swimming schools and the amount
+    of individual reservations, as well as the same information about
+    the reservations beginning in that slot.
+    """
+
+    def __init__(self) -> None:
+        self.lanes = [{} for _ in range(SLOTS_PER_DAY)]
+        self.begun_lanes = [{} for _ in range(SLOTS_PER_DAY)]
+        self.individuals = [0] * SLOTS_PER_DAY
+        self.begun_individuals = [0] * SLOTS_PER_DAY
+        self.lane_intervals = {}
+        self.reservations_amount = 0
+
+    def is_lane_taken(self, lane: int, slots: range) -> bool:
+        """
+        Returns True, if the given lane is taken in any of the given slots.
+        """
+
+        intervals = self.lane_intervals.get(lane)
+        return intervals is not None and intervals.overlaps(slots)
+
+    def taken_lanes_amount(self, slot: int, lanes_amount: int) -> int:
+        """
+        Returns the amount of lanes (with numbers lower than lanes_amount)
+        taken in the given slot.
+        """
+
+        lanes = self.lanes[slot]
+
+        if len(lanes) == 0:
+            return 0
+
+        return sum(1 for lane in lanes if lane < lanes_amount)
+
+    def taken_lanes(self, slot: int, on_boundary: bool) -> set[int]:
+        """
+        Returns a set of lanes taken in the given slot. If on_boundary is
+        True, skips the lanes of reservations beginning in that slot.
+        """
+
+        if not on_boundary:
+            return set(self.lanes[slot])
+
+        begun = self.begun_lanes[slot]
+        return {
+            lane for lane, amount in self.lanes[slot].items()
+            if amount > begun.get(lane, 0)}
+
+    def school_amount(self, slot: int, on_boundary: bool) -> int:
+        """
+        Returns the amount of school reservations in the given slot. If
+        on_boundary is True, skips the reservations beginning in that slot.
+        """
+
+        amount = sum(self.lanes[slot].values())
+
+        if on_boundary:
+            amount -= sum(self.begun_lanes[slot].values())
+
+        return amount
+
+    def individual_amount(self, slot: int, on_boundary: bool) -> int:
+        """
+        Returns the amount of individual reservations in the given slot. If
+        on_boundary is True, skips the reservations beginning in that slot.
+        """
+
+        amount = self.individuals[slot]
+
+        if on_boundary:
+            amount -= self.begun_individuals[slot]
+
+        return amount
+
+    def update(self, reservation, change: int) -> None:
+        """
+        Adds (change equal 1) or subtracts (change equal -1) the given
+        reservation to or from the slots it covers.
+        """
+
+        slots = range_to_slots(reservation.hours_range)
+        lane = getattr(reservation, "lane", None)
+
+        if lane is None:
+            for slot in slots:
+                self.individuals[slot] += change
+            self.begun_individuals[slots.start] += change
+        else:
+            for slot in slots:
+                self._update_lane(self.lanes[slot], lane, change)
+            self._update_lane(self.begun_lanes[slots.start], lane, change)
+            self._update_lane_intervals(lane, slots, change)
+
+        self.reservations_amount += change
+
+    def _update_lane_intervals(
+            self, lane: int, slots: range, change: int) -> None:
+        """
+        Adds or removes the given range of slots to or from the intervals
+        of the given lane.
+        """
+
+        intervals = self.lane_intervals.get(lane)
+
+        if change > 0:
+            if intervals is None:
+                intervals = LaneIntervals()
+                self.lane_intervals[lane] = intervals
+            intervals.add(slots)
+        else:
+            intervals.remove(slots)
+            if len(intervals) == 0:
+                del self.lane_intervals[lane]
+
+    @staticmethod
+    def _update_lane(lanes: dict[int, int], lane: int, change: int) -> None:
+        """
+        Changes the amount of reservations of the given lane in the
+        given dictionary, removing lanes which are no longer taken.
+        """
+
+        amount = lanes.get(lane, 0) + change
+
+        if amount > 0:
+            lanes[lane] = amount
+        else:
+            lanes.pop(lane, None)
+
+
+class OccupancyIndex:
+    """
+    Per-date index of the reservations. Maps every date to the DayOccupancy
+    object, so the availability queries depend only on the reservations of
+    the given day instead of all stored reservations.
+    """
+
+    def __init__(self, reservations: list = None) -> None:
+        self._days = {}
+
+        if reservations is not None:
+            for reservation in reservations:
+                self.add(reservation)
+
+    def add(self, reservation) -> None:
+        """
+        Adds the given reservation to the index.
+        """
+
+        day = self._days.get(reservation.date)
+
+        if day is None:
+            day = DayOccupancy()
+            self._days[reservation.date] = day
+
+        day.update(reservation, 1)
+
+    def remove(self, reservation) -> None:
+        """
+        Removes the given reservation from the index.
+        """
+
+        day = self._days[reservation.date]
+        day.update(reservation, -1)
+
+        if day.reservations_amount == 0:
+            del self._days[reservation.date]
+
+    def get_day(self, day: date) -> DayOccupancy:
+        """
+        Returns the DayOccupancy object of the given date or None, if there
+        are no reservations on that day.
+        """
+
+        return self._days.get(day)
+
+    def taken_lanes(self, date_time: datetime) -> set[int]:
+        """
+        Returns a set of lanes taken by swimming schools in the given datetime
+        (reservations beginning or ending exactly then are not included).
+        """
+
+        day = self._days.get(date_time.date())
+
+        if day is None:
+            return set()
+
+        return day.taken_lanes(*time_to_slot(date_time))
+
+    def school_amount(self, date_time: datetime) -> int:
+        """
+        Returns the amount of school reservations in the given datetime.
+        """
+
+        day = self._days.get(date_time.date())
+
+        if day is None:
+            return 0
+
+        return day.school_amount(*time_to_slot(date_time))
+
+    def individual_amount(self, date_time: datetime) -> int:
+        """
+        Returns the amount of individual reservations in the given datetime.
+        """
+
+        day = self._days.get(date_time.date())
+
+        if day is None:
+            return 0
+
+        return day.individual_amount(*time_to_slot(date_time))
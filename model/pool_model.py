@@ -1,6 +1,6 @@
 from model.price_list_model import PriceListModel
 from model.reservations_model import ReservationSystemModel
-from datetime import date, timedelta
+from datetime import date
 from model.value_types import WeekDay, HoursRange
 from exceptions.pool_model_exceptions import InvalidWorkingHoursError
 
@@ -9,10 +9,15 @@ class PoolModel:
     """
     Main class for the model of the pool. Stores info about pool name,
     working hours, lanes amount as well as references to the
-    price list and reservation system.
+    price list and reservation system. If lazy is True, past reservations
+    are kept as JSON-formatted records until they're requested. If trusted
+    is True, the price list and reservations aren't validated (used for
+    the files written by PoolTool itself).
     """
 
-    def __init__(self, initial_json_data: dict, current_day: date) -> None:
+    def __init__(
+            self, initial_json_data: dict, current_day: date,
+            lazy: bool = False, trusted: bool = False) -> None:
         if not isinstance(current_day, date):
             raise TypeError("Current day must be an instance of date class")
         self.current_day = current_day
@@ -30,7 +35,7 @@ class PoolModel:
             raise ValueError("Lanes amount must be at least 3.")
 
         self.price_list_model = PriceListModel(
-            self.working_hours, initial_json_data["price_list"])
+            self.working_hours, initial_json_data["price_list"], trusted)
 
         reservations = None
 
@@ -38,7 +43,31 @@ class PoolModel:
             reservations = initial_json_data["reservations"]
 
         self.reservation_system_model = ReservationSystemModel(
-            self, reservations)
+            self, reservations, lazy=lazy, trusted=trusted,
+            next_id=initial_json_data.get("next_reservation_id", 0))
+
+    def set_price_list(self, pricing_json: list) -> None:
+        """
+        Replaces the price list with the JSON-formatted list of
+        PriceListPosition objects. Prices of the already made reservations
+        don't change.
+        """
+
+        price_list_model = PriceListModel(self.working_hours, pricing_json)
+
+        self.price_list_model = price_list_model
+        self.reservation_system_model.set_price_list_model(price_list_model)
+
+    def set_current_day(self, current_day: date) -> None:
+        """
+        Sets the current day for a given value.
+        """
+
+        if not isinstance(current_day, date):
+            raise TypeError("Current day must be an instance of date class")
+
+        self.current_day = current_day
+        self.reservation_system_model.set_current_day(current_day)
 
     @staticmethod
     def to_json(object) -> dict:
@@ -47,6 +76,19 @@ class PoolModel:
         and returns it.
         """
 
+        json_dict = PoolModel.metadata_to_json(object)
+        json_dict["reservations"] = (
+            object.reservation_system_model.reservations_to_json())
+
+        return json_dict
+
+    @staticmethod
+    def metadata_to_json(object) -> dict:
+        """
+        Converts pool's data of a PoolModel object (everything except
+        the reservations) to the JSON-formatted dictionary and returns it.
+        """
+
         json_dict = {}
 
         json_dict["name"] = object.name
@@ -61,8 +103,8 @@ class PoolModel:
         json_dict["lanes_amount"] = object.lanes_amount
         json_dict["price_list"] = PriceListModel.to_json(
             object.price_list_model.get_pricing())
-        json_dict["reservations"] = ReservationSystemModel.to_json(
-            object.reservation_system_model.reservations)
+        json_dict["next_reservation_id"] = (
+            object.reservation_system_model.next_id)
 
         return json_dict
 
@@ -88,7 +130,7 @@ class PoolModel:
 
             hours_range = HoursRange.from_json(working_hours_json[day])
 
-            if hours_range.durtation() < timedelta(hours=1):
+            if hours_range.duration_minutes() < 60:
                 raise InvalidWorkingHoursError(
                     "Pool must be open for at least 1 hour.")
 
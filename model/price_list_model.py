@@ -1,6 +1,7 @@
 from exceptions.price_list_exceptions import EmptyPriceListError
 from exceptions.price_list_exceptions import PricingHoursError
 from model.value_types import Price, HoursRange, Services, WeekDay
+from model.occupancy_index import SLOTS_PER_DAY, range_to_slots
 
 
 class PriceListPosition:
@@ -81,16 +82,23 @@ class PriceListModel:
     """
     Represents the price list. Stores a list of PriceListPosition objects.
     Needs to be initialized using a JSON-formatted list of PriceListPosition
-    objects.
+    objects. For every service and week day keeps a table of prefix sums of
+    the hourly prices (in gr) of every 30-minute slot, used for pricing
+    the reservations. If trusted is True, matching the price list with
+    the working hours isn't validated.
     """
 
     def __init__(
         self, working_hours: dict[WeekDay, HoursRange],
-        pricing_json: list
+        pricing_json: list, trusted: bool = False
     ) -> None:
 
         self._pricing = PriceListModel.from_json(pricing_json)
-        self._price_list_validation(working_hours)
+
+        if not trusted:
+            self._price_list_validation(working_hours)
+
+        self._tariffs = self._create_tariff_tables()
 
     def get_pricing(self, service: Services = None) -> list[PriceListPosition]:
         """
@@ -110,6 +118,22 @@ class PriceListModel:
 
         return filtered_positions
 
+    def calculate_price(
+        self, service: Services, day: WeekDay, hours_range: HoursRange
+    ) -> Price:
+        """
+        Calculates and returns the price of a reservation of the given
+        service made for the given week day and hours range.
+        """
+
+        prefix_sums = self._tariffs[(Services(service), WeekDay(day))]
+        slots = range_to_slots(hours_range)
+
+        # Every slot costs a half of the hourly price
+
+        total_gr = (prefix_sums[slots.stop] - prefix_sums[slots.start]) // 2
+        return Price.from_total_gr(total_gr)
+
     @staticmethod
     def from_json(pricing_json: list) -> list[PriceListPosition]:
         """
@@ -160,11 +184,11 @@ class PriceListModel:
         sorted_ind_pricing = sorted(
             ind_pricing,
             key=lambda price_pos: (
-                price_pos.day.value, price_pos.hours_range.begin))
+                price_pos.day.value, price_pos.hours_range.begin_minutes))
         sorted_school_pricing = sorted(
             school_pricing,
             key=lambda price_pos: (
-                price_pos.day.value, price_pos.hours_range.begin))
+                price_pos.day.value, price_pos.hours_range.begin_minutes))
 
         # 3. Initialize dictionaries, that to every day assign connected
         # hour ranges of the pricing (will throw an exception if hours are
@@ -193,3 +217,35 @@ class PriceListModel:
 
         if ind_hours != working_hours or school_hours != working_hours:
             raise PricingHoursError("Pricing hours don't match working hours.")
+
+    def _create_tariff_tables(self) -> dict[tuple, list[int]]:
+        """
+        Creates and returns a dictionary, that to every pair of service and
+        week day assigns prefix sums of the hourly prices (in gr) of
+        the consecutive 30-minute slots of the day.
+        """
+
+        slot_prices = {}
+
+        for position in self._pricing:
+            key = (position.service, position.day)
+
+            if key not in slot_prices:
+                slot_prices[key] = [0] * SLOTS_PER_DAY
+
+            price_gr = position.price.get_total_gr()
+
+            for slot in range_to_slots(position.hours_range):
+                slot_prices[key][slot] = price_gr
+
+        tariffs = {}
+
+        for key, prices in slot_prices.items():
+            prefix_sums = [0]
+
+            for price_gr in prices:
+                prefix_sums.append(prefix_sums[-1] + price_gr)
+
+            tariffs[key] = prefix_sums
+
+        return tariffs
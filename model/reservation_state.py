@@ -0,0 +1,153 @@
+from datetime import date
+from model.value_types import Price
+
+
+class ReservationState:
+    """
+    Immutable state of the reservations, which maps every year to a map of
+    its months, every month to a map of its dates and every date to the tuple
+    of its reservations. Adding or removing a reservation returns a new
+    state, which copies only the changed day and the maps on the path to it
+    (of at most 31 dates, 12 months and all years), sharing everything else
+    with the previous state. Readers can keep and iterate a state without
+    any locking, while the writers publish the new ones.
+    """
+
+    __slots__ = ("_years", "_length")
+
+    def __init__(self, years: dict = None, length: int = 0) -> None:
+        self._years = {} if years is None else years
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        for year in sorted(self._years):
+            for month in sorted(self._years[year]):
+                days = self._years[year][month]
+
+                for day in sorted(days):
+                    yield from days[day]
+
+    @staticmethod
+    def from_reservations(reservations: list):
+        """
+        Creates and returns the ReservationState object of the given
+        reservations.
+        """
+
+        years = {}
+
+        for reservation in reservations:
+            day = reservation.date
+            months = years.setdefault(day.year, {})
+            days = months.setdefault(day.month, {})
+            days[day] = days.get(day, ()) + (reservation,)
+
+        return ReservationState(years, len(reservations))
+
+    def get_day(self, day: date) -> tuple:
+        """
+        Returns the tuple of reservations made for the given day.
+        """
+
+        days = self._years.get(day.year, {}).get(day.month)
+
+        if days is None:
+            return ()
+
+        return days.get(day, ())
+
+    def dates(self) -> list[date]:
+        """
+        Returns the sorted list of dates, which have any reservations.
+        """
+
+        return sorted(
+            day for months in self._years.values()
+            for days in months.values() for day in days)
+
+    def between(self, begin_date: date, end_date: date):
+        """
+        Yields the reservations made for the days between the given dates
+        (including both of them) ordered by the date.
+        """
+
+        begin_month = (begin_date.year, begin_date.month)
+        end_month = (end_date.year, end_date.month)
+
+        for year in sorted(self._years):
+            if not begin_date.year <= year <= end_date.year:
+                continue
+
+            for month in sorted(self._years[year]):
+                if not begin_month <= (year, month) <= end_month:
+                    continue
+
+                days = self._years[year][month]
+
+                for day in sorted(days):
+                    if begin_date <= day <= end_date:
+                        yield from days[day]
+
+    def calculate_total_income(self, day: date) -> Price:
+        """
+        Returns a Price object representing total income from the reservations
+        of the given day.
+        """
+
+        return Price.sum(
+            reservation.price for reservation in self.get_day(day))
+
+    def with_added(self, reservation):
+        """
+        Returns a new ReservationState object with the given reservation
+        added.
+        """
+
+        day = reservation.date
+        return self._with_day(day, self.get_day(day) + (reservation,), 1)
+
+    def with_removed(self, reservation):
+        """
+        Returns a new ReservationState object without the given reservation
+        (compared by identity).
+        """
+
+        reservations = self.get_day(reservation.date)
+
+        for index, other in enumerate(reservations):
+            if other is reservation:
+                return self._with_day(
+                    reservation.date,
+                    reservations[:index] + reservations[index + 1:], -1)
+
+        raise ValueError("There's no such reservation.")
+
+    def _with_day(self, day: date, reservations: tuple, change: int):
+        """
+        Returns a new ReservationState object with the reservations of
+        the given day replaced.
+        """
+
+        years = dict(self._years)
+        months = dict(years.get(day.year, {}))
+        days = dict(months.get(day.month, {}))
+
+        if reservations:
+            days[day] = reservations
+        else:
+            del days[day]
+
+        if days:
+            months[day.month] = days
+        else:
+            del months[day.month]
+
+        if months:
+            years[day.year] = months
+        else:
+            del years[day.year]
+
+        return ReservationState(years, self._length + change)
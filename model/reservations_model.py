@@ -2,22 +2,37 @@ from exceptions.reservation_exceptions import InvalidLaneError
 from exceptions.reservation_exceptions import ReservationDurationError
 from exceptions.reservation_exceptions import ReservationTimeTakenError
 from model.value_types import Services, HoursRange, Price, WeekDay
+from model.occupancy_index import OccupancyIndex, DayOccupancy
+from model.occupancy_index import SLOT_MINUTES, SLOTS_PER_DAY
+from model.occupancy_index import SlotAvailability
+from model.occupancy_index import range_to_slots, slot_to_time
+from model.day_grid import DayGridEngine, is_day_grid_available
+from model.reservation_state import ReservationState
 from datetime import date, timedelta, datetime
+from itertools import chain, islice
+import threading
+
+
+TICKETS_PER_LANE = 5
+SCHOOL_LANES_LIMIT = .35
+PROPOSAL_HORIZON_DAYS = 365
 
 
 class Reservation:
     """
     Represents a single reservation for individual client. Stores information
-    about reservation date, hours range and reservation cost.
+    about reservation date, hours range and reservation cost. The ID is
+    given by the reservation system, once the reservation is added to it.
     """
 
     def __init__(
-            self, date: date,
-            hours_range: HoursRange, price: Price) -> None:
+            self, date: date, hours_range: HoursRange, price: Price,
+            reservation_id: int = None) -> None:
 
-        self._data_validation(date, hours_range, price)
+        self._data_validation(date, hours_range, price, reservation_id)
         self._validate_hours_range(hours_range)
 
+        self.id = reservation_id
         self.date = date
         self.hours_range = hours_range
         self.price = price
@@ -63,16 +78,21 @@ class Reservation:
         and returns it.
         """
 
-        date_dict = json_dict["date"]
-        day = date_dict["day"]
-        month = date_dict["month"]
-        year = date_dict["year"]
-
-        imported_date = date(year, month, day)
+        imported_date = Reservation.from_json_date(json_dict["date"])
         hours_range = HoursRange.from_json(json_dict["hours_range"])
         price = Price.from_json(json_dict["price"])
 
-        return Reservation(imported_date, hours_range, price)
+        return Reservation(
+            imported_date, hours_range, price, json_dict.get("id"))
+
+    @staticmethod
+    def from_json_date(date_dict: dict) -> date:
+        """
+        Converts a JSON-formatted dictionary to the date object
+        and returns it.
+        """
+
+        return date(date_dict["year"], date_dict["month"], date_dict["day"])
 
     @staticmethod
     def to_json(object) -> dict:
@@ -84,6 +104,9 @@ class Reservation:
         json_dict = {}
         date_dict = {}
 
+        if object.id is not None:
+            json_dict["id"] = object.id
+
         date_dict["day"] = object.date.day
         date_dict["month"] = object.date.month
         date_dict["year"] = object.date.year
@@ -96,7 +119,8 @@ class Reservation:
         return json_dict
 
     def _data_validation(
-        self, day: date, hours_range: HoursRange, price: Price
+        self, day: date, hours_range: HoursRange, price: Price,
+        reservation_id: int = None
     ) -> None:
         """
         Validates reservation initial data and throws proper exceptions if the
@@ -112,13 +136,17 @@ class Reservation:
         if not isinstance(price, Price):
             raise TypeError("Price must be an instance of Price.")
 
+        if reservation_id is not None and not str(reservation_id).isdigit():
+            raise ValueError(
+                "Reservation ID must be a number greater or equal 0.")
+
     def _validate_hours_range(self, hours_range: HoursRange) -> None:
         """
         Validates the reservation duration and throws an exception, if the
         reservation is less than 1 hour long.
         """
 
-        if hours_range.durtation() < timedelta(hours=1):
+        if hours_range.duration_minutes() < 60:
             raise ReservationDurationError(
                 "Reservation must be at least 1 hour long.")
 
@@ -130,14 +158,14 @@ class SchoolReservation(Reservation):
     """
 
     def __init__(
-            self, lane: int,
-            date: date, hours_range: HoursRange, price: Price) -> None:
+            self, lane: int, date: date, hours_range: HoursRange,
+            price: Price, reservation_id: int = None) -> None:
 
         if not str(lane).isdigit():
             raise InvalidLaneError("Lane must be a number greater or equal 0.")
 
         self.lane = lane
-        super().__init__(date, hours_range, price)
+        super().__init__(date, hours_range, price, reservation_id)
 
     def __str__(self) -> str:
         hours_str = str(self.hours_range)
@@ -164,7 +192,8 @@ class SchoolReservation(Reservation):
         base = Reservation.from_json(json_dict)
         lane = json_dict["lane"]
 
-        return SchoolReservation(lane, base.date, base.hours_range, base.price)
+        return SchoolReservation(
+            lane, base.date, base.hours_range, base.price, base.id)
 
     @staticmethod
     def to_json(object) -> dict:
@@ -176,6 +205,9 @@ class SchoolReservation(Reservation):
         json_dict = {}
         base_dict = Reservation.to_json(object)
 
+        if "id" in base_dict:
+            json_dict["id"] = base_dict["id"]
+
         json_dict["lane"] = object.lane
         json_dict["date"] = base_dict["date"]
         json_dict["hours_range"] = base_dict["hours_range"]
@@ -187,39 +219,247 @@ class SchoolReservation(Reservation):
 
 class ReservationSystemModel:
     """
-    Represents the reservation system of the pool. Stores the list of
-    all reservations. Provides adding new reservations, calculating total
-    income and more. Must be initialized with given PoolModel and optionally
-    with JSON-formatted reservations list which should be initially added.
+    Represents the reservation system of the pool. Stores all reservations
+    by their unique IDs, which are given to the reservations once they're
+    added and kept in the JSON-formatted reservations. Provides adding new
+    reservations, calculating total income and more. Must be initialized
+    with given PoolModel and optionally with JSON-formatted reservations list
+    which should be initially added.
+    Keeps a per-date occupancy index of the reservations, which is used to
+    answer the availability queries. If NumPy is installed and use_day_grid
+    is True, the reservation rules are evaluated by the DayGridEngine.
+    IDs of the reservations saved elsewhere (e.g. in the partitions which
+    weren't loaded) are not given again, as long as next_id is greater than
+    them. Proposals of a new reservation time are searched for at most
+    proposal_horizon_days days after the requested date. If lazy is True,
+    only the reservations of the current day or later are created, while
+    the past ones are kept as JSON-formatted records and decoded only when
+    they are requested. If trusted is True, reservations are created
+    without validating them (used for the files written by PoolTool itself).
+    The model can be shared between threads: reservations made for
+    the same date are validated and added one at a time, while
+    the reservations of different dates are handled in parallel.
+    Availability queries read the index of a date with its lock held. Readers
+    can get an immutable snapshot of the reservations, which isn't affected
+    by further changes.
     """
 
     def __init__(
-            self, pool_model, reservations_json: list = None) -> None:
+            self, pool_model, reservations_json: list = None,
+            use_day_grid: bool = True,
+            proposal_horizon_days: int = PROPOSAL_HORIZON_DAYS,
+            lazy: bool = False, trusted: bool = False,
+            next_id: int = 0) -> None:
 
-        self.reservations = self._create_reservations_list_from_json(
-            reservations_json)
-        self._price_list = pool_model.price_list_model.get_pricing()
         self._current_day = pool_model.current_day
+        self._next_id = next_id
+        self._past_records = {}
+        self._dirty_months = set()
+        self._date_locks = {}
+        self._locks_guard = threading.Lock()
+        self._reservations_lock = threading.Lock()
+
+        past_records = []
+
+        if lazy and reservations_json is not None:
+            past_records, reservations_json = self._split_past_records(
+                reservations_json)
+
+        reservations = self._create_reservations_list_from_json(
+            reservations_json, trusted)
+        self._reservations = self._create_reservations_store(
+            reservations, past_records)
+        self._occupancy = OccupancyIndex(reservations)
+        self._state = ReservationState.from_reservations(reservations)
+        self._price_list_model = pool_model.price_list_model
         self._lanes_amount = pool_model.lanes_amount
         self._woring_hours = pool_model.working_hours
+        self._working_slots = {
+            day: range_to_slots(hours)
+            for day, hours in self._woring_hours.items()}
+        self._proposal_horizon_days = proposal_horizon_days
+
+        self._day_grid = None
+
+        if use_day_grid and is_day_grid_available():
+            self._day_grid = DayGridEngine(
+                self._lanes_amount, TICKETS_PER_LANE, SCHOOL_LANES_LIMIT,
+                reservations)
+
+    def __len__(self) -> int:
+        return len(self._reservations) + len(self._past_records)
+
+    @property
+    def next_id(self) -> int:
+        """
+        Returns the ID, which will be given to the next added reservation.
+        """
+        return self._next_id
+
+    @property
+    def reservations(self) -> list[Reservation]:
+        """
+        Returns the list of reservations (not including the past records)
+        ordered by date and then in the order they were added. The list is
+        built from the immutable snapshot, so it doesn't stop
+        the reservations from being changed.
+        """
+        return list(self._state)
 
     def get_reservations(self, service: Services = None) -> list[Reservation]:
         """
         Returns the list of reservations. If the service is given, returns only
-        reservations for individuals of swimming schools.
+        reservations for individuals of swimming schools. Past reservations
+        which weren't created while loading are decoded and included. Like
+        the reservations property, doesn't stop the reservations from being
+        changed.
         """
 
         if service is None:
-            return self.reservations
+            return list(self.past_reservations()) + self.reservations
         else:
             reservations_to_return = []
 
-            for reservation in self.reservations:
+            for reservation in self.past_reservations():
+                if reservation.get_service() == service:
+                    reservations_to_return.append(reservation)
+
+            for reservation in self._state:
                 if reservation.get_service() == service:
                     reservations_to_return.append(reservation)
 
             return reservations_to_return
 
+    def iter_reservations(
+            self, service: Services = None, begin_date: date = None,
+            end_date: date = None, lane: int = None, offset: int = 0,
+            limit: int = None):
+        """
+        Returns an iterator of the reservations matching all given filters:
+        the service, the days between the given dates (including both of
+        them) and the lane. Skips the first offset matching reservations and
+        yields at most limit of them. Past records go first and are decoded
+        only if they're yielded, the other reservations are ordered by date.
+        """
+
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("Offset and limit cannot be negative.")
+
+        if service is not None:
+            service = Services(service)
+
+        begin_date = date.min if begin_date is None else begin_date
+        end_date = date.max if end_date is None else end_date
+
+        def matches(reservation_date: date, reservation_service: Services,
+                    reservation_lane: int) -> bool:
+            return (
+                begin_date <= reservation_date <= end_date
+                and (service is None or reservation_service == service)
+                and (lane is None or reservation_lane == lane))
+
+        # Past records are filtered and skipped as JSON-formatted records
+
+        past_records = (
+            record for record in self._past_records.values()
+            if matches(
+                Reservation.from_json_date(record["date"]),
+                Services(record["service"]), record.get("lane")))
+
+        reservations = (
+            reservation for reservation in self._state.between(
+                begin_date, end_date)
+            if matches(
+                reservation.date, reservation.get_service(),
+                getattr(reservation, "lane", None)))
+
+        def decode(reservation):
+            if isinstance(reservation, dict):
+                return ReservationSystemModel.reservation_from_json(
+                    reservation)
+
+            return reservation
+
+        stop = None if limit is None else offset + limit
+        return map(decode, islice(
+            chain(past_records, reservations), offset, stop))
+
+    def past_reservations(self):
+        """
+        Yields the past reservations, which were kept as JSON-formatted
+        records while loading, decoding them one at a time.
+        """
+
+        for record in self._past_records.values():
+            yield ReservationSystemModel.reservation_from_json(record)
+
+    def reservations_to_json(self, months: set = None) -> list:
+        """
+        Converts all reservations (including the past records, which are
+        exported without decoding) to the JSON-formatted list and returns it.
+        If the set of (year, month) tuples is given, converts only
+        the reservations made for these months.
+        """
+
+        if months is None:
+            records = list(self._past_records.values())
+            return records + ReservationSystemModel.to_json(self.reservations)
+
+        records = [
+            record for record in self._past_records.values()
+            if (record["date"]["year"], record["date"]["month"]) in months]
+
+        return records + ReservationSystemModel.to_json([
+            reservation for reservation in self.reservations
+            if (reservation.date.year, reservation.date.month) in months])
+
+    def set_price_list_model(self, price_list_model) -> None:
+        """
+        Sets the price list used for pricing new reservations.
+        """
+
+        self._price_list_model = price_list_model
+
+    def set_current_day(self, current_day: date) -> None:
+        """
+        Sets the current day for a given value.
+        """
+
+        self._current_day = current_day
+
+    def set_next_id(self, next_id: int) -> None:
+        """
+        Sets the ID given to the next added reservation, unless it's lower
+        than the current one (so no ID is given twice).
+        """
+
+        with self._reservations_lock:
+            self._next_id = max(self._next_id, next_id)
+
+    def snapshot(self) -> ReservationState:
+        """
+        Returns the immutable snapshot of the current reservations (not
+        including the past records), which can be read without locking
+        while the reservations are changed.
+        """
+
+        return self._state
+
+    @property
+    def dirty_months(self) -> set:
+        """
+        Returns the set of (year, month) tuples of the months whose
+        reservations were changed since the last clear_dirty_months() call.
+        """
+        return set(self._dirty_months)
+
+    def clear_dirty_months(self) -> None:
+        """
+        Marks reservations of all months as saved.
+        """
+
+        self._dirty_months.clear()
+
     def add_reservation(
             self, service: Services, date: date,
             hours_range: HoursRange, lane: int = None) -> Reservation:
@@ -229,6 +469,22 @@ class ReservationSystemModel:
         school.
         """
 
+        # Validation and adding the reservation must not be interleaved with
+        # other changes of the same date. Lanes of a single date can't be
+        # locked separately, as lanes limit for schools and tickets amount
+        # for individuals depend on all lanes of the date
+
+        with self._get_date_lock(date):
+            return self._add_reservation(service, date, hours_range, lane)
+
+    def _add_reservation(
+            self, service: Services, date: date,
+            hours_range: HoursRange, lane: int = None) -> Reservation:
+        """
+        Validates and adds new reservation and returns it. Must be called
+        with the lock of the reservation date acquired.
+        """
+
         # If a reservation can't be added due to the availability,
         # propose the closest possible date and time and pass
         # the raised exception. Otherwise pass other exceptions which occurred
@@ -239,6 +495,13 @@ class ReservationSystemModel:
             proposed_date = self._propose_new_date(
                 date, hours_range, service, lane)
 
+            if proposed_date is None:
+                raise ReservationTimeTakenError(
+                    None, f"""Given time for the reservation is not
+                    available. There's no possible reservation time under
+                    the same conditions within
+                    {self._proposal_horizon_days} days.""")
+
             raise ReservationTimeTakenError(
                 proposed_date, f"""Given time for the reservation is not
                 available. Closest possible reservation time under the same
@@ -256,18 +519,121 @@ class ReservationSystemModel:
         else:
             reservation = SchoolReservation(lane, date, hours_range, price)
 
-        self.reservations.append(reservation)
+        self.insert_reservation(reservation)
         return reservation
 
+    def insert_reservation(self, reservation: Reservation) -> None:
+        """
+        Adds the given reservation without validating it or calculating its
+        price. Used for restoring previously saved reservations. Gives
+        the reservation the next free ID, if it has none yet.
+        """
+
+        with self._get_date_lock(reservation.date):
+            with self._reservations_lock:
+                if reservation.id is None:
+                    reservation.id = self._next_id
+                elif reservation.id in self._reservations:
+                    raise ValueError(
+                        "There's already a reservation with the given ID.")
+
+                self._next_id = max(self._next_id, reservation.id + 1)
+                self._reservations[reservation.id] = reservation
+                self._state = self._state.with_added(reservation)
+
+            self._occupancy.add(reservation)
+            self._dirty_months.add(
+                (reservation.date.year, reservation.date.month))
+
+            if self._day_grid is not None:
+                self._day_grid.add(reservation)
+
+    def get_reservation(self, reservation_id: int) -> Reservation:
+        """
+        Returns the reservation (or decoded past record) with the given ID.
+        """
+
+        reservation = self._reservations.get(reservation_id)
+
+        if reservation is not None:
+            return reservation
+
+        record = self._past_records.get(reservation_id)
+
+        if record is None:
+            raise ValueError("There's no reservation with the given ID.")
+
+        return ReservationSystemModel.reservation_from_json(record)
+
+    def find_reservation(self, reservation_json: dict) -> int:
+        """
+        Returns the ID of the reservation equal to the given JSON-formatted
+        reservation.
+        """
+
+        # Reservations saved without the ID are searched for among
+        # the reservations of the same day
+
+        reservation = self._reservations.get(reservation_json.get("id"))
+
+        if reservation is None:
+            reservation_date = Reservation.from_json_date(
+                reservation_json["date"])
+            reservations = self._state.get_day(reservation_date)
+        else:
+            reservations = (reservation,)
+
+        for reservation in reservations:
+            reservation_dict = ReservationSystemModel.reservation_to_json(
+                reservation)
+
+            if "id" not in reservation_json:
+                reservation_dict.pop("id")
+
+            if reservation_dict == reservation_json:
+                return reservation.id
+
+        raise ValueError("There's no such reservation.")
+
+    def remove_matching_reservation(self, reservation_json: dict) -> None:
+        """
+        Removes the reservation (or past record) equal to the given
+        JSON-formatted reservation.
+        """
+
+        with self._reservations_lock:
+            record_id = self._find_past_record(reservation_json)
+
+            if record_id is not None:
+                self._remove_past_record(record_id)
+                return
+
+            reservation = self._reservations.pop(
+                self.find_reservation(reservation_json))
+            self._state = self._state.with_removed(reservation)
+
+        self._remove_from_indexes(reservation)
+
     def remove_reservation(self, reservation_id: int) -> Reservation:
         """
-        Removes a reservation with the given ID and returns it.
+        Removes a reservation (or past record) with the given ID and returns
+        it.
         """
 
-        if reservation_id not in range(len(self.reservations)):
-            raise ValueError("Given reservation ID is out of range.")
+        with self._reservations_lock:
+            if reservation_id in self._past_records:
+                return ReservationSystemModel.reservation_from_json(
+                    self._remove_past_record(reservation_id))
+
+            reservation = self._reservations.pop(reservation_id, None)
+
+            if reservation is None:
+                raise ValueError("There's no reservation with the given ID.")
 
-        return self.reservations.pop(reservation_id)
+            self._state = self._state.with_removed(reservation)
+
+        self._remove_from_indexes(reservation)
+        return reservation
 
     def calculate_total_income(self) -> Price:
         """
@@ -275,13 +641,7 @@ class ReservationSystemModel:
         of the current day.
         """
 
-        total_income = Price(0, 0)
-
-        for reservation in self.reservations:
-            if reservation.date == self._current_day:
-                total_income += reservation.price
-
-        return total_income
+        return self._state.calculate_total_income(self._current_day)
 
     def available_lanes(self, date_time: datetime) -> list[int]:
         """
@@ -291,24 +651,75 @@ class ReservationSystemModel:
         if date_time.date() < self._current_day:
             raise ValueError("Given day cannot be earlier than current day.")
 
-        lanes = list(range(self._lanes_amount))
+        with self._get_date_lock(date_time.date()):
+            taken_lanes = self._occupancy.taken_lanes(date_time)
 
-        for reservation in self.reservations:
-            if isinstance(reservation, SchoolReservation):
-                if (reservation.is_in_datetime(date_time, False)
-                        and reservation.lane in lanes):
-                    lanes.remove(reservation.lane)
-
-        return lanes
+        return [
+            lane for lane in range(self._lanes_amount)
+            if lane not in taken_lanes]
 
     def available_tickets(self, date_time: datetime) -> int:
         """
         Returns the amount of available tickets for the given datetime.
         """
 
-        total_tickets = 5 * len(self.available_lanes(date_time))
-        return total_tickets - self.reservations_amount(
-            Services.INDIVIDUAL, date_time)
+        # Both amounts must come from the same state of the day
+
+        with self._get_date_lock(date_time.date()):
+            total_tickets = TICKETS_PER_LANE * len(
+                self.available_lanes(date_time))
+            return total_tickets - self.reservations_amount(
+                Services.INDIVIDUAL, date_time)
+
+    def day_availability(self, day: date) -> list[SlotAvailability]:
+        """
+        Returns the list of SlotAvailability objects (hours range, list of
+        available lanes and amount of available tickets) of every 30-minute
+        slot of the given day's working hours. The list is empty, if the pool
+        is closed on that day.
+        """
+
+        return self.availability_calendar(day, day)[day]
+
+    def availability_calendar(
+            self, begin_date: date,
+            end_date: date) -> dict[date, list[SlotAvailability]]:
+        """
+        Returns a dictionary mapping every day between the given dates
+        (including both of them) to the list of SlotAvailability objects of
+        its working hours (empty for closed days). Availability of all days
+        is computed at once, using the DayGridEngine if it's enabled.
+        """
+
+        if begin_date < self._current_day:
+            raise ValueError("Given day cannot be earlier than current day.")
+
+        if end_date < begin_date:
+            raise ValueError("End date cannot be earlier than begin date.")
+
+        days = [
+            begin_date + timedelta(days=days)
+            for days in range((end_date - begin_date).days + 1)]
+        open_days = [
+            day for day in days
+            if WeekDay(day.weekday()) in self._working_slots]
+
+        if self._day_grid is not None:
+            days_availability = self._day_grid.days_availability(open_days)
+        else:
+            days_availability = self._days_availability(open_days)
+
+        calendar = {day: [] for day in days}
+
+        for day, (lanes, tickets) in zip(open_days, days_availability):
+            calendar[day] = [
+                SlotAvailability(
+                    HoursRange.from_minutes(
+                        slot * SLOT_MINUTES, (slot + 1) * SLOT_MINUTES),
+                    lanes[slot], tickets[slot])
+                for slot in self._working_slots[WeekDay(day.weekday())]]
+
+        return calendar
 
     def is_lane_taken(self, lane: int, date_time: datetime) -> bool:
         """
@@ -322,13 +733,8 @@ class ReservationSystemModel:
             raise InvalidLaneError(
                 "Lane number must be between 0 and last lane ID.")
 
-        for reservation in self.reservations:
-            if isinstance(reservation, SchoolReservation):
-                if (reservation.is_in_datetime(date_time, False)
-                        and reservation.lane == lane):
-                    return True
-
-        return False
+        with self._get_date_lock(date_time.date()):
+            return lane in self._occupancy.taken_lanes(date_time)
 
     def reservations_amount(
         self, service: Services, date_time: datetime
@@ -341,14 +747,11 @@ class ReservationSystemModel:
         if date_time.date() < self._current_day:
             raise ValueError("Given day cannot be earlier than current day.")
 
-        amount = 0
-
-        for reservation in self.reservations:
-            if reservation.is_in_datetime(date_time, False):
-                if reservation.get_service() == Services(service):
-                    amount += 1
+        with self._get_date_lock(date_time.date()):
+            if Services(service) == Services.INDIVIDUAL:
+                return self._occupancy.individual_amount(date_time)
 
-        return amount
+            return self._occupancy.school_amount(date_time)
 
     @staticmethod
     def to_json(reservations_list: list[Reservation]) -> list:
@@ -360,56 +763,52 @@ class ReservationSystemModel:
         json_list = []
 
         for reservation in reservations_list:
-            if isinstance(reservation, SchoolReservation):
-                json_list.append(SchoolReservation.to_json(reservation))
-            elif isinstance(reservation, Reservation):
-                json_list.append(Reservation.to_json(reservation))
+            if isinstance(reservation, Reservation):
+                json_list.append(
+                    ReservationSystemModel.reservation_to_json(reservation))
 
         return json_list
 
-    def _calculate_reservation_price(
-            self, date: date, hours_range: HoursRange,
-            service: Services) -> Price:
+    @staticmethod
+    def reservation_to_json(reservation: Reservation) -> dict:
         """
-        Calculates the price of the reservation to be added
-        (based on the price list) and returns it.
+        Converts a Reservation or SchoolReservation object to the
+        JSON-formatted dictionary and returns it.
         """
 
-        # 1. Selecting those PriceListPosition objects, that belong to the
-        # particular reservation
+        if isinstance(reservation, SchoolReservation):
+            return SchoolReservation.to_json(reservation)
 
-        day = WeekDay(date.weekday())
-        positions = []
+        return Reservation.to_json(reservation)
 
-        for position in self._price_list:
-            if (hours_range.check_intersection(position.hours_range)
-                    and position.day == day and position.service == service):
-                positions.append(position)
-
-        # 2. Adding parts of the price based on the reservation price for the
-        # particular hour
-
-        reservation_total_gr = 0
-        current_time = hours_range.begin
-
-        while current_time < hours_range.end:
-            current_begin = current_time
+    @staticmethod
+    def reservation_from_json(
+            reservation_json: dict, trusted: bool = False) -> Reservation:
+        """
+        Converts a JSON-formatted dictionary to the Reservation or
+        SchoolReservation object, depending on its service, and returns it.
+        If trusted is True, the object is created without validating it.
+        """
 
-            dt = datetime.combine(date, current_time)
-            dt += timedelta(minutes=30)
-            current_time = dt.time()
+        if trusted:
+            return ReservationSystemModel._trusted_reservation_from_json(
+                reservation_json)
 
-            current_range = HoursRange(current_begin, current_time)
+        if reservation_json["service"] == 0:
+            return Reservation.from_json(reservation_json)
 
-            for position in positions:
-                if current_range.check_intersection(position.hours_range):
-                    current_position = position
-                    break
+        return SchoolReservation.from_json(reservation_json)
 
-            reservation_total_gr += current_position.price.get_total_gr() / 2
+    def _calculate_reservation_price(
+            self, date: date, hours_range: HoursRange,
+            service: Services) -> Price:
+        """
+        Calculates the price of the reservation to be added
+        (based on the price list) and returns it.
+        """
 
-        return Price(
-            int(reservation_total_gr // 100), int(reservation_total_gr % 100))
+        return self._price_list_model.calculate_price(
+            service, WeekDay(date.weekday()), hours_range)
 
     def _validate_reservation(
             self, date: date, hours_range: HoursRange,
@@ -440,9 +839,15 @@ class ReservationSystemModel:
                 and available_hours.is_in_range(end)):
             raise ValueError("Reservation time must fit working hours.")
 
-        # 3. Check if the lane isn't greater than the amount of lanes
+        # 3. Check if the school reservation has the lane and if it isn't
+        # greater than the amount of lanes
+
+        if service == Services.SWIMMING_SCHOOL and lane is None:
+            raise InvalidLaneError(
+                "Lane must be given for swimming school reservation.")
 
-        if lane is not None and (int(lane) >= self._lanes_amount):
+        if lane is not None and (
+                int(lane) not in range(self._lanes_amount)):
             raise InvalidLaneError(
                 "Lane number must be in range of lanes amount.")
 
@@ -458,89 +863,297 @@ class ReservationSystemModel:
             date: date, service: Services, lane: int) -> bool:
         """
         Returns True if the given time for the reservation to be added
-        is available.
+        is not available.
+        """
+
+        if self._day_grid is not None:
+            return self._day_grid.check_reservation_intersection(
+                hours_range, date, service != Services.INDIVIDUAL, lane)
+
+        slots = range_to_slots(hours_range)
+        day = self._occupancy.get_day(date)
+
+        # School reservation conflicts with another one made for the same
+        # lane, if their slot intervals overlap
+
+        if (service != Services.INDIVIDUAL and day is not None
+                and day.is_lane_taken(lane, slots)):
+            return True
+
+        return any(self._conflicting_slots(date, slots, service, lane))
+
+    def _conflicting_slots(
+            self, date: date, slots: range,
+            service: Services, lane: int) -> list[bool]:
         """
+        Returns a list telling for every given slot of the given day, if it
+        cannot be taken by the reservation to be added. If the date is None,
+        the slots are checked as if there were no reservations.
+        """
+
+        if self._day_grid is not None:
+            return self._day_grid.conflicting_slots(
+                slots, date, service != Services.INDIVIDUAL, lane)
 
-        current_time = hours_range.begin
+        day = self._occupancy.get_day(date)
 
-        # Algorithm is checking every 30-minutes period of the
-        # reservation from begin to end
+        if day is None:
+            day = DayOccupancy()
 
-        while current_time < hours_range.end:
-            date_time = datetime(
-                date.year, date.month, date.day,
-                current_time.hour, current_time.minute)
+        conflicts = []
+
+        for slot in slots:
+            available_lanes = self._lanes_amount - day.taken_lanes_amount(
+                slot, self._lanes_amount)
+            individuals = day.individuals[slot]
 
             if service == Services.INDIVIDUAL:
-                if self.available_tickets(date_time) == 0:
-                    return True
-            else:
-                if self.is_lane_taken(lane, date_time):
-                    return True
+                conflicts.append(
+                    TICKETS_PER_LANE * available_lanes - individuals <= 0)
+                continue
 
-                # Check if lane reservation won't cause the situation, when
-                # in some time number of tickets is below number of
-                # individual reservations
+            # Check if lane reservation won't cause the situation, when
+            # in some time number of tickets is below number of
+            # individual reservations
 
-                new_lanes_amount = len(self.available_lanes(date_time)) - 1
-                if (5 * new_lanes_amount <
-                        self.reservations_amount(
-                            Services.INDIVIDUAL, date_time)):
-                    return True
+            new_lanes_amount = available_lanes - 1
+            overflow = TICKETS_PER_LANE * new_lanes_amount < individuals
 
-                # Check if number of taken lanes isn't over 35% of all lanes
+            # Check if number of taken lanes isn't over 35% of all lanes
 
-                new_lanes_taken = self._lanes_amount - new_lanes_amount
-                if new_lanes_taken > .35 * self._lanes_amount:
-                    return True
+            new_lanes_taken = self._lanes_amount - new_lanes_amount
+            over_limit = (
+                new_lanes_taken > SCHOOL_LANES_LIMIT * self._lanes_amount)
 
-            dt = datetime.combine(date, current_time)
-            dt += timedelta(minutes=30)
-            current_time = dt.time()
+            conflicts.append(
+                lane in day.lanes[slot] or overflow or over_limit)
 
-        return False
+        return conflicts
 
     def _propose_new_date(
             self, date: date, hours_range: HoursRange,
             service: Services, lane: int) -> datetime:
         """
-        Returns the closest available datetime for the reservation to be added.
+        Returns the closest available datetime for the reservation to be added
+        or None, if there's no such datetime within the proposal horizon.
         """
 
-        proposed_datetime = datetime(
-            date.year, date.month, date.day,
-            hours_range.begin.hour, hours_range.begin.minute)
-        expected_duration = hours_range.durtation()
-        date_found = False
+        duration = len(range_to_slots(hours_range))
+        first_slot = range_to_slots(hours_range).start
+
+        # If the reservation doesn't fit a day without any reservations,
+        # it won't fit any other day
+
+        if any(self._conflicting_slots(
+                None, range(duration), service, lane)):
+            return None
 
-        # Algorithm tries to find a fitting reservation under the same
-        # conditions every next 30 minutes
+        for days in range(self._proposal_horizon_days + 1):
+            current_date = date + timedelta(days=days)
+            working_slots = self._working_slots.get(
+                WeekDay(current_date.weekday()))
 
-        while not date_found:
-            new_begin = proposed_datetime.time()
+            # Closed days and days too short for the reservation
+            # are skipped at once
 
-            dt_end = datetime.combine(date, new_begin)
-            dt_end += expected_duration
-            new_end = dt_end.time()
+            if working_slots is None or len(working_slots) < duration:
+                continue
 
-            # Algorithm proceeds until the valid reservation is found
-            # and returns fitting combination of date and time
+            begin_slot = working_slots.start
 
-            try:
-                new_range = HoursRange(new_begin, new_end)
+            if days == 0:
+                begin_slot = max(begin_slot, first_slot)
 
-                self._validate_reservation(
-                    proposed_datetime.date(), new_range, service, lane)
-            except Exception:
-                proposed_datetime += timedelta(minutes=30)
+            if working_slots.stop - begin_slot < duration:
                 continue
 
-            date_found = True
+            if self._occupancy.get_day(current_date) is None:
+                return datetime.combine(current_date, slot_to_time(begin_slot))
+
+            # Algorithm searches the free windows of the day for the first one
+            # long enough to fit the reservation
+
+            conflicts = self._conflicting_slots(
+                current_date, range(begin_slot, working_slots.stop),
+                service, lane)
+            free_slots = 0
+
+            for index, conflict in enumerate(conflicts):
+                free_slots = 0 if conflict else free_slots + 1
+
+                if free_slots == duration:
+                    window_begin = begin_slot + index - duration + 1
+                    return datetime.combine(
+                        current_date, slot_to_time(window_begin))
+
+        return None
+
+    def _get_date_lock(self, day: date) -> threading.RLock:
+        """
+        Returns the lock of the given date, creating it if necessary.
+        """
+
+        with self._locks_guard:
+            lock = self._date_locks.get(day)
+
+            if lock is None:
+                lock = threading.RLock()
+                self._date_locks[day] = lock
 
-        return proposed_datetime
+            return lock
+
+    def _days_availability(self, days: list[date]) -> list[tuple]:
+        """
+        Returns a list of tuples (one for every given day) of the list of
+        available lanes and the list of available tickets amounts for every
+        slot of the day. Taken lanes and individual reservations are counted
+        in a single pass over the reservations of the given days.
+        """
+
+        if not days:
+            return []
+
+        usage = {
+            day: ([set() for _ in range(SLOTS_PER_DAY)], [0] * SLOTS_PER_DAY)
+            for day in days}
+
+        for reservation in self._state.between(days[0], days[-1]):
+            day_usage = usage.get(reservation.date)
+
+            if day_usage is None:
+                continue
+
+            taken_lanes, individuals = day_usage
+            lane = getattr(reservation, "lane", None)
+
+            for slot in range_to_slots(reservation.hours_range):
+                if lane is None:
+                    individuals[slot] += 1
+                else:
+                    taken_lanes[slot].add(lane)
+
+        days_availability = []
+
+        for day in days:
+            taken_lanes, individuals = usage[day]
+            lanes = [
+                [lane for lane in range(self._lanes_amount)
+                 if lane not in taken]
+                for taken in taken_lanes]
+            tickets = [
+                TICKETS_PER_LANE * len(available) - amount
+                for available, amount in zip(lanes, individuals)]
+            days_availability.append((lanes, tickets))
+
+        return days_availability
+
+    def _find_past_record(self, reservation_json: dict) -> int:
+        """
+        Returns the ID of the past record equal to the given JSON-formatted
+        reservation or None, if there's no such record.
+        """
+
+        if "id" in reservation_json:
+            record = self._past_records.get(reservation_json["id"])
+            return None if record != reservation_json else record["id"]
+
+        for record_id, record in self._past_records.items():
+            if {**reservation_json, "id": record_id} == record:
+                return record_id
+
+        return None
+
+    def _remove_past_record(self, record_id: int) -> dict:
+        """
+        Removes the past record with the given ID and returns it. Must be
+        called with the reservations lock acquired.
+        """
+
+        # The records are replaced instead of changed in place, so they can
+        # be iterated without locking. Past records are rarely removed
+
+        past_records = dict(self._past_records)
+        record = past_records.pop(record_id)
+        self._past_records = past_records
+        self._dirty_months.add(
+            (record["date"]["year"], record["date"]["month"]))
+
+        return record
+
+    def _remove_from_indexes(self, reservation: Reservation) -> None:
+        """
+        Removes the reservation, which was already taken off the reservations
+        list, from the occupancy index and the day grid.
+        """
+
+        # Until then, the reservation's time is still seen as taken, so
+        # a concurrent validation can only be more strict
+
+        with self._get_date_lock(reservation.date):
+            self._occupancy.remove(reservation)
+            self._dirty_months.add(
+                (reservation.date.year, reservation.date.month))
+
+            if self._day_grid is not None:
+                self._day_grid.remove(reservation)
+
+    def _create_reservations_store(
+            self, reservations: list, past_records: list) -> dict:
+        """
+        Gives the next free IDs to the given reservations and past records,
+        which were saved without them, keeps the past records by their IDs
+        and returns the dictionary mapping the IDs to the reservations.
+        """
+
+        used_ids = [r.id for r in reservations if r.id is not None] + [
+            record["id"] for record in past_records if "id" in record]
+
+        if len(set(used_ids)) != len(used_ids):
+            raise ValueError("Reservation IDs must be unique.")
+
+        self._next_id = max(self._next_id, max(used_ids, default=-1) + 1)
+
+        for record in past_records:
+            if "id" not in record:
+                record = {"id": self._next_id, **record}
+                self._next_id += 1
+
+            self._past_records[record["id"]] = record
+
+        for reservation in reservations:
+            if reservation.id is None:
+                reservation.id = self._next_id
+                self._next_id += 1
+
+        return {reservation.id: reservation for reservation in reservations}
+
+    def _split_past_records(self, reservations_json: list) -> tuple:
+        """
+        Splits the JSON-formatted reservations into the past records (made
+        for the days before the current day) and the other ones and returns
+        both lists.
+        """
+
+        current_day = (
+            self._current_day.year, self._current_day.month,
+            self._current_day.day)
+        past_records = []
+        upcoming = []
+
+        for reservation in reservations_json:
+            date_dict = reservation["date"]
+            reservation_day = (
+                date_dict["year"], date_dict["month"], date_dict["day"])
+
+            if reservation_day < current_day:
+                past_records.append(reservation)
+            else:
+                upcoming.append(reservation)
+
+        return past_records, upcoming
 
     def _create_reservations_list_from_json(
-        self, reservations_json: list
+        self, reservations_json: list, trusted: bool = False
     ) -> list[Reservation]:
         """
         Creates and returns a list of reservations based on a list of
@@ -551,10 +1164,33 @@ class ReservationSystemModel:
 
         if reservations_json is not None:
             for reservation in reservations_json:
-                if reservation["service"] == 0:
-                    reservations.append(Reservation.from_json(reservation))
-                else:
-                    reservations.append(
-                        SchoolReservation.from_json(reservation))
+                reservations.append(
+                    ReservationSystemModel.reservation_from_json(
+                        reservation, trusted))
 
         return reservations
+
+    @staticmethod
+    def _trusted_reservation_from_json(reservation_json: dict) -> Reservation:
+        """
+        Converts a JSON-formatted dictionary, which is known to be valid, to
+        the Reservation or SchoolReservation object without running any
+        validation and returns it.
+        """
+
+        if reservation_json["service"] == 0:
+            reservation = Reservation.__new__(Reservation)
+        else:
+            reservation = SchoolReservation.__new__(SchoolReservation)
+            reservation.lane = reservation_json["lane"]
+
+        price_json = reservation_json["price"]
+
+        reservation.id = reservation_json.get("id")
+        reservation.date = Reservation.from_json_date(reservation_json["date"])
+        reservation.hours_range = HoursRange.from_json(
+            reservation_json["hours_range"])
+        reservation.price = Price.from_total_gr(
+            price_json["zl"] * 100 + price_json["gr"])
+
+        return reservation
@@ -29,15 +29,16 @@ class WeekDay(Enum):
 
 class Price:
     """
-    A class representing price. Stores information about the amount of zl and
-    gr separately. Provides addition, subtraction, comparison
-    and to-string operations.
+    A class representing price. Stores the total amount of gr as a single
+    integer, while providing the amount of zl and gr separately. Provides
+    addition, subtraction, comparison, hashing and to-string operations.
     """
 
+    __slots__ = ("_total_gr",)
+
     def __init__(self, zl: int, gr: int) -> None:
         self._data_validation(zl, gr)
-        self._zl = zl
-        self._gr = gr
+        self._total_gr = int(zl) * 100 + int(gr)
 
     # Getters
 
@@ -45,80 +46,81 @@ class Price:
         """
         Returns the amount of zl.
         """
-        return self._zl
+        return self._total_gr // 100
 
     def gr(self) -> int:
         """
         Returns the amount of gr.
         """
-        return self._gr
+        return self._total_gr % 100
 
     # Operator overloads
 
     def __add__(self, other):
-        self_total_gr = self.get_total_gr()
-        other_total_gr = self.get_total_gr(other)
-        result_total_gr = self_total_gr + other_total_gr
-        return Price(result_total_gr // 100, result_total_gr % 100)
+        return Price.from_total_gr(self._total_gr + other._total_gr)
 
     def __sub__(self, other):
-        self_total_gr = self.get_total_gr()
-        other_total_gr = self.get_total_gr(other)
-        result_total_gr = self_total_gr - other_total_gr
+        result_total_gr = self._total_gr - other._total_gr
 
         if result_total_gr < 0:
             message = "Result of price subtraction cannot be negative."
             raise NegativePriceError(message)
 
-        return Price(result_total_gr // 100, result_total_gr % 100)
+        return Price.from_total_gr(result_total_gr)
 
     def __eq__(self, other) -> bool:
-        if self._gr == other.gr() and self._zl == other.zl():
-            return True
-        else:
-            return False
+        return self._total_gr == other._total_gr
 
     def __lt__(self, other) -> bool:
-        self_total_gr = self.get_total_gr()
-        other_total_gr = self.get_total_gr(other)
-
-        if self_total_gr < other_total_gr:
-            return True
-        else:
-            return False
+        return self._total_gr < other._total_gr
 
     def __gt__(self, other) -> bool:
-        self_total_gr = self.get_total_gr()
-        other_total_gr = self.get_total_gr(other)
-
-        if self_total_gr > other_total_gr:
-            return True
-        else:
-            return False
+        return self._total_gr > other._total_gr
 
     def __le__(self, other) -> bool:
-        self_total_gr = self.get_total_gr()
-        other_total_gr = self.get_total_gr(other)
-
-        if self_total_gr <= other_total_gr:
-            return True
-        else:
-            return False
+        return self._total_gr <= other._total_gr
 
     def __ge__(self, other) -> bool:
-        self_total_gr = self.get_total_gr()
-        other_total_gr = self.get_total_gr(other)
+        return self._total_gr >= other._total_gr
 
-        if self_total_gr >= other_total_gr:
-            return True
-        else:
-            return False
+    def __hash__(self) -> int:
+        return hash(self._total_gr)
 
     def __str__(self) -> str:
-        return f"{self._zl}.{self._gr:02} zł"
+        return f"{self.zl()}.{self.gr():02} zł"
 
     # Static methods
 
+    @staticmethod
+    def from_total_gr(total_gr: int):
+        """
+        Returns a Price object representing the given total amount of gr.
+        """
+
+        if type(total_gr) is not int:
+            raise TypeError("Total amount of gr must be an integer.")
+
+        if total_gr < 0:
+            raise NegativePriceError("Price attributes cannot be negative")
+
+        price = Price.__new__(Price)
+        price._total_gr = total_gr
+        return price
+
+    @staticmethod
+    def sum(prices):
+        """
+        Returns a Price object representing the sum of the given Price
+        objects. Doesn't create any intermediate Price objects.
+        """
+
+        total_gr = 0
+
+        for price in prices:
+            total_gr += price._total_gr
+
+        return Price.from_total_gr(total_gr)
+
     @staticmethod
     def from_json(json_dict: dict):
         """
@@ -146,14 +148,14 @@ class Price:
 
     def get_total_gr(self, price=None) -> int:
         """
-        Calculates and returns total amount of gr of a Price object.
+        Returns total amount of gr of a Price object.
         If no object is given, returns self total gr.
         """
 
         if price is None:
             price = self
 
-        return price.zl() * 100 + price.gr()
+        return price._total_gr
 
     def _data_validation(self, zl: int, gr: int) -> None:
         """
@@ -161,6 +163,12 @@ class Price:
         data is invalid.
         """
 
+        # Plain, non-negative integers are the most common case,
+        # so they're accepted without any conversions
+
+        if type(zl) is int and type(gr) is int and zl >= 0 and gr >= 0:
+            return
+
         if not (str(zl).isdigit() and str(gr).isdigit()):
             if zl < 0 or gr < 0:
                 raise NegativePriceError("Price attributes cannot be negative")
@@ -171,14 +179,52 @@ class Price:
 class HoursRange:
     """
     A class representing range of hours. Stores information about begin time
-    and end time. Provides addition, comparison and to-string operations.
+    and end time as the amounts of minutes since midnight. Provides addition,
+    comparison, hashing and to-string operations. HoursRange objects are
+    immutable, so equal ranges created with interned() share one object.
     """
 
+    __slots__ = ("_begin_minutes", "_end_minutes")
+
+    _interned = {}
+
     def __init__(self, begin: time, end: time) -> None:
         self._data_validation(begin, end)
 
-        self.begin = begin
-        self.end = end
+        self._begin_minutes = begin.hour * 60 + begin.minute
+        self._end_minutes = end.hour * 60 + end.minute
+
+    # Getters
+
+    @property
+    def begin(self) -> time:
+        """
+        Returns the begin time of the range.
+        """
+        return _HALF_HOURS[self._begin_minutes // 30]
+
+    @property
+    def end(self) -> time:
+        """
+        Returns the end time of the range.
+        """
+        return _HALF_HOURS[self._end_minutes // 30]
+
+    @property
+    def begin_minutes(self) -> int:
+        """
+        Returns the amount of minutes between midnight and the begin time.
+        """
+        return self._begin_minutes
+
+    @property
+    def end_minutes(self) -> int:
+        """
+        Returns the amount of minutes between midnight and the end time.
+        """
+        return self._end_minutes
+
+    # Methods
 
     def is_in_range(self, hour: time, include_bounds: bool = True) -> bool:
         """
@@ -191,14 +237,18 @@ class HoursRange:
         if not isinstance(hour, time):
             raise TypeError("Hour to compare must be time instance.")
 
+        minutes = hour.hour * 60 + hour.minute
+
+        # Begin and end are full minutes, so any time with seconds compares
+        # with them the same way as the middle of its minute
+
+        if hour.second or hour.microsecond:
+            minutes += .5
+
         if include_bounds:
-            if self.begin <= hour <= self.end:
-                return True
-        else:
-            if self.begin < hour < self.end:
-                return True
+            return self._begin_minutes <= minutes <= self._end_minutes
 
-        return False
+        return self._begin_minutes < minutes < self._end_minutes
 
     def check_intersection(self, hours_range) -> bool:
         """
@@ -206,12 +256,8 @@ class HoursRange:
         HoursRange from which the method is called.
         """
 
-        if hours_range.begin < self.end and hours_range.end > self.begin:
-            return True
-        elif hours_range.begin == self.begin and hours_range.end == self.end:
-            return True
-        else:
-            return False
+        return (hours_range._begin_minutes < self._end_minutes
+                and hours_range._end_minutes > self._begin_minutes)
 
     def durtation(self) -> timedelta:
         """
@@ -219,31 +265,67 @@ class HoursRange:
         begin and end time of the HoursRange object.
         """
 
-        hours = self.end.hour - self.begin.hour
-        minutes = self.end.minute - self.begin.minute
-        return timedelta(hours=hours, minutes=minutes)
+        return timedelta(minutes=self.duration_minutes())
+
+    def duration_minutes(self) -> int:
+        """
+        Returns the amount of minutes between begin and end time of the
+        HoursRange object.
+        """
+
+        return self._end_minutes - self._begin_minutes
 
     def __add__(self, other):
-        if not (self.begin == other.end or self.end == other.begin):
+        if not (self._begin_minutes == other._end_minutes
+                or self._end_minutes == other._begin_minutes):
             raise HoursRangeError(
                 "Summed HoursRange objects cannot intersect or be disconnected"
             )
 
         result_begin = min(self.begin, other.begin)
         result_end = max(self.end, other.end)
-        return HoursRange(result_begin, result_end)
+        return HoursRange.interned(result_begin, result_end)
 
     def __eq__(self, other) -> bool:
-        if self.begin == other.begin and self.end == other.end:
-            return True
+        return (self._begin_minutes == other._begin_minutes
+                and self._end_minutes == other._end_minutes)
 
-        return False
+    def __hash__(self) -> int:
+        return hash((self._begin_minutes, self._end_minutes))
 
     def __str__(self) -> str:
-        begin_str = f"{self.begin.hour}:{self.begin.minute:02}"
-        end_str = f"{self.end.hour}:{self.end.minute:02}"
+        begin_hour, begin_minute = divmod(self._begin_minutes, 60)
+        end_hour, end_minute = divmod(self._end_minutes, 60)
+        begin_str = f"{begin_hour}:{begin_minute:02}"
+        end_str = f"{end_hour}:{end_minute:02}"
         return f"{begin_str} - {end_str}"
 
+    @staticmethod
+    def interned(begin: time, end: time):
+        """
+        Returns an HoursRange object with the given begin and end time.
+        Every call with equal arguments returns the same object.
+        """
+
+        key = (begin, end)
+        hours_range = HoursRange._interned.get(key)
+
+        if hours_range is None:
+            hours_range = HoursRange(begin, end)
+            HoursRange._interned[key] = hours_range
+
+        return hours_range
+
+    @staticmethod
+    def from_minutes(begin_minutes: int, end_minutes: int):
+        """
+        Returns an (interned) HoursRange object with the begin and end time
+        given as the amounts of minutes since midnight.
+        """
+
+        return HoursRange.interned(
+            time(*divmod(begin_minutes, 60)), time(*divmod(end_minutes, 60)))
+
     @staticmethod
     def from_json(json_dict: dict):
         """
@@ -256,7 +338,7 @@ class HoursRange:
         end_hour = json_dict["end"]["hour"]
         end_minute = json_dict["end"]["minute"]
 
-        return HoursRange(
+        return HoursRange.interned(
             time(begin_hour, begin_minute), time(end_hour, end_minute))
 
     @staticmethod
@@ -266,14 +348,17 @@ class HoursRange:
         and returns it.
         """
 
+        begin_hour, begin_minute = divmod(object.begin_minutes, 60)
+        end_hour, end_minute = divmod(object.end_minutes, 60)
+
         json_dict = {
             "begin": {
-                "hour": object.begin.hour,
-                "minute": object.begin.minute
+                "hour": begin_hour,
+                "minute": begin_minute
             },
             "end": {
-                "hour": object.end.hour,
-                "minute": object.end.minute
+                "hour": end_hour,
+                "minute": end_minute
             }
         }
 
@@ -293,3 +378,10 @@ class HoursRange:
 
         if begin.minute % 30 != 0 or end.minute % 30 != 0:
             raise HoursRangeError("Hours must have minutes equal 0 or 30.")
+
+        if (begin.second or begin.microsecond
+                or end.second or end.microsecond):
+            raise HoursRangeError("Hours cannot have seconds.")
+
+
+_HALF_HOURS = [time(hour, minute) for hour in range(24) for minute in (0, 30)]
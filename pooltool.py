@@ -2,6 +2,7 @@ import sys
 import argparse
 import view.admin_view
 import view.pool_view
+import view.server_view
 
 
 def main(args: list[str]) -> None:
@@ -17,12 +18,24 @@ def main(args: list[str]) -> None:
     group.add_argument(
         "-a", "--admin", action="store_true",
         help="enter the admin mode, manage settings common for all pools")
+    group.add_argument(
+        "-s", "--serve", nargs="?", const=".", metavar="DIRECTORY",
+        help="serve all pools saved in a directory through the HTTP API")
+    parser.add_argument(
+        "--host", default=view.server_view.DEFAULT_HOST,
+        help="address the server listens on")
+    parser.add_argument(
+        "--port", type=int, default=view.server_view.DEFAULT_PORT,
+        help="port the server listens on")
 
     parsed_args = parser.parse_args(args[1:])
     args_dict = vars(parsed_args)
 
     if args_dict["admin"]:
         view.admin_view.admin_view()
+    elif args_dict["serve"] is not None:
+        view.server_view.server_view(
+            args_dict["serve"], args_dict["host"], args_dict["port"])
     else:
         view.pool_view.pool_view(args_dict["pool"])
 
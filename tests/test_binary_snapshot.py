@@ -0,0 +1,101 @@
+from config.binary_snapshot import ReservationsSnapshot, \
+    write_reservations_snapshot
+from model.reservations_model import Reservation, SchoolReservation
+from model.value_types import HoursRange, Price
+from datetime import date, time
+import pytest
+
+
+def _create_reservations() -> list:
+    return [
+        SchoolReservation(2, date(2022, 1, 4), HoursRange(
+            time(10, 0), time(12, 30)), Price(30, 0)),
+        Reservation(date(2022, 1, 3), HoursRange(
+            time(9, 30), time(11, 0)), Price(12, 50)),
+        Reservation(date(2022, 1, 4), HoursRange(
+            time(8, 0), time(9, 0)), Price(7, 25)),
+        Reservation(date(2022, 1, 6), HoursRange(
+            time(16, 0), time(18, 0)), Price(15, 0))
+    ]
+
+
+def _write_snapshot(directory) -> str:
+    path = str(directory / "reservations.bin")
+
+    with open(path, "wb") as handle:
+        write_reservations_snapshot(handle, _create_reservations())
+
+    return path
+
+
+# Tests for write_reservations_snapshot() and ReservationsSnapshot
+
+def test_snapshot_read_reservations(tmp_path):
+    with ReservationsSnapshot(_write_snapshot(tmp_path)) as snapshot:
+        reservations = list(snapshot.reservations())
+        assert len(snapshot) == 4
+
+    assert [r.date for r in reservations] == [
+        date(2022, 1, 3), date(2022, 1, 4), date(2022, 1, 4), date(2022, 1, 6)]
+
+    school = reservations[2]
+    assert isinstance(school, SchoolReservation)
+    assert school.lane == 2
+    assert school.hours_range == HoursRange(time(10, 0), time(12, 30))
+    assert school.price == Price(30, 0)
+    assert not isinstance(reservations[1], SchoolReservation)
+
+
+def test_snapshot_day_records(tmp_path):
+    with ReservationsSnapshot(_write_snapshot(tmp_path)) as snapshot:
+        assert len(snapshot.day_records(date(2022, 1, 4))) == 2
+        assert snapshot.day_records(date(2022, 1, 5)) == []
+        assert snapshot.day_records(date(2022, 1, 7)) == []
+        assert snapshot[-1].begin_slot == 32
+
+        assert snapshot.calculate_total_income(
+            date(2022, 1, 4)) == Price(37, 25)
+        assert snapshot.calculate_total_income(
+            date(2021, 12, 31)) == Price(0, 0)
+
+
+def test_snapshot_empty(tmp_path):
+    path = str(tmp_path / "reservations.bin")
+
+    with open(path, "wb") as handle:
+        write_reservations_snapshot(handle, [])
+
+    with ReservationsSnapshot(path) as snapshot:
+        assert len(snapshot) == 0
+        assert list(snapshot) == []
+
+
+def test_snapshot_invalid_file(tmp_path):
+    path = str(tmp_path / "reservations.bin")
+
+    with open(path, "wb") as handle:
+        handle.write(b"not a snapshot")
+
+    with pytest.raises(ValueError):
+        ReservationsSnapshot(path)
+
+
+def test_snapshot_reservation_ids(tmp_path):
+    path = str(tmp_path / "reservations.bin")
+    reservations = _create_reservations()
+
+    for reservation_id, reservation in zip((4, 0, 7, 2), reservations):
+        reservation.id = reservation_id
+
+    with open(path, "wb") as handle:
+        write_reservations_snapshot(handle, reservations, next_id=10)
+
+    with ReservationsSnapshot(path) as snapshot:
+        assert snapshot.next_id == 10
+        assert [r.id for r in snapshot.reservations()] == [0, 7, 4, 2]
+
+    with open(path, "wb") as handle:
+        write_reservations_snapshot(handle, reservations[1:])
+
+    with ReservationsSnapshot(path) as snapshot:
+        assert snapshot.next_id == 8
@@ -0,0 +1,110 @@
+from model.reservations_model import Reservation, SchoolReservation
+from model.reservations_model import ReservationSystemModel
+from model.value_types import HoursRange, Price, Services
+from exceptions.reservation_exceptions import ReservationTimeTakenError
+from tests.test_reservation_system import pool_model
+from datetime import date, time
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from model.day_grid import DayGridEngine  # noqa: E402
+
+
+# Tests for DayGridEngine.check_reservation_intersection()
+
+def test_day_grid_no_tickets_available():
+    reservation = Reservation(
+        date(2022, 1, 3), HoursRange(time(9, 30), time(12, 0)), Price(5, 75))
+    engine = DayGridEngine(1, 5, .35, [reservation] * 5)
+
+    assert engine.check_reservation_intersection(
+        HoursRange(time(11, 0), time(12, 0)), date(2022, 1, 3), False)
+    assert not engine.check_reservation_intersection(
+        HoursRange(time(12, 0), time(13, 0)), date(2022, 1, 3), False)
+
+
+def test_day_grid_taken_lane():
+    reservation = SchoolReservation(
+        3, date(2022, 1, 3), HoursRange(time(10, 0), time(16, 0)),
+        Price(31, 80))
+    engine = DayGridEngine(5, 5, .35, [reservation])
+
+    assert engine.check_reservation_intersection(
+        HoursRange(time(15, 30), time(17, 0)), date(2022, 1, 3), True, 3)
+    assert not engine.check_reservation_intersection(
+        HoursRange(time(16, 0), time(17, 0)), date(2022, 1, 3), True, 3)
+
+
+def test_day_grid_over_lanes_limit():
+    reservation = SchoolReservation(
+        3, date(2022, 1, 3), HoursRange(time(10, 0), time(16, 0)),
+        Price(31, 80))
+    engine = DayGridEngine(5, 5, .35, [reservation])
+
+    assert engine.check_reservation_intersection(
+        HoursRange(time(15, 30), time(17, 0)), date(2022, 1, 3), True, 4)
+
+
+def test_day_grid_remove():
+    reservation = SchoolReservation(
+        3, date(2022, 1, 3), HoursRange(time(10, 0), time(16, 0)),
+        Price(31, 80))
+    engine = DayGridEngine(5, 5, .35, [reservation])
+    engine.remove(reservation)
+
+    assert engine.get_day(date(2022, 1, 3)) is None
+
+
+# Tests comparing DayGridEngine with the pure-Python path
+
+def test_day_grid_matches_python_path():
+    grid_system = ReservationSystemModel(pool_model)
+    python_system = ReservationSystemModel(pool_model, use_day_grid=False)
+    requests = [
+        (Services.SWIMMING_SCHOOL, time(8, 0), time(12, 0), 0),
+        (Services.SWIMMING_SCHOOL, time(11, 0), time(14, 0), 1),
+        (Services.SWIMMING_SCHOOL, time(13, 0), time(15, 0), 1),
+        (Services.INDIVIDUAL, time(9, 0), time(10, 0), None),
+        (Services.INDIVIDUAL, time(9, 30), time(11, 0), None),
+    ]
+
+    for i in range(12):
+        for service, begin, end, lane in requests:
+            results = []
+
+            for system in (grid_system, python_system):
+                try:
+                    system.add_reservation(
+                        service, date(2022, 1, 3),
+                        HoursRange(begin, end), lane)
+                    results.append(None)
+                except ReservationTimeTakenError as e:
+                    results.append(e.proposed_date)
+
+            assert results[0] == results[1]
+
+    assert len(grid_system.reservations) == len(python_system.reservations)
+
+
+def test_day_grid_availability_calendar_matches_python_path():
+    grid_system = ReservationSystemModel(pool_model)
+    python_system = ReservationSystemModel(pool_model, use_day_grid=False)
+
+    for system in (grid_system, python_system):
+        system.add_reservation(
+            Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+            HoursRange(time(8, 0), time(12, 0)), 0)
+        system.add_reservation(
+            Services.SWIMMING_SCHOOL, date(2022, 1, 5),
+            HoursRange(time(11, 0), time(14, 0)), 4)
+
+        for i in range(7):
+            system.add_reservation(
+                Services.INDIVIDUAL, date(2022, 1, 3),
+                HoursRange(time(9, 30), time(11, 0)))
+
+    assert grid_system.availability_calendar(
+        date(2022, 1, 1), date(2022, 1, 31)) == (
+            python_system.availability_calendar(
+                date(2022, 1, 1), date(2022, 1, 31)))
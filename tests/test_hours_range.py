@@ -152,6 +152,59 @@ def test_hours_range_eq_wrong_type():
         first_range == 2
 
 
+# Tests for HoursRange.__hash__()
+
+def test_hours_range_hash_typical():
+    first_range = HoursRange(time(9, 0), time(12, 30))
+    second_range = HoursRange(time(9, 0), time(12, 30))
+    third_range = HoursRange(time(12, 30), time(13, 0))
+
+    ranges = {first_range: 1, third_range: 2}
+    assert ranges[second_range] == 1
+    assert len({first_range, second_range, third_range}) == 2
+
+
+# Tests for HoursRange.interned()
+
+def test_hours_range_interned_typical():
+    first_range = HoursRange.interned(time(9, 0), time(12, 30))
+    second_range = HoursRange.interned(time(9, 0), time(12, 30))
+
+    assert first_range is second_range
+    assert first_range == HoursRange(time(9, 0), time(12, 30))
+
+
+def test_hours_range_interned_wrong_values():
+    with pytest.raises(HoursRangeError):
+        HoursRange.interned(time(12, 0), time(9, 0))
+
+
+# Tests for HoursRange minutes and duration
+
+def test_hours_range_minutes_typical():
+    hours_range = HoursRange(time(9, 30), time(12, 0))
+
+    assert hours_range.begin_minutes == 570
+    assert hours_range.end_minutes == 720
+    assert hours_range.duration_minutes() == 150
+
+
+def test_hours_range_immutable():
+    hours_range = HoursRange(time(9, 30), time(12, 0))
+
+    with pytest.raises(AttributeError):
+        hours_range.begin = time(8, 0)
+
+
+def test_hours_range_seconds():
+    with pytest.raises(HoursRangeError):
+        HoursRange(time(9, 30, 15), time(12, 0))
+
+    hours_range = HoursRange(time(9, 30), time(12, 0))
+    assert hours_range.is_in_range(time(9, 30, 15), False)
+    assert not hours_range.is_in_range(time(12, 0, 15))
+
+
 # Tests for HoursRange.__str__()
 
 def test_hours_range_str_typical():
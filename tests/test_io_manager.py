@@ -1,10 +1,17 @@
 from config.io_manager import read_pool_model, write_pool_model
 from config.io_manager import read_config, write_config
+from config.io_manager import read_pool_model_streaming, iter_reservations
+from config.io_manager import SCHEMA_VERSION, dump_checked, load_checked
+from config.io_manager import has_valid_checksum
 from config.admin import Admin
 from io import StringIO
 from model.pool_model import PoolModel
-from datetime import date
+from model.value_types import HoursRange, Price, Services
+from exceptions.reservation_exceptions import ReservationDurationError
+from datetime import date, time
 import ast
+import pytest
+import json
 
 
 # Tests for io_manager.write_pool_model()
@@ -113,11 +120,14 @@ def test_io_write_pool_model_correct():
     }
 
     pool_model = PoolModel(pool_json, date.today())
+    pool_json["next_reservation_id"] = 0
     pool_json["reservations"] = []
 
     write_pool_model(handle, pool_model)
     saved_dict = ast.literal_eval(handle.getvalue())
 
+    assert saved_dict.pop("schema_version") == SCHEMA_VERSION
+    assert len(saved_dict.pop("checksum")) == 64
     assert saved_dict == pool_json
 
 
@@ -227,12 +237,181 @@ def test_io_read_pool_model_correct():
     handle = StringIO(str(pool_json).replace("'", '"'))
 
     pool_model = read_pool_model(handle, date(2022, 1, 1))
+    pool_json["next_reservation_id"] = 0
     pool_json["reservations"] = []
 
     assert PoolModel.to_json(pool_model) == pool_json
     assert pool_model.current_day == date(2022, 1, 1)
 
 
+def _create_checked_pool_text(reservation_json: dict) -> str:
+    with open("example_files/valid_pool.json") as handle:
+        pool_json = json.load(handle)
+
+    pool_json["reservations"] = [reservation_json]
+    return dump_checked(pool_json)
+
+
+def test_io_read_pool_model_trusted():
+    # Too short reservation is accepted only if the checksum matches
+
+    reservation_json = {
+        "date": {"day": 3, "month": 1, "year": 2022},
+        "hours_range": {
+            "begin": {"hour": 10, "minute": 0},
+            "end": {"hour": 10, "minute": 30}
+        },
+        "price": {"zl": 6, "gr": 25},
+        "service": 0
+    }
+    pool_text = _create_checked_pool_text(reservation_json)
+
+    pool_model = read_pool_model(StringIO(pool_text), date(2022, 1, 1))
+    reservation = pool_model.reservation_system_model.reservations[0]
+    assert reservation.price == Price(6, 25)
+    assert reservation.hours_range == HoursRange(time(10, 0), time(10, 30))
+
+    pool_text = pool_text.replace('"gr": 25', '"gr": 50')
+
+    with pytest.raises(ReservationDurationError):
+        read_pool_model(StringIO(pool_text), date(2022, 1, 1))
+
+
+def test_io_read_pool_model_trusted_without_encoding(monkeypatch):
+    # The checksum is checked on the raw text, without encoding it again
+
+    handle = _create_pool_file_with_reservations()
+
+    def fail_dumps(*args, **kwargs):
+        raise AssertionError("the content was encoded again")
+
+    monkeypatch.setattr(json, "dumps", fail_dumps)
+    json_dict, trusted = load_checked(handle.getvalue())
+
+    assert trusted
+    assert len(json_dict["reservations"]) == 8
+
+
+def test_io_has_valid_checksum():
+    pool_text = _create_pool_file_with_reservations().getvalue()
+
+    pool_json = json.loads(pool_text)
+    pool_json.pop("checksum")
+
+    assert has_valid_checksum(pool_text)
+    assert not has_valid_checksum(pool_text.replace(
+        '"lanes_amount": 5', '"lanes_amount": 6'))
+    assert not has_valid_checksum(pool_text[:-1] + ', "a": 1}')
+    assert not has_valid_checksum(json.dumps(pool_json))
+
+
+def test_io_read_pool_model_trusted_round_trip():
+    handle = _create_pool_file_with_reservations()
+    pool_json = json.load(handle)
+    handle.seek(0)
+
+    pool_model = read_pool_model(handle, date(2022, 1, 1))
+    reservations = pool_model.reservation_system_model.reservations
+
+    assert len(reservations) == 8
+    assert reservations[1].lane == 2
+    assert PoolModel.to_json(pool_model)["reservations"] == (
+        pool_json["reservations"])
+
+
+# Tests for io_manager.read_pool_model_streaming()
+
+def _create_pool_file_with_reservations() -> StringIO:
+    with open("example_files/valid_pool.json") as handle:
+        pool_model = PoolModel(json.load(handle), date(2022, 1, 1))
+
+    res_sys_model = pool_model.reservation_system_model
+
+    for day in (3, 4, 10, 11):
+        res_sys_model.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, day),
+            HoursRange(time(10, 0), time(12, 30)))
+        res_sys_model.add_reservation(
+            Services.SWIMMING_SCHOOL, date(2022, 1, day),
+            HoursRange(time(11, 0), time(13, 0)), 2)
+
+    handle = StringIO()
+    write_pool_model(handle, pool_model)
+    handle.seek(0)
+    return handle
+
+
+def test_io_read_pool_model_streaming_correct():
+    handle = _create_pool_file_with_reservations()
+    expected_model = read_pool_model(handle, date(2022, 1, 1))
+
+    for chunk_size in (1, 7, 4096):
+        handle.seek(0)
+        pool_model = read_pool_model_streaming(
+            handle, date(2022, 1, 1), chunk_size=chunk_size)
+
+        assert PoolModel.to_json(pool_model) == PoolModel.to_json(
+            expected_model)
+
+
+def test_io_read_pool_model_streaming_since():
+    handle = _create_pool_file_with_reservations()
+    pool_model = read_pool_model_streaming(
+        handle, date(2022, 1, 1), since=date(2022, 1, 10))
+    reservations = pool_model.reservation_system_model.reservations
+
+    assert len(reservations) == 4
+    assert all(r.date >= date(2022, 1, 10) for r in reservations)
+
+
+def test_io_read_pool_model_streaming_reservations_first():
+    handle = _create_pool_file_with_reservations()
+    pool_json = json.load(handle)
+    reordered_json = {"reservations": pool_json.pop("reservations")}
+    reordered_json.update(pool_json)
+
+    pool_model = read_pool_model_streaming(
+        StringIO(json.dumps(reordered_json)), date(2022, 1, 1),
+        chunk_size=16)
+
+    assert len(pool_model.reservation_system_model.reservations) == 8
+
+
+def test_io_read_pool_model_streaming_next_id_last():
+    handle = _create_pool_file_with_reservations()
+    pool_json = json.load(handle)
+    pool_json["next_reservation_id"] = 20
+    pool_json["next_reservation_id"] = pool_json.pop("next_reservation_id")
+
+    pool_model = read_pool_model_streaming(
+        StringIO(json.dumps(pool_json)), date(2022, 1, 1),
+        since=date(2022, 1, 10))
+    res_sys_model = pool_model.reservation_system_model
+
+    assert res_sys_model.next_id == 20
+    assert res_sys_model.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(11, 0))).id == 20
+
+
+def test_io_read_pool_model_streaming_malformed():
+    handle = _create_pool_file_with_reservations()
+    malformed = handle.getvalue()[:-40]
+
+    with pytest.raises(json.JSONDecodeError):
+        read_pool_model_streaming(StringIO(malformed), date(2022, 1, 1))
+
+
+# Tests for io_manager.iter_reservations()
+
+def test_io_iter_reservations_correct():
+    handle = _create_pool_file_with_reservations()
+    reservations = list(iter_reservations(handle, since=date(2022, 1, 4)))
+
+    assert len(reservations) == 6
+    assert reservations[1].lane == 2
+
+
 # Tests for io_manager.write_config()
 
 def test_io_write_config_correct():
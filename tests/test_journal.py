@@ -0,0 +1,297 @@
+from config.journal import PoolJournal
+from model.price_list_model import PriceListModel
+from model.value_types import HoursRange, Price, Services
+from exceptions.reservation_exceptions import ReservationTimeTakenError
+import pytest
+from datetime import date, time
+import json
+import os
+import shutil
+
+
+def _create_pool_file(directory) -> str:
+    pool_path = str(directory / "pool.json")
+    shutil.copy("example_files/valid_pool.json", pool_path)
+    return pool_path
+
+
+def _add_reservations(journal: PoolJournal, pool_model, amount: int) -> None:
+    for i in range(amount):
+        journal.add_reservation(
+            pool_model, Services.INDIVIDUAL, date(2022, 1, 3),
+            HoursRange(time(9, 30), time(12, 0)))
+
+
+# Tests for PoolJournal.add_reservation(), remove_reservation() and load()
+
+def test_journal_add_remove_and_load(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+    res_sys_model = pool_model.reservation_system_model
+
+    _add_reservations(journal, pool_model, 1)
+
+    school = journal.add_reservation(
+        pool_model, Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(16, 0)), 3)
+    journal.remove_reservation(
+        pool_model, res_sys_model.get_reservation(0))
+
+    with open(pool_path) as handle:
+        assert "reservations" not in json.load(handle)
+
+    with open(journal.journal_path) as handle:
+        assert len(handle.readlines()) == 3
+
+    loaded_journal = PoolJournal(pool_path)
+    loaded_model = loaded_journal.load(date(2022, 1, 1))
+    reservations = loaded_model.reservation_system_model.reservations
+
+    assert loaded_journal.entries_amount == 3
+    assert len(reservations) == 1
+    assert reservations[0].lane == 3
+    assert reservations[0].price == school.price
+
+
+def test_journal_load_partial_line(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+
+    _add_reservations(journal, pool_model, 2)
+
+    with open(journal.journal_path, "a") as handle:
+        handle.write('{"sequence": 3, "operat')
+
+    loaded_model = PoolJournal(pool_path).load(date(2022, 1, 1))
+    assert len(loaded_model.reservation_system_model.reservations) == 2
+
+
+def test_journal_append_after_partial_line(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+
+    _add_reservations(journal, pool_model, 1)
+
+    with open(journal.journal_path, "a") as handle:
+        handle.write('{"sequence": 2, "operation": "add"}')
+
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+    _add_reservations(journal, pool_model, 1)
+
+    loaded_model = PoolJournal(pool_path).load(date(2022, 1, 1))
+    assert len(loaded_model.reservation_system_model.reservations) == 2
+
+    with open(journal.journal_path) as handle:
+        assert len(handle.readlines()) == 2
+
+
+# Tests for PoolJournal.compact()
+
+def test_journal_compaction_threshold(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path, compaction_threshold=3)
+    pool_model = journal.load(date(2022, 1, 1))
+
+    _add_reservations(journal, pool_model, 4)
+
+    with open(pool_path) as handle:
+        pool_json = json.load(handle)
+
+    with open(journal.journal_path) as handle:
+        journal_lines = handle.readlines()
+
+    assert len(journal_lines) == 2
+    assert json.loads(journal_lines[0]) == {
+        "sequence": 3, "operation": "compact"}
+    assert len(pool_json["reservations"]) == 3
+    assert pool_json["journal_sequence"] == 3
+    assert journal.entries_amount == 1
+
+    loaded_model = PoolJournal(pool_path).load(date(2022, 1, 1))
+    assert len(loaded_model.reservation_system_model.reservations) == 4
+
+
+def test_journal_compaction_skips_applied_entries(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+
+    _add_reservations(journal, pool_model, 2)
+
+    with open(journal.journal_path) as handle:
+        journal_lines = handle.read()
+
+    journal.compact(pool_model)
+
+    # Journal left behind, as if the process stopped before clearing it
+
+    with open(journal.journal_path, "w") as handle:
+        handle.write(journal_lines)
+
+    loaded_model = PoolJournal(pool_path).load(date(2022, 1, 1))
+    assert len(loaded_model.reservation_system_model.reservations) == 2
+
+
+# Tests for PoolJournal.add_reservation() and remove_reservation()
+
+def test_journal_add_reservation_validates_other_changes(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    first_journal = PoolJournal(pool_path)
+    first_model = first_journal.load(date(2022, 1, 1))
+    second_journal = PoolJournal(pool_path)
+    second_model = second_journal.load(date(2022, 1, 1))
+
+    first_journal.add_reservation(
+        first_model, Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(12, 0)), 3)
+
+    with pytest.raises(ReservationTimeTakenError):
+        second_journal.add_reservation(
+            second_model, Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+            HoursRange(time(11, 0), time(13, 0)), 3)
+
+    second_journal.add_reservation(
+        second_model, Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(12, 0), time(14, 0)), 2)
+
+    assert second_journal.version == 2
+    assert len(second_model.reservation_system_model.reservations) == 2
+
+    loaded_model = PoolJournal(pool_path).load(date(2022, 1, 1))
+    assert len(loaded_model.reservation_system_model.reservations) == 2
+
+
+def test_journal_add_reservation_after_other_compaction(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    first_journal = PoolJournal(pool_path, compaction_threshold=2)
+    first_model = first_journal.load(date(2022, 1, 1))
+    second_journal = PoolJournal(pool_path)
+    second_model = second_journal.load(date(2022, 1, 1))
+
+    for begin_hour in (10, 12):
+        first_journal.add_reservation(
+            first_model, Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+            HoursRange(time(begin_hour, 0), time(begin_hour + 2, 0)), 1)
+
+    with pytest.raises(ReservationTimeTakenError):
+        second_journal.add_reservation(
+            second_model, Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+            HoursRange(time(11, 0), time(13, 0)), 1)
+
+    assert second_journal.version == 2
+    assert len(second_model.reservation_system_model.reservations) == 2
+
+
+def test_journal_remove_reservation_removed_by_other(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    first_journal = PoolJournal(pool_path)
+    first_model = first_journal.load(date(2022, 1, 1))
+
+    reservation = first_journal.add_reservation(
+        first_model, Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(9, 30), time(12, 0)))
+
+    second_journal = PoolJournal(pool_path)
+    second_model = second_journal.load(date(2022, 1, 1))
+
+    first_journal.remove_reservation(first_model, reservation)
+
+    with pytest.raises(ValueError):
+        second_journal.remove_reservation(second_model, reservation)
+
+    assert second_model.reservation_system_model.reservations == []
+
+
+# Tests for PoolJournal.change_price_list(), rebuild() and day events
+
+def test_journal_change_price_list(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+
+    pricing_json = PriceListModel.to_json(
+        pool_model.price_list_model.get_pricing())
+
+    for position in pricing_json:
+        position["price"] = {"zl": 10, "gr": 0}
+
+    journal.change_price_list(pool_model, pricing_json)
+    reservation = journal.add_reservation(
+        pool_model, Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(12, 0)))
+
+    assert reservation.price == Price(20, 0)
+
+    loaded_model = PoolJournal(pool_path).load(date(2022, 1, 1))
+    res_sys_model = loaded_model.reservation_system_model
+    assert all(
+        position.price == Price(10, 0)
+        for position in loaded_model.price_list_model.get_pricing())
+    assert res_sys_model.reservations[0].price == Price(20, 0)
+
+
+def test_journal_day_events(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+    journal.compact(pool_model)
+
+    with open(pool_path) as handle:
+        assert json.load(handle)["current_day"] == "2022-01-01"
+
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 2))
+    journal.load(date(2022, 1, 2))
+
+    events = list(journal.iter_events())
+    assert events == [{
+        "sequence": 1, "operation": "current_day",
+        "current_day": "2022-01-02"}]
+
+
+def test_journal_rebuild(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+
+    _add_reservations(journal, pool_model, 3)
+    journal.remove_reservation(
+        pool_model, pool_model.reservation_system_model.reservations[0])
+
+    for sequence, amount in ((0, 0), (2, 2), (3, 3), (4, 2)):
+        rebuilt_model = journal.rebuild(sequence)
+        reservations = rebuilt_model.reservation_system_model.reservations
+        assert len(reservations) == amount
+
+    journal.compact(pool_model)
+    _add_reservations(journal, pool_model, 1)
+    journal.compact(pool_model)
+
+    for sequence, amount in ((0, 0), (3, 3), (4, 2), (5, 3)):
+        rebuilt_model = journal.rebuild(sequence)
+        reservations = rebuilt_model.reservation_system_model.reservations
+        assert len(reservations) == amount
+
+    with open(journal.archive_path) as handle:
+        assert len(handle.readlines()) == 5
+
+
+def test_journal_rebuild_before_base_snapshot(tmp_path):
+    pool_path = _create_pool_file(tmp_path)
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+
+    _add_reservations(journal, pool_model, 2)
+    journal.compact(pool_model)
+    os.remove(journal.base_path)
+    _add_reservations(journal, pool_model, 1)
+    journal.compact(pool_model)
+
+    assert len(journal.rebuild(2).reservation_system_model.reservations) == 2
+
+    with pytest.raises(ValueError):
+        journal.rebuild(1)
@@ -0,0 +1,87 @@
+from model.occupancy_index import OccupancyIndex, LaneIntervals
+from model.occupancy_index import time_to_slot, range_to_slots
+from model.reservations_model import Reservation, SchoolReservation
+from model.value_types import HoursRange, Price
+from datetime import date, datetime, time
+
+
+# Tests for time_to_slot() and range_to_slots()
+
+def test_time_to_slot_typical():
+    assert time_to_slot(datetime(2022, 1, 3, 10, 0)) == (20, True)
+    assert time_to_slot(datetime(2022, 1, 3, 10, 15)) == (20, False)
+    assert time_to_slot(datetime(2022, 1, 3, 10, 30, 1)) == (21, False)
+
+
+def test_range_to_slots_typical():
+    hours_range = HoursRange(time(9, 30), time(12, 0))
+    assert range_to_slots(hours_range) == range(19, 24)
+
+
+# Tests for LaneIntervals
+
+def test_lane_intervals_overlaps():
+    intervals = LaneIntervals()
+    intervals.add(range(20, 24))
+    intervals.add(range(30, 32))
+
+    assert intervals.overlaps(range(22, 26))
+    assert intervals.overlaps(range(18, 21))
+    assert intervals.overlaps(range(31, 40))
+    assert not intervals.overlaps(range(24, 30))
+    assert not intervals.overlaps(range(16, 20))
+
+
+def test_lane_intervals_overlaps_nested():
+    intervals = LaneIntervals()
+    intervals.add(range(10, 40))
+    intervals.add(range(12, 14))
+
+    assert intervals.overlaps(range(20, 22))
+
+
+def test_lane_intervals_remove():
+    intervals = LaneIntervals()
+    intervals.add(range(10, 40))
+    intervals.add(range(12, 14))
+    intervals.remove(range(10, 40))
+
+    assert len(intervals) == 1
+    assert not intervals.overlaps(range(20, 22))
+
+
+# Tests for OccupancyIndex
+
+def test_occupancy_index_typical():
+    individual = Reservation(
+        date(2022, 1, 3), HoursRange(time(9, 30), time(12, 0)), Price(5, 75))
+    school = SchoolReservation(
+        3, date(2022, 1, 3), HoursRange(time(10, 0), time(16, 0)),
+        Price(31, 80))
+    index = OccupancyIndex([individual, school])
+
+    assert index.individual_amount(datetime(2022, 1, 3, 11, 0)) == 1
+    assert index.school_amount(datetime(2022, 1, 3, 11, 0)) == 1
+    assert index.taken_lanes(datetime(2022, 1, 3, 11, 0)) == {3}
+    assert index.taken_lanes(datetime(2022, 1, 4, 11, 0)) == set()
+
+
+def test_occupancy_index_bounds_excluded():
+    school = SchoolReservation(
+        3, date(2022, 1, 3), HoursRange(time(10, 0), time(16, 0)),
+        Price(31, 80))
+    index = OccupancyIndex([school])
+
+    assert index.taken_lanes(datetime(2022, 1, 3, 10, 0)) == set()
+    assert index.taken_lanes(datetime(2022, 1, 3, 10, 15)) == {3}
+    assert index.taken_lanes(datetime(2022, 1, 3, 16, 0)) == set()
+
+
+def test_occupancy_index_remove():
+    individual = Reservation(
+        date(2022, 1, 3), HoursRange(time(9, 30), time(12, 0)), Price(5, 75))
+    index = OccupancyIndex([individual])
+    index.remove(individual)
+
+    assert index.individual_amount(datetime(2022, 1, 3, 11, 0)) == 0
+    assert index.get_day(date(2022, 1, 3)) is None
@@ -0,0 +1,110 @@
+from config.partitioned_storage import PartitionedPoolStorage
+from config.io_manager import read_pool_model
+from model.reservations_model import Reservation
+from model.value_types import HoursRange, Price, Services
+from datetime import date, time
+import json
+import os
+import pytest
+
+
+def _create_storage(directory) -> PartitionedPoolStorage:
+    with open("example_files/valid_pool.json") as handle:
+        pool_model = read_pool_model(handle, date(2021, 12, 27))
+
+    res_sys_model = pool_model.reservation_system_model
+
+    for day in (date(2021, 12, 27), date(2022, 1, 3), date(2022, 2, 7)):
+        res_sys_model.add_reservation(
+            Services.INDIVIDUAL, day, HoursRange(time(9, 30), time(12, 0)))
+
+    storage = PartitionedPoolStorage(str(directory))
+    storage.write_pool_model(pool_model)
+
+    return storage
+
+
+# Tests for PartitionedPoolStorage.write_pool_model()
+
+def test_partitioned_write_pool_model(tmp_path):
+    storage = _create_storage(tmp_path)
+
+    with open(storage.pool_path) as handle:
+        assert "reservations" not in json.load(handle)
+
+    assert storage.partition_months() == [(2021, 12), (2022, 1), (2022, 2)]
+
+    with open(os.path.join(
+            storage.reservations_directory, "2022-01.json")) as handle:
+        assert len(json.load(handle)) == 1
+
+
+def test_partitioned_write_only_dirty_partitions(tmp_path):
+    storage = _create_storage(tmp_path)
+    pool_model = storage.read_pool_model(date(2022, 1, 1))
+    res_sys_model = pool_model.reservation_system_model
+
+    december_path = os.path.join(
+        storage.reservations_directory, "2021-12.json")
+    os.remove(december_path)
+
+    res_sys_model.add_reservation(
+        Services.INDIVIDUAL, date(2022, 2, 8),
+        HoursRange(time(9, 30), time(12, 0)))
+    res_sys_model.remove_reservation(res_sys_model.reservations[0].id)
+    assert res_sys_model.dirty_months == {(2022, 1), (2022, 2)}
+
+    storage.write_pool_model(pool_model)
+
+    assert res_sys_model.dirty_months == set()
+    assert storage.partition_months() == [(2022, 2)]
+
+    with open(os.path.join(
+            storage.reservations_directory, "2022-02.json")) as handle:
+        assert len(json.load(handle)) == 2
+
+
+# Tests for PartitionedPoolStorage.read_pool_model()
+
+def test_partitioned_read_pool_model(tmp_path):
+    storage = _create_storage(tmp_path)
+
+    pool_model = storage.read_pool_model(date(2022, 1, 1))
+    reservations = pool_model.reservation_system_model.reservations
+    assert [r.date for r in reservations] == [
+        date(2022, 1, 3), date(2022, 2, 7)]
+    assert pool_model.name == "MyPool"
+
+    pool_model = storage.read_pool_model(
+        date(2022, 1, 1), since=date(2021, 12, 31))
+    assert len(pool_model.reservation_system_model.reservations) == 3
+
+
+def test_partitioned_read_since_later_month(tmp_path):
+    storage = _create_storage(tmp_path)
+
+    with pytest.raises(ValueError):
+        storage.read_pool_model(date(2022, 1, 1), since=date(2022, 2, 1))
+
+
+def test_partitioned_write_merges_unloaded_months(tmp_path):
+    storage = _create_storage(tmp_path)
+    pool_model = storage.read_pool_model(
+        date(2022, 1, 1), since=date(2022, 1, 1))
+    res_sys_model = pool_model.reservation_system_model
+
+    res_sys_model.insert_reservation(Reservation(
+        date(2021, 12, 28), HoursRange(time(9, 0), time(10, 0)),
+        Price(5, 30)))
+    res_sys_model.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 10),
+        HoursRange(time(9, 0), time(10, 0)))
+    storage.write_pool_model(pool_model, full=True)
+
+    pool_model = storage.read_pool_model(
+        date(2022, 1, 1), since=date(2021, 12, 1))
+    reservations = pool_model.reservation_system_model.reservations
+
+    assert [r.date for r in reservations] == [
+        date(2021, 12, 27), date(2021, 12, 28), date(2022, 1, 3),
+        date(2022, 1, 10), date(2022, 2, 7)]
@@ -2,8 +2,10 @@ from model.pool_model import PoolModel
 from model.price_list_model import PriceListModel
 from model.reservations_model import ReservationSystemModel
 from datetime import date, time
-from model.value_types import HoursRange, Services
+from model.value_types import HoursRange, Price, Services
 from exceptions.pool_model_exceptions import InvalidWorkingHoursError
+from exceptions.price_list_exceptions import PricingHoursError
+import json
 import pytest
 
 
@@ -613,6 +615,7 @@ def test_pool_model_to_json_correct():
             HoursRange(time(10, 0), time(16, 0)), 3)
 
     expected_json = pool_json
+    expected_json["next_reservation_id"] = 2
     expected_json["reservations"] = ReservationSystemModel.to_json(
         reservation_system.reservations)
 
@@ -622,3 +625,37 @@ def test_pool_model_to_json_correct():
 def test_pool_model_to_json_wrong_object():
     with pytest.raises(AttributeError):
         PoolModel.to_json(25)
+
+
+# Tests for PoolModel.set_price_list() and set_current_day()
+
+def test_pool_model_set_price_list():
+    with open("example_files/valid_pool.json") as handle:
+        pool_model = PoolModel(json.load(handle), date(2022, 1, 1))
+
+    pricing_json = PriceListModel.to_json(
+        pool_model.price_list_model.get_pricing())
+
+    with pytest.raises(PricingHoursError):
+        pool_model.set_price_list(pricing_json[1:])
+
+    pricing_json[0]["price"] = {"zl": 99, "gr": 0}
+    pool_model.set_price_list(pricing_json)
+
+    assert pool_model.price_list_model.get_pricing()[0].price == Price(99, 0)
+
+
+def test_pool_model_set_current_day():
+    with open("example_files/valid_pool.json") as handle:
+        pool_model = PoolModel(json.load(handle), date(2022, 1, 1))
+
+    pool_model.set_current_day(date(2022, 1, 5))
+    assert pool_model.current_day == date(2022, 1, 5)
+
+    with pytest.raises(ValueError):
+        pool_model.reservation_system_model.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, 4),
+            HoursRange(time(10, 0), time(12, 0)))
+
+    with pytest.raises(TypeError):
+        pool_model.set_current_day("2022-01-05")
@@ -0,0 +1,121 @@
+from config.pool_registry import PoolRegistry
+from config.io_manager import dump_checked
+from config.journal import PoolJournal
+from model.value_types import HoursRange, Services
+from datetime import date, time
+import json
+import shutil
+
+
+def _create_pools_directory(directory) -> None:
+    shutil.copy("example_files/config.json", str(directory / "config.json"))
+    shutil.copy(
+        "example_files/invalid_pool_1.json", str(directory / "invalid.json"))
+
+    with open("example_files/valid_pool.json") as handle:
+        pool_json = json.load(handle)
+
+    for name in ("First", "Second"):
+        pool_json["name"] = name
+
+        with open(str(directory / f"{name.lower()}.json"), "w") as handle:
+            json.dump(pool_json, handle)
+
+
+# Tests for PoolRegistry.load_directory()
+
+def test_pool_registry_load_directory(tmp_path):
+    _create_pools_directory(tmp_path)
+
+    registry = PoolRegistry.from_config(str(tmp_path / "config.json"))
+
+    for use_processes in (True, False):
+        registry = PoolRegistry(registry.admin)
+        errors = registry.load_directory(
+            str(tmp_path), max_workers=2, use_processes=use_processes)
+
+        assert list(errors) == [str(tmp_path / "invalid.json")]
+        assert registry.names() == ["First", "Second"]
+        assert len(registry) == 2
+        assert "First" in registry
+
+        pool_model = registry.get_pool("Second")
+        assert pool_model.current_day == registry.admin.current_day
+        assert registry.get_journal("Second").pool_path == str(
+            tmp_path / "second.json")
+
+
+def test_pool_registry_checked_files(tmp_path):
+    _create_pools_directory(tmp_path)
+
+    with open(str(tmp_path / "first.json")) as handle:
+        pool_json = json.load(handle)
+
+    pool_json["name"] = "Checked"
+    pool_text = dump_checked(pool_json)
+
+    with open(str(tmp_path / "checked.json"), "w") as handle:
+        handle.write(pool_text)
+
+    # The edited file doesn't match its checksum, so it's validated
+
+    with open(str(tmp_path / "edited.json"), "w") as handle:
+        handle.write(pool_text.replace(
+            '"lanes_amount": 5', '"lanes_amount": 2'))
+
+    registry = PoolRegistry.from_config(str(tmp_path / "config.json"))
+    errors = registry.load_files([
+        str(tmp_path / "checked.json"), str(tmp_path / "edited.json")],
+        use_processes=False)
+
+    assert list(errors) == [str(tmp_path / "edited.json")]
+    assert registry.names() == ["Checked"]
+
+
+def test_pool_registry_replays_journal(tmp_path):
+    _create_pools_directory(tmp_path)
+    pool_path = str(tmp_path / "first.json")
+
+    journal = PoolJournal(pool_path)
+    pool_model = journal.load(date(2022, 1, 1))
+    reservation = journal.add_reservation(
+        pool_model, Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(9, 30), time(12, 0)))
+
+    registry = PoolRegistry.from_config(str(tmp_path / "config.json"))
+    registry.admin.set_current_day(date(2022, 1, 1))
+    registry.load_files([pool_path], use_processes=False)
+
+    reservations = registry.get_pool(
+        "First").reservation_system_model.reservations
+    assert len(reservations) == 1
+    assert reservations[0].price == reservation.price
+
+
+def test_pool_registry_day_events(tmp_path):
+    _create_pools_directory(tmp_path)
+    pool_path = str(tmp_path / "first.json")
+
+    journal = PoolJournal(pool_path)
+    journal.compact(journal.load(date(2022, 1, 1)))
+
+    registry = PoolRegistry.from_config(str(tmp_path / "config.json"))
+    registry.admin.set_current_day(date(2022, 1, 2))
+    registry.load_files([pool_path], use_processes=False)
+
+    events = list(registry.get_journal("First").iter_events())
+    assert events == [{
+        "sequence": 1, "operation": "current_day",
+        "current_day": "2022-01-02"}]
+
+
+def test_pool_registry_duplicated_name(tmp_path):
+    _create_pools_directory(tmp_path)
+    registry = PoolRegistry.from_config(str(tmp_path / "config.json"))
+
+    registry.load_files([str(tmp_path / "first.json")], use_processes=False)
+    errors = registry.load_files(
+        [str(tmp_path / "first.json")], use_processes=False)
+
+    assert isinstance(errors[str(tmp_path / "first.json")], ValueError)
+    assert len(registry) == 1
@@ -227,6 +227,47 @@ def test_price_str_0():
     assert str(price) == "0.00 zł"
 
 
+# Tests for Price.__hash__()
+
+def test_price_hash_typical():
+    prices = {Price(3, 12): "a", Price(3, 12): "b", Price(0, 312): "c"}
+    assert prices == {Price(3, 12): "c"}
+
+
+# Tests for Price.from_total_gr()
+
+def test_price_from_total_gr_typical():
+    price = Price.from_total_gr(1234)
+    assert price.zl() == 12
+    assert price.gr() == 34
+
+
+def test_price_from_total_gr_negative():
+    with pytest.raises(NegativePriceError):
+        Price.from_total_gr(-5)
+
+
+def test_price_from_total_gr_wrong_type():
+    with pytest.raises(TypeError):
+        Price.from_total_gr(12.5)
+
+
+# Tests for Price.sum()
+
+def test_price_sum_typical():
+    prices = [Price(2, 47), Price(3, 60), Price(0, 3)]
+    assert Price.sum(prices) == Price(6, 10)
+
+
+def test_price_sum_empty():
+    assert Price.sum([]) == Price(0, 0)
+
+
+def test_price_sum_wrong_type():
+    with pytest.raises(AttributeError):
+        Price.sum([Price(2, 47), 3])
+
+
 # Tests for Price.from_json()
 
 def test_price_from_json_correct():
@@ -656,6 +656,86 @@ def test_price_list_model_get_wrong_service():
         price_list_model.get_pricing(8)
 
 
+# Tests for PriceListModel.calculate_price()
+
+def test_price_list_model_calculate_price_typical():
+    price_list = [
+        PriceListPosition(
+            Services.INDIVIDUAL, WeekDay.MONDAY,
+            HoursRange(time(8, 0), time(14, 30)), Price(2, 30)),
+
+        PriceListPosition(
+            Services.INDIVIDUAL, WeekDay.MONDAY,
+            HoursRange(time(14, 30), time(18, 0)), Price(3, 30)),
+
+        PriceListPosition(
+            Services.SWIMMING_SCHOOL, WeekDay.MONDAY,
+            HoursRange(time(8, 0), time(18, 0)), Price(5, 30)),
+
+        PriceListPosition(
+            Services.INDIVIDUAL, WeekDay.TUESDAY,
+            HoursRange(time(9, 0), time(18, 0)), Price(2, 30)),
+
+        PriceListPosition(
+            Services.SWIMMING_SCHOOL, WeekDay.TUESDAY,
+            HoursRange(time(9, 0), time(18, 0)), Price(1, 30)),
+
+        PriceListPosition(
+            Services.INDIVIDUAL, WeekDay.WEDNESDAY,
+            HoursRange(time(8, 0), time(18, 0)), Price(1, 15)),
+
+        PriceListPosition(
+            Services.SWIMMING_SCHOOL, WeekDay.WEDNESDAY,
+            HoursRange(time(8, 0), time(18, 0)), Price(2, 30)),
+
+        PriceListPosition(
+            Services.INDIVIDUAL, WeekDay.FRIDAY,
+            HoursRange(time(10, 0), time(12, 30)), Price(0, 30)),
+
+        PriceListPosition(
+            Services.INDIVIDUAL, WeekDay.FRIDAY,
+            HoursRange(time(12, 30), time(17, 0)), Price(2, 30)),
+
+        PriceListPosition(
+            Services.SWIMMING_SCHOOL, WeekDay.FRIDAY,
+            HoursRange(time(10, 0), time(14, 30)), Price(5, 90)),
+
+        PriceListPosition(
+            Services.SWIMMING_SCHOOL, WeekDay.FRIDAY,
+            HoursRange(time(14, 30), time(17, 0)), Price(2, 30)),
+
+        PriceListPosition(
+            Services.INDIVIDUAL, WeekDay.SATURDAY,
+            HoursRange(time(11, 0), time(15, 0)), Price(6, 30)),
+
+        PriceListPosition(
+            Services.SWIMMING_SCHOOL, WeekDay.SATURDAY,
+            HoursRange(time(11, 0), time(15, 0)), Price(7, 30)),
+    ]
+
+    price_list_model = PriceListModel(
+        working_hours, PriceListModel.to_json(price_list))
+
+    # Reservation across the hourly price change
+
+    price = price_list_model.calculate_price(
+        Services.INDIVIDUAL, WeekDay.MONDAY,
+        HoursRange(time(13, 30), time(15, 30)))
+    assert price == Price(5, 60)
+
+    # Odd amount of gr per half an hour is rounded down
+
+    price = price_list_model.calculate_price(
+        Services.INDIVIDUAL, WeekDay.WEDNESDAY,
+        HoursRange(time(8, 0), time(9, 30)))
+    assert price == Price(1, 72)
+
+    price = price_list_model.calculate_price(
+        Services.SWIMMING_SCHOOL, WeekDay.FRIDAY,
+        HoursRange(time(10, 0), time(17, 0)))
+    assert price == Price(32, 30)
+
+
 # Tests for PriceListModel.to_json()
 
 def test_price_list_model_to_json_correct():
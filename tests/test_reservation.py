@@ -122,6 +122,42 @@ def test_reservation_from_json_correct():
     assert reservation.price == Price(5, 40)
 
 
+def test_reservation_from_json_with_id():
+    json_dict = {
+        "id": 12,
+        "service": 0,
+        "date": {
+            "day": 25,
+            "month": 4,
+            "year": 2021
+        },
+        "hours_range": {
+            "begin": {
+                "hour": 7,
+                "minute": 30
+            },
+            "end": {
+                "hour": 9,
+                "minute": 0
+            },
+        },
+        "price": {
+            "zl": 5,
+            "gr": 40
+        }
+    }
+
+    reservation = Reservation.from_json(json_dict)
+
+    assert reservation.id == 12
+    assert Reservation.to_json(reservation) == json_dict
+
+    json_dict["id"] = -3
+
+    with pytest.raises(ValueError):
+        Reservation.from_json(json_dict)
+
+
 def test_reservation_from_json_malformed():
     json_dict = {
         "service": 0,
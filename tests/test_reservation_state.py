@@ -0,0 +1,101 @@
+from model.reservation_state import ReservationState
+from model.reservations_model import Reservation, ReservationSystemModel
+from model.value_types import HoursRange, Price, Services
+from tests.test_reservation_system import pool_model
+from datetime import date, time
+import pytest
+
+
+def _create_reservation(day: date, zl: int) -> Reservation:
+    return Reservation(
+        day, HoursRange(time(10, 0), time(12, 0)), Price(zl, 0))
+
+
+# Tests for ReservationState.with_added() and with_removed()
+
+def test_res_state_with_added():
+    first = _create_reservation(date(2022, 2, 1), 10)
+    second = _create_reservation(date(2022, 1, 3), 20)
+    third = _create_reservation(date(2022, 1, 3), 30)
+
+    empty_state = ReservationState()
+    state = empty_state.with_added(first).with_added(second)
+    new_state = state.with_added(third)
+
+    assert len(empty_state) == 0
+    assert list(state) == [second, first]
+    assert list(new_state) == [second, third, first]
+    assert new_state.get_day(date(2022, 1, 3)) == (second, third)
+    assert new_state.dates() == [date(2022, 1, 3), date(2022, 2, 1)]
+
+    # Unchanged months are shared between the states
+
+    assert new_state._years[2022][2] is state._years[2022][2]
+
+
+def test_res_state_with_removed():
+    first = _create_reservation(date(2022, 1, 3), 10)
+    second = _create_reservation(date(2022, 1, 3), 10)
+    state = ReservationState.from_reservations([first, second])
+
+    new_state = state.with_removed(second).with_removed(first)
+
+    assert len(state) == 2
+    assert len(new_state) == 0
+    assert new_state.dates() == []
+    assert state.get_day(date(2022, 1, 3)) == (first, second)
+
+    with pytest.raises(ValueError):
+        new_state.with_removed(first)
+
+
+def test_res_state_years():
+    first = _create_reservation(date(2021, 12, 31), 10)
+    second = _create_reservation(date(2022, 1, 3), 20)
+    state = ReservationState.from_reservations([second, first])
+
+    new_state = state.with_removed(first)
+
+    assert list(state) == [first, second]
+    assert list(new_state) == [second]
+
+    # Years and months left without reservations are removed, the other
+    # ones are shared between the states
+
+    assert 2021 not in new_state._years
+    assert new_state._years[2022] is state._years[2022]
+
+
+# Tests for ReservationState.between() and calculate_total_income()
+
+def test_res_state_between():
+    reservations = [
+        _create_reservation(date(2022, 1, day), day) for day in (3, 31)]
+    reservations.append(_create_reservation(date(2022, 2, 1), 1))
+    reservations.append(_create_reservation(date(2022, 3, 1), 1))
+    state = ReservationState.from_reservations(reservations)
+
+    assert list(state.between(date(2022, 1, 4), date(2022, 2, 1))) == (
+        reservations[1:3])
+    assert state.calculate_total_income(date(2022, 1, 31)) == Price(31, 0)
+    assert state.calculate_total_income(date(2022, 1, 4)) == Price(0, 0)
+
+
+# Tests for ReservationSystemModel.snapshot()
+
+def test_res_system_snapshot_unaffected_by_changes():
+    reservation_system = ReservationSystemModel(pool_model)
+    reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(12, 0)))
+
+    snapshot = reservation_system.snapshot()
+
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(12, 0)), 1)
+    reservation_system.remove_reservation(0)
+
+    assert len(snapshot) == 1
+    assert not hasattr(list(snapshot)[0], "lane")
+    assert [r.lane for r in reservation_system.snapshot()] == [1]
@@ -5,6 +5,8 @@ from exceptions.reservation_exceptions import InvalidLaneError
 from exceptions.reservation_exceptions import ReservationTimeTakenError
 from exceptions.reservation_exceptions import ReservationDurationError
 import pytest
+import sys
+import threading
 
 from model.value_types import HoursRange, Price, Services
 
@@ -432,6 +434,19 @@ def test_res_system_add_incorrect_lane():
                 HoursRange(time(12, 0), time(14, 0)), "abcd")
 
 
+def test_res_system_add_school_without_lane():
+    for use_day_grid in (False, True):
+        reservation_system = ReservationSystemModel(
+            pool_model, use_day_grid=use_day_grid)
+
+        with pytest.raises(InvalidLaneError):
+            reservation_system.add_reservation(
+                Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+                HoursRange(time(12, 0), time(14, 0)))
+
+        assert len(reservation_system) == 0
+
+
 def test_res_system_add_no_tickets_available():
     pool_model.lanes_amount = 1
     reservation_system = ReservationSystemModel(pool_model)
@@ -501,6 +516,175 @@ def test_res_system_add_over_lanes_limit():
     assert proposed_datetime == datetime(2022, 1, 4, 9, 0)
 
 
+def test_res_system_add_taken_lane_same_begin_slot():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(11, 0), time(12, 0)), 2)
+
+    with pytest.raises(ReservationTimeTakenError) as e:
+        reservation_system.add_reservation(
+            Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+            HoursRange(time(10, 30), time(11, 30)), 2)
+
+    proposed_datetime = e.value.proposed_date
+    assert proposed_datetime == datetime(2022, 1, 3, 12, 0)
+
+
+def test_res_system_add_proposal_skips_closed_day():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 5),
+        HoursRange(time(8, 0), time(18, 0)), 3)
+
+    with pytest.raises(ReservationTimeTakenError) as e:
+        reservation_system.add_reservation(
+            Services.SWIMMING_SCHOOL, date(2022, 1, 5),
+            HoursRange(time(16, 0), time(18, 0)), 3)
+
+    proposed_datetime = e.value.proposed_date
+    assert proposed_datetime == datetime(2022, 1, 7, 10, 0)
+
+
+def test_res_system_add_proposal_out_of_horizon():
+    reservation_system = ReservationSystemModel(
+        pool_model, proposal_horizon_days=1)
+
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 5),
+        HoursRange(time(8, 0), time(18, 0)), 3)
+
+    with pytest.raises(ReservationTimeTakenError) as e:
+        reservation_system.add_reservation(
+            Services.SWIMMING_SCHOOL, date(2022, 1, 5),
+            HoursRange(time(16, 0), time(18, 0)), 3)
+
+    assert e.value.proposed_date is None
+
+
+def test_res_system_add_proposal_impossible(monkeypatch):
+    monkeypatch.setattr(pool_model, "lanes_amount", 1)
+    reservation_system = ReservationSystemModel(pool_model)
+
+    with pytest.raises(ReservationTimeTakenError) as e:
+        reservation_system.add_reservation(
+            Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+            HoursRange(time(10, 0), time(12, 0)), 0)
+
+    assert e.value.proposed_date is None
+
+
+def test_res_system_add_concurrent():
+    reservation_system = ReservationSystemModel(pool_model)
+    results = []
+
+    def add_reservations(day: int) -> None:
+        for i in range(10):
+            try:
+                reservation_system.add_reservation(
+                    Services.INDIVIDUAL, date(2022, 1, day),
+                    HoursRange(time(10, 0), time(12, 0)))
+                results.append(day)
+            except ReservationTimeTakenError:
+                pass
+
+    threads = [
+        threading.Thread(target=add_reservations, args=(day,))
+        for day in (3, 3, 3, 3, 4, 4, 4, 4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert results.count(3) == 25
+    assert results.count(4) == 25
+    assert len(reservation_system.reservations) == 50
+    assert reservation_system.available_tickets(
+        datetime(2022, 1, 3, 11, 0)) == 0
+
+
+def test_res_system_read_while_writing():
+    reservation_system = ReservationSystemModel(pool_model)
+    date_time = datetime(2022, 1, 3, 11, 0)
+    written = threading.Event()
+    errors = []
+
+    def write_reservations() -> None:
+        for i in range(1000):
+            school = reservation_system.add_reservation(
+                Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+                HoursRange(time(10, 0), time(12, 0)), i % 2)
+            individual = reservation_system.add_reservation(
+                Services.INDIVIDUAL, date(2022, 1, 3),
+                HoursRange(time(10, 0), time(12, 0)))
+            reservation_system.remove_reservation(school.id)
+            reservation_system.remove_reservation(individual.id)
+
+        written.set()
+
+    def read_reservations() -> None:
+        while not written.is_set():
+            try:
+                reservation_system.available_lanes(date_time)
+                reservation_system.available_tickets(date_time)
+                reservation_system.is_lane_taken(0, date_time)
+                reservation_system.reservations_amount(
+                    Services.SWIMMING_SCHOOL, date_time)
+                reservation_system.get_reservations(Services.INDIVIDUAL)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write_reservations)] + [
+        threading.Thread(target=read_reservations) for i in range(4)]
+
+    # Threads are switched as often as possible to make the races likely
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    try:
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    assert reservation_system.reservations == []
+
+
+def test_res_system_list_without_reservations_lock():
+    # Listing doesn't wait for the lock held while a reservation is changed
+
+    reservation_system = ReservationSystemModel(pool_model)
+
+    for day in (4, 3):
+        reservation_system.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, day),
+            HoursRange(time(10, 0), time(12, 0)))
+
+    results = []
+
+    def list_reservations() -> None:
+        results.append(reservation_system.reservations)
+        results.append(
+            reservation_system.get_reservations(Services.INDIVIDUAL))
+
+    with reservation_system._reservations_lock:
+        thread = threading.Thread(target=list_reservations)
+        thread.start()
+        thread.join(1)
+
+    assert not thread.is_alive()
+    assert [[r.id for r in result] for result in results] == [[1, 0]] * 2
+
+
 # Tests for ReservationSystemModel.calculate_total_income():
 
 def test_res_system_total_income_typical():
@@ -553,6 +737,93 @@ def test_res_system_available_lanes_wrong_day():
         reservation_system.available_lanes("abcd")
 
 
+# Tests for ReservationSystemModel.day_availability():
+
+def test_res_system_day_availability_typical():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(8, 0), time(17, 30)), 3)
+
+    for i in range(3):
+        reservation_system.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, 3),
+            HoursRange(time(9, 30), time(12, 0)))
+
+    availability = reservation_system.day_availability(date(2022, 1, 3))
+
+    assert len(availability) == 20
+    assert availability[0].hours_range == HoursRange(time(8, 0), time(8, 30))
+    assert availability[-1].hours_range == HoursRange(
+        time(17, 30), time(18, 0))
+
+    for slot in availability:
+        date_time = datetime.combine(
+            date(2022, 1, 3), slot.hours_range.begin)
+        date_time = date_time.replace(minute=date_time.minute + 15)
+
+        assert slot.available_lanes == reservation_system.available_lanes(
+            date_time)
+        assert slot.available_tickets == (
+            reservation_system.available_tickets(date_time))
+
+    assert availability[4].available_tickets == 17
+    assert availability[-1].available_lanes == [0, 1, 2, 3, 4]
+
+
+def test_res_system_day_availability_closed():
+    reservation_system = ReservationSystemModel(pool_model)
+    assert reservation_system.day_availability(date(2022, 1, 6)) == []
+
+
+def test_res_system_day_availability_wrong_day():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    with pytest.raises(ValueError):
+        reservation_system.day_availability(date(2021, 12, 30))
+
+
+# Tests for ReservationSystemModel.availability_calendar():
+
+def test_res_system_availability_calendar_typical():
+    reservation_system = ReservationSystemModel(
+        pool_model, use_day_grid=False)
+
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 4),
+        HoursRange(time(9, 0), time(10, 0)), 1)
+    reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 7),
+        HoursRange(time(10, 0), time(11, 0)))
+
+    calendar = reservation_system.availability_calendar(
+        date(2022, 1, 3), date(2022, 1, 9))
+
+    assert list(calendar) == [date(2022, 1, d) for d in range(3, 10)]
+    assert len(calendar[date(2022, 1, 3)]) == 20
+    assert calendar[date(2022, 1, 6)] == []
+    assert calendar[date(2022, 1, 9)] == []
+    assert calendar[date(2022, 1, 4)][0].available_lanes == [0, 2, 3, 4]
+    assert calendar[date(2022, 1, 4)][0].available_tickets == 20
+    assert calendar[date(2022, 1, 4)][2].available_tickets == 25
+    assert calendar[date(2022, 1, 7)][0].available_tickets == 24
+    assert calendar[date(2022, 1, 4)] == reservation_system.day_availability(
+        date(2022, 1, 4))
+
+
+def test_res_system_availability_calendar_wrong_dates():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    with pytest.raises(ValueError):
+        reservation_system.availability_calendar(
+            date(2021, 12, 30), date(2022, 1, 5))
+
+    with pytest.raises(ValueError):
+        reservation_system.availability_calendar(
+            date(2022, 1, 5), date(2022, 1, 3))
+
+
 # Tests for ReservationSystemModel.is_lane_taken():
 
 def test_res_system_lane_taken_typical():
@@ -648,6 +919,117 @@ def test_res_system_reservations_amount_no_reservations():
     assert school_amount == 0
 
 
+# Tests for ReservationSystemModel.iter_reservations()
+
+def test_res_system_iter_reservations_filters():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 7),
+        HoursRange(time(11, 30), time(14, 0)))
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(16, 0)), 3)
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 4),
+        HoursRange(time(10, 0), time(12, 0)), 1)
+    reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(9, 30), time(12, 0)))
+
+    all_dates = [
+        r.date for r in reservation_system.iter_reservations()]
+    schools = list(reservation_system.iter_reservations(
+        Services.SWIMMING_SCHOOL))
+    in_range = list(reservation_system.iter_reservations(
+        begin_date=date(2022, 1, 4), end_date=date(2022, 1, 7)))
+    on_lane = list(reservation_system.iter_reservations(lane=3))
+
+    assert all_dates == [
+        date(2022, 1, 3), date(2022, 1, 3), date(2022, 1, 4),
+        date(2022, 1, 7)]
+    assert [r.lane for r in schools] == [3, 1]
+    assert [r.date for r in in_range] == [date(2022, 1, 4), date(2022, 1, 7)]
+    assert len(on_lane) == 1 and on_lane[0].date == date(2022, 1, 3)
+
+
+def test_res_system_iter_reservations_pages():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    for hour in range(9, 17):
+        reservation_system.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, 3),
+            HoursRange(time(hour, 0), time(hour + 1, 0)))
+
+    page = list(reservation_system.iter_reservations(offset=3, limit=2))
+    last_page = list(reservation_system.iter_reservations(offset=6, limit=5))
+
+    assert [r.hours_range.begin for r in page] == [time(12, 0), time(13, 0)]
+    assert len(last_page) == 2
+    assert list(reservation_system.iter_reservations(offset=8)) == []
+
+    with pytest.raises(ValueError):
+        reservation_system.iter_reservations(offset=-1)
+
+
+def test_res_system_iter_reservations_past_records(monkeypatch):
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(9, 30), time(12, 0)))
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 5),
+        HoursRange(time(10, 0), time(16, 0)), 3)
+
+    reservations_json = ReservationSystemModel.to_json(
+        reservation_system.reservations)
+
+    monkeypatch.setattr(pool_model, "current_day", date(2022, 1, 4))
+    lazy_system = ReservationSystemModel(
+        pool_model, reservations_json, lazy=True)
+
+    reservations = list(lazy_system.iter_reservations())
+    individuals = list(lazy_system.iter_reservations(Services.INDIVIDUAL))
+    upcoming = list(lazy_system.iter_reservations(
+        begin_date=date(2022, 1, 4)))
+
+    assert [r.date for r in reservations] == [
+        date(2022, 1, 3), date(2022, 1, 5)]
+    assert [r.date for r in individuals] == [date(2022, 1, 3)]
+    assert upcoming == lazy_system.reservations
+
+
+def test_res_system_iter_reservations_decodes_page(monkeypatch):
+    # Skipped past records aren't decoded
+
+    reservation_system = ReservationSystemModel(pool_model)
+
+    for day in (3, 4, 5):
+        reservation_system.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, day),
+            HoursRange(time(9, 30), time(12, 0)))
+
+    reservations_json = ReservationSystemModel.to_json(
+        reservation_system.reservations)
+    lazy_system = ReservationSystemModel(
+        PoolModel(pool_json, date(2022, 1, 6)), reservations_json, lazy=True)
+
+    decoded = []
+    reservation_from_json = ReservationSystemModel.reservation_from_json
+
+    def count_decoded(reservation_json: dict):
+        decoded.append(reservation_json["id"])
+        return reservation_from_json(reservation_json)
+
+    monkeypatch.setattr(
+        ReservationSystemModel, "reservation_from_json", count_decoded)
+    page = list(lazy_system.iter_reservations(offset=1, limit=1))
+
+    assert [r.date for r in page] == [date(2022, 1, 4)]
+    assert decoded == [1]
+
+
 # Tests for ReservationSystemModel.to_json()
 
 def test_res_system_to_json_correct():
@@ -663,6 +1045,7 @@ def test_res_system_to_json_correct():
 
     expected_list = [
         {
+            "id": 0,
             "service": 0,
             "date": {
                 "day": 3,
@@ -685,6 +1068,7 @@ def test_res_system_to_json_correct():
             }
         },
         {
+            "id": 1,
             "service": 1,
             "lane": 3,
             "date": {
@@ -716,3 +1100,164 @@ def test_res_system_to_json_correct():
 def test_res_system_to_json_wrong_object():
     with pytest.raises(TypeError):
         ReservationSystemModel.to_json(245)
+
+
+# Tests for ReservationSystemModel.remove_reservation()
+
+def test_res_system_remove_typical():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(16, 0)), 3)
+
+    removed = reservation_system.remove_reservation(0)
+    date_time = datetime(2022, 1, 3, 11, 0)
+
+    assert removed.lane == 3
+    assert reservation_system.reservations == []
+    assert not reservation_system.is_lane_taken(3, date_time)
+
+
+def test_res_system_remove_wrong_id():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    with pytest.raises(ValueError):
+        reservation_system.remove_reservation(0)
+
+
+def test_res_system_remove_stable_ids():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    for hour in range(9, 12):
+        reservation_system.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, 3),
+            HoursRange(time(hour, 0), time(hour + 1, 0)))
+
+    reservation_system.remove_reservation(0)
+    added = reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 4),
+        HoursRange(time(9, 0), time(10, 0)))
+    removed = reservation_system.remove_reservation(2)
+
+    assert removed.hours_range.begin == time(11, 0)
+    assert added.id == 3
+    assert [r.id for r in reservation_system.reservations] == [1, 3]
+    assert reservation_system.get_reservation(1).hours_range.begin == (
+        time(10, 0))
+
+    with pytest.raises(ValueError):
+        reservation_system.remove_reservation(2)
+
+    with pytest.raises(ValueError):
+        reservation_system.get_reservation(0)
+
+
+# Tests for ReservationSystemModel reservation IDs
+
+def test_res_system_ids_given_while_loading():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    for day in (3, 4, 5):
+        reservation_system.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, day),
+            HoursRange(time(9, 0), time(10, 0)))
+
+    reservations_json = ReservationSystemModel.to_json(
+        reservation_system.reservations)
+    reservations_json[0].pop("id")
+    reservations_json[1]["id"] = 7
+
+    loaded_system = ReservationSystemModel(pool_model, reservations_json)
+
+    assert [r.id for r in loaded_system.reservations] == [8, 7, 2]
+    assert loaded_system.next_id == 9
+
+    loaded_system = ReservationSystemModel(
+        pool_model, reservations_json, next_id=20)
+    assert [r.id for r in loaded_system.reservations] == [20, 7, 2]
+
+    reservations_json[1]["id"] = 2
+
+    with pytest.raises(ValueError):
+        ReservationSystemModel(pool_model, reservations_json)
+
+
+def test_res_system_remove_matching_by_id():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    for i in range(2):
+        reservation_system.add_reservation(
+            Services.INDIVIDUAL, date(2022, 1, 3),
+            HoursRange(time(9, 0), time(10, 0)))
+
+    reservation_json = ReservationSystemModel.reservation_to_json(
+        reservation_system.reservations[1])
+    reservation_system.remove_matching_reservation(reservation_json)
+
+    assert [r.id for r in reservation_system.reservations] == [0]
+
+    reservation_json.pop("id")
+    assert reservation_system.find_reservation(reservation_json) == 0
+
+
+# Tests for ReservationSystemModel lazy loading of past reservations
+
+def test_res_system_lazy_past_records(monkeypatch):
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(9, 30), time(12, 0)))
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 5),
+        HoursRange(time(10, 0), time(16, 0)), 3)
+
+    reservations_json = ReservationSystemModel.to_json(
+        reservation_system.reservations)
+
+    monkeypatch.setattr(pool_model, "current_day", date(2022, 1, 4))
+    lazy_system = ReservationSystemModel(
+        pool_model, reservations_json, lazy=True)
+
+    assert len(lazy_system.reservations) == 1
+    assert lazy_system.reservations[0].date == date(2022, 1, 5)
+
+    past = list(lazy_system.past_reservations())
+    assert len(past) == 1
+    assert past[0].date == date(2022, 1, 3)
+
+    assert len(lazy_system.get_reservations()) == 2
+    assert len(lazy_system.get_reservations(Services.INDIVIDUAL)) == 1
+    assert lazy_system.reservations_to_json() == reservations_json
+
+    lazy_system.remove_matching_reservation(reservations_json[0])
+    assert lazy_system.reservations_to_json() == reservations_json[1:]
+
+
+def test_res_system_lazy_past_records_by_id():
+    reservation_system = ReservationSystemModel(pool_model)
+
+    reservation_system.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(9, 30), time(12, 0)))
+    reservation_system.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(16, 0)), 3)
+
+    reservations_json = ReservationSystemModel.to_json(
+        reservation_system.reservations)
+    lazy_system = ReservationSystemModel(
+        PoolModel(pool_json, date(2022, 1, 4)), reservations_json, lazy=True)
+
+    assert lazy_system.reservations == []
+    assert len(lazy_system) == 2
+    assert lazy_system.get_reservation(1).lane == 3
+
+    removed = lazy_system.remove_reservation(1)
+    assert removed.lane == 3
+    assert len(lazy_system) == 1
+    assert lazy_system.reservations_to_json() == reservations_json[:1]
+
+    with pytest.raises(ValueError):
+        lazy_system.get_reservation(1)
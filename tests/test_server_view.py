@@ -0,0 +1,208 @@
+from config.pool_registry import PoolRegistry
+from view import server_view
+from view.server_view import ReservationServer, MAX_LIMIT
+import asyncio
+import json
+import shutil
+
+
+def _create_server(directory) -> ReservationServer:
+    shutil.copy("example_files/config.json", str(directory / "config.json"))
+    shutil.copy("example_files/valid_pool.json", str(directory / "pool.json"))
+
+    registry = PoolRegistry.from_config(str(directory / "config.json"))
+    registry.load_directory(str(directory), use_processes=False)
+
+    return ReservationServer(registry)
+
+
+def _request(
+        server: ReservationServer, method: str, target: str,
+        content: dict = None) -> tuple[int, object]:
+    body = b"" if content is None else json.dumps(content).encode("utf-8")
+    return asyncio.run(server.handle_request(method, target, body))
+
+
+def _reservation_json(lane: int = None) -> dict:
+    reservation_json = {
+        "service": 0 if lane is None else 1,
+        "date": {"day": 3, "month": 1, "year": 2022},
+        "hours_range": {
+            "begin": {"hour": 10, "minute": 0},
+            "end": {"hour": 12, "minute": 0}
+        }
+    }
+
+    if lane is not None:
+        reservation_json["lane"] = lane
+
+    return reservation_json
+
+
+# Tests for ReservationServer.handle_request() reading the pools
+
+def test_server_get_pools(tmp_path):
+    server = _create_server(tmp_path)
+
+    assert _request(server, "GET", "/pools") == (200, {
+        "pools": ["MyPool"], "current_day": "2022-01-01"})
+
+    status, content = _request(server, "GET", "/pools/MyPool")
+    assert status == 200
+    assert content["name"] == "MyPool"
+    assert "reservations" not in content
+
+
+def test_server_get_price_list(tmp_path):
+    server = _create_server(tmp_path)
+
+    status, content = _request(
+        server, "GET", "/pools/MyPool/price-list?service=1")
+
+    assert status == 200
+    assert content
+    assert all(position["service"] == 1 for position in content)
+
+
+def test_server_get_availability(tmp_path):
+    server = _create_server(tmp_path)
+
+    assert _request(
+        server, "GET", "/pools/MyPool/availability?datetime=2022-01-03T10:00"
+    ) == (200, {
+        "datetime": "2022-01-03T10:00:00",
+        "available_lanes": [0, 1, 2, 3, 4],
+        "available_tickets": 25})
+
+    status, _ = _request(server, "GET", "/pools/MyPool/availability")
+    assert status == 400
+
+
+def test_server_get_income(tmp_path):
+    server = _create_server(tmp_path)
+
+    assert _request(server, "GET", "/pools/MyPool/income") == (200, {
+        "day": "2022-01-01", "income": {"zl": 0, "gr": 0}})
+
+
+def test_server_get_reservations_limit(tmp_path, monkeypatch):
+    server = _create_server(tmp_path)
+
+    for lane in (None, 1):
+        _request(
+            server, "POST", "/pools/MyPool/reservations",
+            _reservation_json(lane))
+
+    monkeypatch.setattr(server_view, "DEFAULT_LIMIT", 1)
+
+    status, content = _request(server, "GET", "/pools/MyPool/reservations")
+    assert status == 200
+    assert [reservation["id"] for reservation in content] == [0]
+
+    status, content = _request(
+        server, "GET", "/pools/MyPool/reservations?offset=1&limit=5")
+    assert [reservation["lane"] for reservation in content] == [1]
+
+    status, _ = _request(
+        server, "GET",
+        f"/pools/MyPool/reservations?limit={MAX_LIMIT + 1}")
+    assert status == 400
+
+
+def test_server_read_during_change(tmp_path):
+    # Reads don't wait for the pool's change in progress
+
+    server = _create_server(tmp_path)
+
+    async def read_while_locked() -> tuple[int, object]:
+        async with server._locks["MyPool"]:
+            return await asyncio.wait_for(server.handle_request(
+                "GET", "/pools/MyPool/reservations"), 1)
+
+    assert asyncio.run(read_while_locked()) == (200, [])
+
+
+# Tests for ReservationServer.handle_request() changing the pools
+
+def test_server_add_and_remove_reservation(tmp_path):
+    server = _create_server(tmp_path)
+
+    status, content = _request(
+        server, "POST", "/pools/MyPool/reservations", _reservation_json(2))
+    assert status == 201
+    assert content["id"] == 0
+    assert content["lane"] == 2
+
+    status, content = _request(
+        server, "GET", "/pools/MyPool/reservations?lane=2")
+    assert [reservation["id"] for reservation in content] == [0]
+
+    status, content = _request(
+        server, "DELETE", "/pools/MyPool/reservations/0")
+    assert status == 200
+    assert content["id"] == 0
+
+    status, _ = _request(server, "DELETE", "/pools/MyPool/reservations/0")
+    assert status == 404
+
+    assert _request(server, "GET", "/pools/MyPool/reservations") == (200, [])
+
+
+def test_server_add_taken_reservation(tmp_path):
+    server = _create_server(tmp_path)
+
+    _request(
+        server, "POST", "/pools/MyPool/reservations", _reservation_json(0))
+    status, content = _request(
+        server, "POST", "/pools/MyPool/reservations", _reservation_json(1))
+
+    assert status == 409
+    assert content["proposed_date"] == "2022-01-03T12:00:00"
+
+
+def test_server_add_reservation_wrong_types(tmp_path):
+    server = _create_server(tmp_path)
+
+    reservation_json = _reservation_json(1)
+    reservation_json["lane"] = "1"
+
+    status, content = _request(
+        server, "POST", "/pools/MyPool/reservations", reservation_json)
+    assert status == 400
+    assert content == {"error": "lane must be of type int."}
+
+    reservation_json = _reservation_json()
+    reservation_json["date"]["day"] = "3"
+
+    status, content = _request(
+        server, "POST", "/pools/MyPool/reservations", reservation_json)
+    assert status == 400
+    assert content == {"error": "reservation.date.day must be of type int."}
+
+    status, _ = _request(server, "POST", "/pools/MyPool/reservations", [])
+    assert status == 400
+
+
+# Tests for ReservationServer.handle_request() with wrong resources
+
+def test_server_not_found(tmp_path):
+    server = _create_server(tmp_path)
+
+    for method, target in (
+            ("GET", "/"), ("GET", "/other"), ("GET", "/pools/Other"),
+            ("GET", "/pools/MyPool/other"),
+            ("DELETE", "/pools/MyPool/reservations/abc")):
+        status, _ = _request(server, method, target)
+        assert status == 404
+
+
+def test_server_method_not_allowed(tmp_path):
+    server = _create_server(tmp_path)
+
+    for method, target in (
+            ("POST", "/pools"), ("DELETE", "/pools/MyPool"),
+            ("POST", "/pools/MyPool/income"),
+            ("PUT", "/pools/MyPool/reservations"),
+            ("GET", "/pools/MyPool/reservations/0")):
+        status, _ = _request(server, method, target)
+        assert status == 405
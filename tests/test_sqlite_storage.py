@@ -0,0 +1,200 @@
+from config.sqlite_storage import SQLitePoolStorage
+from model.pool_model import PoolModel
+from model.reservations_model import Reservation
+from model.value_types import HoursRange, Price, Services
+from datetime import date, datetime, time
+import json
+import pytest
+import sqlite3
+
+
+def _create_pool_model(current_day: date = date(2022, 1, 1)) -> PoolModel:
+    with open("example_files/valid_pool.json") as handle:
+        pool_model = PoolModel(json.load(handle), current_day)
+
+    res_sys_model = pool_model.reservation_system_model
+    res_sys_model.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 3),
+        HoursRange(time(9, 30), time(12, 0)))
+    res_sys_model.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 3),
+        HoursRange(time(10, 0), time(16, 0)), 3)
+    res_sys_model.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 4),
+        HoursRange(time(10, 0), time(12, 0)))
+
+    return pool_model
+
+
+# Tests for SQLitePoolStorage.write_pool_model() and read_pool_model()
+
+def test_sqlite_write_read_correct():
+    pool_model = _create_pool_model()
+    storage = SQLitePoolStorage(":memory:")
+    storage.write_pool_model(pool_model)
+
+    loaded_model = storage.read_pool_model(date(2022, 1, 1))
+
+    assert PoolModel.to_json(loaded_model) == PoolModel.to_json(pool_model)
+    storage.close()
+
+
+def test_sqlite_read_since_current_day():
+    storage = SQLitePoolStorage(":memory:")
+    storage.write_pool_model(_create_pool_model())
+
+    loaded_model = storage.read_pool_model(date(2022, 1, 4))
+    reservations = loaded_model.reservation_system_model.reservations
+
+    assert len(reservations) == 1
+    assert reservations[0].date == date(2022, 1, 4)
+    assert reservations[0].id == 2
+    assert loaded_model.reservation_system_model.next_id == 3
+
+    loaded_model = storage.read_pool_model(
+        date(2022, 1, 4), since=date(2022, 1, 1))
+    assert len(loaded_model.reservation_system_model.reservations) == 3
+    storage.close()
+
+
+def test_sqlite_read_partial_then_write():
+    storage = SQLitePoolStorage(":memory:")
+    storage.write_pool_model(_create_pool_model())
+
+    loaded_model = storage.read_pool_model(date(2022, 1, 4))
+    loaded_model.reservation_system_model.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 10),
+        HoursRange(time(9, 0), time(10, 0)))
+    storage.write_pool_model(loaded_model)
+
+    assert [r.date for r in storage.iter_reservations()] == [
+        date(2022, 1, 3), date(2022, 1, 3), date(2022, 1, 4),
+        date(2022, 1, 10)]
+    storage.close()
+
+
+def test_sqlite_write_reservations_before_since():
+    storage = SQLitePoolStorage(":memory:")
+    storage.write_pool_model(_create_pool_model())
+
+    with pytest.raises(ValueError):
+        storage.read_pool_model(date(2022, 1, 1), since=date(2022, 1, 10))
+
+    # Reservations before the since date added to the model are saved too,
+    # while the removed ones are deleted
+
+    loaded_model = storage.read_pool_model(date(2022, 1, 4))
+    res_sys_model = loaded_model.reservation_system_model
+    res_sys_model.insert_reservation(Reservation(
+        date(2022, 1, 3), HoursRange(time(13, 0), time(14, 0)),
+        Price(5, 30)))
+    res_sys_model.remove_reservation(2)
+    storage.write_pool_model(loaded_model)
+
+    reservations = list(storage.iter_reservations())
+    assert [r.id for r in reservations] == [0, 1, 3]
+    assert reservations[2].hours_range == HoursRange(time(13, 0), time(14, 0))
+    storage.close()
+
+
+def test_sqlite_read_empty_database():
+    storage = SQLitePoolStorage(":memory:")
+
+    with pytest.raises(ValueError):
+        storage.read_pool_model(date(2022, 1, 1))
+
+    storage.close()
+
+
+# Tests for SQLitePoolStorage.insert_reservation() and delete_reservation()
+
+def test_sqlite_insert_delete_reservation():
+    pool_model = _create_pool_model()
+    storage = SQLitePoolStorage(":memory:")
+    storage.write_pool_model(pool_model)
+
+    res_sys_model = pool_model.reservation_system_model
+    reservation = res_sys_model.add_reservation(
+        Services.SWIMMING_SCHOOL, date(2022, 1, 4),
+        HoursRange(time(10, 0), time(12, 0)), 1)
+    storage.insert_reservation(reservation)
+
+    assert len(list(storage.iter_reservations(lane=1))) == 1
+
+    storage.delete_reservation(reservation)
+    assert list(storage.iter_reservations(lane=1)) == []
+
+    with pytest.raises(ValueError):
+        storage.delete_reservation(reservation)
+
+    storage.close()
+
+
+def test_sqlite_deleted_reservation_id_not_reused():
+    pool_model = _create_pool_model()
+    storage = SQLitePoolStorage(":memory:")
+    storage.write_pool_model(pool_model)
+
+    res_sys_model = pool_model.reservation_system_model
+    reservation = res_sys_model.add_reservation(
+        Services.INDIVIDUAL, date(2022, 1, 4),
+        HoursRange(time(13, 0), time(14, 0)))
+    storage.insert_reservation(reservation)
+    storage.delete_reservation(reservation)
+
+    loaded_model = storage.read_pool_model(date(2022, 1, 1))
+    assert loaded_model.reservation_system_model.next_id == 4
+
+    res_sys_model.remove_reservation(2)
+    storage.write_pool_model(pool_model)
+
+    loaded_model = storage.read_pool_model(date(2022, 1, 1))
+    assert loaded_model.reservation_system_model.next_id == 4
+    storage.close()
+
+
+def test_sqlite_database_without_next_id(tmp_path):
+    database_path = str(tmp_path / "pool.db")
+    storage = SQLitePoolStorage(database_path)
+    storage.write_pool_model(_create_pool_model())
+    storage.close()
+
+    # Recreate the pool table the way it was before the next ID was saved
+
+    connection = sqlite3.connect(database_path)
+
+    with connection:
+        connection.executescript(
+            "DROP TABLE pool; CREATE TABLE pool (id INTEGER PRIMARY KEY "
+            + "CHECK (id = 0), name TEXT NOT NULL, lanes_amount INTEGER "
+            + "NOT NULL); INSERT INTO pool VALUES (0, 'MyPool', 5);")
+
+    connection.close()
+
+    storage = SQLitePoolStorage(database_path)
+    loaded_model = storage.read_pool_model(date(2022, 1, 1))
+
+    assert loaded_model.reservation_system_model.next_id == 3
+    storage.close()
+
+
+# Tests for SQLitePoolStorage queries
+
+def test_sqlite_queries_typical():
+    storage = SQLitePoolStorage(":memory:")
+    storage.write_pool_model(_create_pool_model())
+    date_time = datetime(2022, 1, 3, 11, 0)
+
+    assert storage.available_lanes(date_time, 5) == [0, 1, 2, 4]
+    assert storage.available_lanes(datetime(2022, 1, 3, 10, 0), 5) == [
+        0, 1, 2, 3, 4]
+    assert storage.reservations_amount(Services.INDIVIDUAL, date_time) == 1
+    assert storage.reservations_amount(
+        Services.SWIMMING_SCHOOL, date_time) == 1
+    assert storage.calculate_total_income(date(2022, 1, 3)) == Price(45, 5)
+    assert storage.calculate_total_income(date(2022, 1, 5)) == Price(0, 0)
+
+    individual = list(storage.iter_reservations(
+        Services.INDIVIDUAL, begin_date=date(2022, 1, 4)))
+    assert len(individual) == 1
+    storage.close()
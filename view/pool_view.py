@@ -1,12 +1,13 @@
-from config.io_manager import (
-    write_pool_model, read_pool_model,
-    read_config, does_config_exist)
+from config.io_manager import read_config, does_config_exist
 from config.admin import Admin
+from config.journal import PoolJournal
 from model.pool_model import PoolModel
 from view.operations_view import print_operations
-from datetime import date, datetime, time, timedelta
+from datetime import date, time, timedelta
 from model.value_types import Services, HoursRange, WeekDay
-import os
+
+
+PAGE_SIZE = 10
 
 
 def _config_initialization() -> Admin:
@@ -36,17 +37,16 @@ def _config_initialization() -> Admin:
     return admin
 
 
-def _pool_initialization(pool_path: str) -> PoolModel:
+def _pool_initialization(journal: PoolJournal) -> PoolModel:
     """
-    Creates new instance of the PoolModel based on the config file and
-    initial pool file path and returns it.
+    Creates new instance of the PoolModel based on the config file, initial
+    pool file and its journal and returns it.
     """
 
     admin = _config_initialization()
 
     try:
-        with open(pool_path) as handle:
-            pool_model = read_pool_model(handle, admin.current_day)
+        pool_model = journal.load(admin.current_day)
     except Exception as e:
         print("An error has occurred while reading the pool file.")
         print(str(e))
@@ -55,19 +55,7 @@ def _pool_initialization(pool_path: str) -> PoolModel:
     return pool_model
 
 
-def _save_pool_model(pool_model: PoolModel, pool_path: str) -> None:
-    """
-    Saves PoolModel to a JSON file.
-    """
-
-    with open(pool_path) as f:
-        file_name = os.path.basename(f.name)
-
-    with open(file_name, "w") as handle:
-        write_pool_model(handle, pool_model)
-
-
-def _add_reservation(pool_model: PoolModel, pool_path: str) -> None:
+def _add_reservation(pool_model: PoolModel, journal: PoolJournal) -> None:
     """
     Handles user's interaction for adding new reservation.
     """
@@ -112,11 +100,8 @@ def _add_reservation(pool_model: PoolModel, pool_path: str) -> None:
             res_lane = int(
                 selected_lane) - 1 if selected_lane is not None else None
 
-            res_sys_model = pool_model.reservation_system_model
-            reservation = res_sys_model.add_reservation(
-                res_service, res_date, res_hours_range, res_lane)
-
-            _save_pool_model(pool_model, pool_path)
+            reservation = journal.add_reservation(
+                pool_model, res_service, res_date, res_hours_range, res_lane)
 
         except Exception as e:
             print("An error has occurred while adding new reservation.")
@@ -153,16 +138,43 @@ def _view_reservations(pool_model: PoolModel) -> None:
             res_filter = None
 
     res_sys_model = pool_model.reservation_system_model
+    offset = 0
 
-    reservations = res_sys_model.get_reservations(res_filter)
-    res_amount = len(reservations)
+    while True:
+        # One more reservation than the page size is fetched to know,
+        # if there's a next page
+
+        page = list(res_sys_model.iter_reservations(
+            res_filter, offset=offset, limit=PAGE_SIZE + 1))
+
+        if not page and offset == 0:
+            print("\nThere are no reservations yet.\n")
+            return
 
-    print(f"\nReservations amount: {res_amount}\n")
+        has_next_page = len(page) > PAGE_SIZE
+        page = page[:PAGE_SIZE]
+        print(f"\nReservations {offset + 1}-{offset + len(page)}:\n")
 
-    index = 1
-    for reservation in reservations:
-        print(f"{index}. {reservation}\n")
-        index += 1
+        for reservation in page:
+            print(f"ID {reservation.id}. {reservation}\n")
+
+        page_actions = []
+
+        if has_next_page:
+            page_actions.append("Next page")
+        if offset > 0:
+            page_actions.append("Previous page")
+        page_actions.append("Back")
+
+        selected_action = page_actions[print_operations(page_actions)]
+
+        match selected_action:
+            case "Next page":
+                offset += PAGE_SIZE
+            case "Previous page":
+                offset -= PAGE_SIZE
+            case "Back":
+                return
 
 
 def _view_price_list(pool_model: PoolModel) -> None:
@@ -226,30 +238,18 @@ def _view_tickets_amount(pool_model: PoolModel) -> None:
     Shows information about available tickets for particular time periods.
     """
 
-    current_day = pool_model.current_day
-    current_weekday = WeekDay(current_day.weekday())
+    res_sys_model = pool_model.reservation_system_model
+    availability = res_sys_model.day_availability(pool_model.current_day)
 
-    try:
-        begin_time = pool_model.working_hours[current_weekday].begin
-        end_time = pool_model.working_hours[current_weekday].end
-    except Exception:
+    if not availability:
         print("An error has occurred while viewing tickets amount.")
         print("Today the pool is closed.")
         return
 
-    current_datetime = datetime.combine(current_day, begin_time)
-
     print("\nAvailable tickets for particular time periods:")
 
-    while current_datetime.time() < end_time:
-        current_begin = current_datetime.time()
-        current_end = (current_datetime + timedelta(minutes=30)).time()
-        current_range = HoursRange(current_begin, current_end)
-        tickets = pool_model.reservation_system_model.available_tickets(
-            current_datetime + timedelta(minutes=15))
-
-        print(f"{current_range}: {tickets} tickets")
-        current_datetime += timedelta(minutes=30)
+    for slot in availability:
+        print(f"{slot.hours_range}: {slot.available_tickets} tickets")
 
     print()
 
@@ -259,60 +259,84 @@ def _view_free_lanes(pool_model: PoolModel) -> None:
     Shows information about available lanes for particular time periods.
     """
 
-    current_day = pool_model.current_day
-    current_weekday = WeekDay(current_day.weekday())
+    res_sys_model = pool_model.reservation_system_model
+    availability = res_sys_model.day_availability(pool_model.current_day)
 
-    try:
-        begin_time = pool_model.working_hours[current_weekday].begin
-        end_time = pool_model.working_hours[current_weekday].end
-    except Exception:
+    if not availability:
         print("An error has occurred while viewing free lanes.")
         print("Today the pool is closed.")
         return
 
-    current_datetime = datetime.combine(current_day, begin_time)
-
     print("\nAvailable lanes for particular time periods:")
 
-    while current_datetime.time() < end_time:
-        current_begin = current_datetime.time()
-        current_end = (current_datetime + timedelta(minutes=30)).time()
-        current_range = HoursRange(current_begin, current_end)
-        available_lanes = pool_model.reservation_system_model.available_lanes(
-            current_datetime + timedelta(minutes=15))
-        lanes_str = ""
+    for slot in availability:
+        lanes_str = ", ".join(str(lane + 1) for lane in slot.available_lanes)
+        print(f"{slot.hours_range}: lanes {lanes_str or 'none'}")
 
-        for lane in available_lanes[:-1]:
-            lanes_str += f"{lane + 1}, "
-        lanes_str += str(available_lanes[-1] + 1)
+    print()
+
+
+def _view_availability_calendar(pool_model: PoolModel) -> None:
+    """
+    Shows available tickets and lanes for particular time periods of
+    the next week or month.
+    """
+
+    selected_index = print_operations(
+        ["Next 7 days", "Next 30 days"], "Select the calendar range.")
+    days_amount = 7 if selected_index == 0 else 30
+
+    begin_date = pool_model.current_day
+    end_date = begin_date + timedelta(days=days_amount - 1)
+    calendar = pool_model.reservation_system_model.availability_calendar(
+        begin_date, end_date)
+
+    for day, availability in calendar.items():
+        week_day = WeekDay(day.weekday()).name.capitalize()
+        print(f"\n{day} ({week_day}):")
 
-        print(f"{current_range}: lanes {lanes_str}")
-        current_datetime += timedelta(minutes=30)
+        if not availability:
+            print("The pool is closed.")
+            continue
+
+        for slot in availability:
+            lanes_str = ", ".join(
+                str(lane + 1) for lane in slot.available_lanes)
+            print(
+                f"{slot.hours_range}: {slot.available_tickets} tickets, "
+                + f"lanes {lanes_str or 'none'}")
 
     print()
 
 
-def _remove_reservation(pool_model: PoolModel, pool_path: str) -> None:
+def _remove_reservation(pool_model: PoolModel, journal: PoolJournal) -> None:
     """
     Lets the user remove a reservation after typing a reservation ID.
     """
 
-    reservations = pool_model.reservation_system_model.reservations
+    res_sys_model = pool_model.reservation_system_model
 
-    if reservations:
-        selected_index = print_operations(
-            [str(r) for r in reservations],
-            "Select the ID of a reservation to remove."
-        )
+    if len(res_sys_model) == 0:
+        print("There are no reservations yet.\n")
+        return
 
-        removed_res = pool_model.reservation_system_model.remove_reservation(
-            selected_index
-        )
+    print(
+        "Type the ID of a reservation to remove "
+        + "(shown in the reservations list):")
 
-        print(f"Successfully removed a reservation: {removed_res}\n")
-        _save_pool_model(pool_model, pool_path)
-    else:
-        print("There are no reservations yet.\n")
+    try:
+        removed_res = res_sys_model.get_reservation(int(input()))
+    except ValueError:
+        print("There's no reservation with the given ID.\n")
+        return
+
+    try:
+        journal.remove_reservation(pool_model, removed_res)
+    except ValueError:
+        print("This reservation has been already removed.\n")
+        return
+
+    print(f"Successfully removed a reservation: {removed_res}\n")
 
 
 def pool_view(pool_path: str) -> None:
@@ -321,7 +345,8 @@ def pool_view(pool_path: str) -> None:
     and calls proper methods for particular operations.
     """
 
-    pool_model = _pool_initialization(pool_path)
+    journal = PoolJournal(pool_path, lazy=True)
+    pool_model = _pool_initialization(journal)
     week_day = WeekDay(pool_model.current_day.weekday()).name.capitalize()
     print("POOLTOOL - POOL MANAGEMENT SYSTEM\n")
     print("Welcome to PoolTool!")
@@ -338,6 +363,7 @@ def pool_view(pool_path: str) -> None:
         "Financial report",
         "Available tickets",
         "Available lanes",
+        "Availability calendar",
         "Exit"
     ]
 
@@ -347,9 +373,9 @@ def pool_view(pool_path: str) -> None:
 
         match selected_index:
             case 0:
-                _add_reservation(pool_model, pool_path)
+                _add_reservation(pool_model, journal)
             case 1:
-                _remove_reservation(pool_model, pool_path)
+                _remove_reservation(pool_model, journal)
             case 2:
                 _view_reservations(pool_model)
             case 3:
@@ -363,4 +389,8 @@ def pool_view(pool_path: str) -> None:
             case 7:
                 _view_free_lanes(pool_model)
             case 8:
+                _view_availability_calendar(pool_model)
+            case 9:
+                if journal.entries_amount > 0:
+                    journal.compact(pool_model)
                 exit_selected = True
@@ -0,0 +1,439 @@
+from config.io_manager import does_config_exist
+from config.pool_registry import PoolRegistry
+from exceptions.reservation_exceptions import ReservationTimeTakenError
+from model.pool_model import PoolModel
+from model.price_list_model import PriceListModel
+from model.reservations_model import Reservation, ReservationSystemModel
+from model.value_types import HoursRange, Price, Services
+from datetime import date, datetime
+from urllib.parse import parse_qs, unquote, urlsplit
+import asyncio
+import json
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+_TIME_SCHEMA = {"hour": int, "minute": int}
+_RESERVATION_SCHEMA = {
+    "service": int,
+    "date": {"day": int, "month": int, "year": int},
+    "hours_range": {"begin": _TIME_SCHEMA, "end": _TIME_SCHEMA}
+}
+
+_STATUS_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict"
+}
+
+
+class _RequestError(Exception):
+    """
+    An exception raised when a request can't be handled. Stores the HTTP
+    status code of the response.
+    """
+
+    def __init__(self, status: int, *args: object) -> None:
+        self.status = status
+        super().__init__(*args)
+
+
+class ReservationServer:
+    """
+    Serves the pools of the given PoolRegistry through the JSON HTTP API.
+    Pool models are kept in memory. The changes of a single pool are
+    serialized with its lock, applied in worker threads and saved in its
+    journal. Reads don't wait for them: reservations are read from
+    the immutable snapshot and availability from the index of a date with
+    its lock held only for the time of the query. Listed reservations are
+    paginated, at most MAX_LIMIT at once.
+    """
+
+    def __init__(self, registry: PoolRegistry) -> None:
+        self.registry = registry
+        self.sockets = []
+        self._locks = {name: asyncio.Lock() for name in registry.names()}
+
+    async def serve(
+            self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+            started: asyncio.Event = None) -> None:
+        """
+        Accepts the connections on the given host and port until cancelled,
+        then compacts the journals of all pools.
+        """
+
+        server = await asyncio.start_server(
+            self._handle_connection, host, port)
+        self.sockets = server.sockets
+
+        if started is not None:
+            started.set()
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for name in self.registry.names():
+                journal = self.registry.get_journal(name)
+
+                if journal.entries_amount > 0:
+                    journal.compact(self.registry.get_pool(name))
+
+    async def handle_request(
+            self, method: str, target: str,
+            body: bytes = b"") -> tuple[int, object]:
+        """
+        Handles a single request and returns the status code and
+        the JSON-formatted content of the response.
+        """
+
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = {
+            key: values[0] for key, values in parse_qs(url.query).items()}
+
+        try:
+            return await self._route(method, parts, query, body)
+        except _RequestError as e:
+            return e.status, {"error": e.args[0]}
+        except ReservationTimeTakenError as e:
+            proposed_date = None
+
+            if e.proposed_date is not None:
+                proposed_date = e.proposed_date.isoformat()
+
+            return 409, {
+                "error": " ".join(str(e.args[0]).split()),
+                "proposed_date": proposed_date
+            }
+        except Exception as e:
+            message = e.args[0] if e.args else type(e).__name__
+            return 400, {"error": " ".join(str(message).split())}
+
+    async def _route(
+            self, method: str, parts: list[str], query: dict,
+            body: bytes) -> tuple[int, object]:
+        """
+        Calls the handler of the requested resource and returns the status
+        code and the content of the response.
+        """
+
+        if parts == ["pools"]:
+            self._check_method(method, "GET")
+            return 200, {
+                "pools": self.registry.names(),
+                "current_day": self.registry.admin.current_day.isoformat()
+            }
+
+        if len(parts) < 2 or parts[0] != "pools":
+            raise _RequestError(404, "There's no such resource.")
+
+        name = parts[1]
+
+        if name not in self.registry:
+            raise _RequestError(404, f"There's no pool named {name}.")
+
+        pool_model = self.registry.get_pool(name)
+        resource = parts[2:]
+
+        match resource:
+            case []:
+                self._check_method(method, "GET")
+                return 200, PoolModel.metadata_to_json(pool_model)
+            case ["price-list"]:
+                self._check_method(method, "GET")
+                return 200, self._get_price_list(pool_model, query)
+            case ["availability"]:
+                self._check_method(method, "GET")
+                return 200, self._get_availability(pool_model, query)
+            case ["income"]:
+                self._check_method(method, "GET")
+                return 200, self._get_income(pool_model)
+            case ["reservations"] if method == "GET":
+                return 200, self._get_reservations(pool_model, query)
+            case ["reservations"]:
+                self._check_method(method, "POST")
+                return 201, await self._add_reservation(name, body)
+            case ["reservations", reservation_id]:
+                self._check_method(method, "DELETE")
+                return 200, await self._remove_reservation(
+                    name, reservation_id)
+
+        raise _RequestError(404, "There's no such resource.")
+
+    def _get_price_list(self, pool_model: PoolModel, query: dict) -> list:
+        """
+        Returns the JSON-formatted price list, optionally only of
+        the service given in the query.
+        """
+
+        service = self._get_service(query)
+        return PriceListModel.to_json(
+            pool_model.price_list_model.get_pricing(service))
+
+    def _get_availability(self, pool_model: PoolModel, query: dict) -> dict:
+        """
+        Returns available lanes and tickets amount for the datetime given
+        in the query.
+        """
+
+        if "datetime" not in query:
+            raise _RequestError(400, "Datetime parameter is required.")
+
+        date_time = datetime.fromisoformat(query["datetime"])
+        res_sys_model = pool_model.reservation_system_model
+
+        return {
+            "datetime": date_time.isoformat(),
+            "available_lanes": res_sys_model.available_lanes(date_time),
+            "available_tickets": res_sys_model.available_tickets(date_time)
+        }
+
+    def _get_income(self, pool_model: PoolModel) -> dict:
+        """
+        Returns pool's total income for the current day.
+        """
+
+        income = pool_model.reservation_system_model.calculate_total_income()
+
+        return {
+            "day": pool_model.current_day.isoformat(),
+            "income": Price.to_json(income)
+        }
+
+    def _get_reservations(self, pool_model: PoolModel, query: dict) -> list:
+        """
+        Returns the JSON-formatted list of reservations, optionally filtered
+        by the service, the dates (begin and end) and the lane and paginated
+        by the offset and limit given in the query (by default the first
+        DEFAULT_LIMIT reservations).
+        """
+
+        service = self._get_service(query)
+        begin_date = end_date = lane = None
+
+        if "begin" in query:
+            begin_date = date.fromisoformat(query["begin"])
+        if "end" in query:
+            end_date = date.fromisoformat(query["end"])
+        if "lane" in query:
+            lane = int(query["lane"])
+
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", DEFAULT_LIMIT))
+
+        if limit > MAX_LIMIT:
+            raise _RequestError(
+                400, f"Limit cannot be greater than {MAX_LIMIT}.")
+
+        res_sys_model = pool_model.reservation_system_model
+
+        return ReservationSystemModel.to_json(list(
+            res_sys_model.iter_reservations(
+                service, begin_date, end_date, lane, offset, limit)))
+
+    async def _add_reservation(self, name: str, body: bytes) -> dict:
+        """
+        Adds the reservation described by the JSON-formatted request body
+        to the given pool, saves it in the journal and returns it.
+        """
+
+        reservation_json = json.loads(body)
+        self._check_json(reservation_json, _RESERVATION_SCHEMA, "reservation")
+
+        lane = reservation_json.get("lane")
+
+        if lane is not None:
+            self._check_json(lane, int, "lane")
+
+        service = Services(reservation_json["service"])
+        reservation_date = Reservation.from_json_date(
+            reservation_json["date"])
+        hours_range = HoursRange.from_json(reservation_json["hours_range"])
+
+        pool_model = self.registry.get_pool(name)
+        journal = self.registry.get_journal(name)
+
+        async with self._locks[name]:
+            reservation = await asyncio.to_thread(
+                journal.add_reservation, pool_model, service,
+                reservation_date, hours_range, lane)
+
+        return ReservationSystemModel.reservation_to_json(reservation)
+
+    async def _remove_reservation(
+            self, name: str, reservation_id: str) -> dict:
+        """
+        Removes the reservation with the given ID from the given pool, saves
+        the change in the journal and returns the removed reservation.
+        """
+
+        if not reservation_id.isdigit():
+            raise _RequestError(404, "Reservation ID must be a number.")
+
+        pool_model = self.registry.get_pool(name)
+        journal = self.registry.get_journal(name)
+
+        async with self._locks[name]:
+            res_sys_model = pool_model.reservation_system_model
+
+            try:
+                reservation = res_sys_model.get_reservation(
+                    int(reservation_id))
+            except ValueError:
+                raise _RequestError(404, "There's no such reservation.")
+
+            # The reservation may have been removed by another process
+            # sharing the pool
+
+            try:
+                await asyncio.to_thread(
+                    journal.remove_reservation, pool_model, reservation)
+            except ValueError:
+                raise _RequestError(404, "There's no such reservation.")
+
+        return ReservationSystemModel.reservation_to_json(reservation)
+
+    async def _handle_connection(
+            self, reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        """
+        Reads the HTTP requests sent through the connection and writes
+        the responses until the client closes it.
+        """
+
+        try:
+            while True:
+                request_line = await reader.readline()
+
+                if not request_line:
+                    break
+
+                method, target, version = request_line.decode(
+                    "latin-1").split()
+                headers = {}
+
+                while True:
+                    line = await reader.readline()
+
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, content = await self.handle_request(
+                    method, target, body)
+
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close")
+
+                writer.write(self._create_response(
+                    status, content, keep_alive))
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _create_response(
+            status: int, content: object, keep_alive: bool) -> bytes:
+        """
+        Returns the HTTP response with the given status and JSON content.
+        """
+
+        body = json.dumps(content).encode("utf-8")
+        connection = "keep-alive" if keep_alive else "close"
+        head = (
+            f"HTTP/1.1 {status} {_STATUS_REASONS[status]}\r\n"
+            + "Content-Type: application/json; charset=utf-8\r\n"
+            + f"Content-Length: {len(body)}\r\n"
+            + f"Connection: {connection}\r\n\r\n")
+
+        return head.encode("latin-1") + body
+
+    @staticmethod
+    def _check_method(method: str, allowed_method: str) -> None:
+        """
+        Throws an exception if the request method isn't the allowed one.
+        """
+
+        if method != allowed_method:
+            raise _RequestError(405, f"Method {method} is not allowed.")
+
+    @staticmethod
+    def _check_json(value: object, schema, name: str) -> None:
+        """
+        Throws an exception if the JSON value doesn't match the given schema:
+        a type or a dictionary assigning the schemas to the required keys.
+        """
+
+        if isinstance(schema, dict):
+            if not isinstance(value, dict):
+                raise _RequestError(400, f"{name} must be an object.")
+
+            for key, key_schema in schema.items():
+                if key not in value:
+                    raise _RequestError(400, f"{name}.{key} is required.")
+
+                ReservationServer._check_json(
+                    value[key], key_schema, f"{name}.{key}")
+        elif not isinstance(value, schema) or isinstance(value, bool):
+            raise _RequestError(
+                400, f"{name} must be of type {schema.__name__}.")
+
+    @staticmethod
+    def _get_service(query: dict) -> Services:
+        """
+        Returns the service given in the query or None if it's not given.
+        """
+
+        if "service" not in query:
+            return None
+
+        return Services(int(query["service"]))
+
+
+def server_view(
+        directory: str, host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT) -> None:
+    """
+    Start point for the server mode of the application. Loads all pools from
+    the given directory and serves them until interrupted.
+    """
+
+    if not does_config_exist(""):
+        print("There's no config file detected.")
+        print(
+            "Launch the program in admin mode (-a parameter) "
+            + "and follow the instructions.")
+        exit()
+
+    registry = PoolRegistry.from_config()
+    errors = registry.load_directory(directory)
+
+    for path, error in errors.items():
+        print(f"Couldn't load the pool file {path}: {error}")
+
+    print("POOLTOOL - RESERVATION SERVER\n")
+    print(f"Serving pools: {', '.join(registry.names())}")
+    print(f"Listening on http://{host}:{port}/ (press Ctrl+C to stop)")
+
+    try:
+        asyncio.run(ReservationServer(registry).serve(host, port))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")